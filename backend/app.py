@@ -1,4 +1,5 @@
 # backend/app.py
+# servidor de desenvolvimento; em produção use wsgi.py + gunicorn.conf.py
 from helpers.application import create_app
 from helpers.database import db
 
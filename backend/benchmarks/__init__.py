@@ -0,0 +1,42 @@
+"""
+Benchmarks e checagens do backend. Rodar a partir de backend/:
+
+    python -m benchmarks.<nome> [opções]
+
+Importar o pacote já põe backend/ no sys.path e deixa o hash de senha na
+própria thread (PASSWORD_POOL_WORKERS=0); cada script só ajusta o que é
+seu (APP_ENV, RATELIMIT_ENABLED, ...) antes de importar o app.
+"""
+import atexit
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+os.environ.setdefault("PASSWORD_POOL_WORKERS", "0")
+
+
+def temp_instance(prefix: str, database: str = "bench.db") -> Path:
+    """
+    TemporaryDirectory como INSTANCE_DIR (logs) e, com `database`, um
+    SQLite dentro dele em DATABASE_URL. Chamar antes de importar o app:
+    a remoção fica no atexit e, registrada antes do shutdown_logging, roda
+    depois dele (ordem inversa), com os arquivos de log já fechados.
+    """
+    tmp = tempfile.TemporaryDirectory(prefix=prefix, ignore_cleanup_errors=True)
+    atexit.register(tmp.cleanup)
+    os.environ["INSTANCE_DIR"] = tmp.name
+    if database:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp.name}/{database}"
+    return Path(tmp.name)
+
+
+def migrate() -> None:
+    """flask db upgrade no banco do app atual (dentro de app_context)."""
+    from flask_migrate import upgrade
+
+    upgrade(directory=str(BACKEND_DIR / "migrations"))
@@ -0,0 +1,296 @@
+"""
+Suíte de benchmark da API: baseline reproduzível por commit.
+
+Uso (a partir de backend/):
+    python -m benchmarks.api_suite --users 500 --iterations 300 --output bench.json
+    python -m benchmarks.api_suite --compare bench.json --threshold 0.25
+
+Sobe o app com create_app() num SQLite temporário (migrations), popula
+com benchmarks.datagen (semente fixa) e percorre login, listagem/detalhe
+de pets, CRUD de vacinas, /me e cadastro pelo test client do Flask (ou
+por um servidor WSGI local com --server). Imprime JSON com throughput e
+p50/p95/p99 e bytes médios no fio por endpoint (com --encoding gzip as
+respostas vêm comprimidas), mais os metadados do run (commit, parâmetros,
+versões). Com --compare, sai com código 1 se algum endpoint piorar mais
+que --threshold no p50 ou no p95 em relação ao baseline.
+"""
+import argparse
+import gzip
+import http.client
+import json
+import logging
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+from benchmarks import BACKEND_DIR, migrate, temp_instance
+
+os.environ.setdefault("APP_ENV", "bench")
+os.environ.setdefault("RATELIMIT_ENABLED", "0")  # mede login/cadastro, não o limitador
+
+
+def _decode(raw: bytes, encoding):
+    if not raw:
+        return None
+    if encoding == "gzip":
+        raw = gzip.decompress(raw)
+    elif encoding == "br":
+        import brotli
+        raw = brotli.decompress(raw)
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return None
+
+
+def percentile(values, p):
+    if not values:
+        return None
+    values = sorted(values)
+    k = max(0, min(len(values) - 1, int(round(p / 100.0 * (len(values) - 1)))))
+    return round(values[k] * 1000.0, 3)
+
+
+class TestClientDriver:
+    """Requests direto no WSGI app (sem socket)."""
+
+    name = "test_client"
+
+    def __init__(self, app, accept_encoding=None):
+        self.client = app.test_client()
+        self.base_headers = {"Accept-Encoding": accept_encoding} if accept_encoding else {}
+
+    def request(self, method, url, headers=None, json_body=None):
+        r = self.client.open(url, method=method, headers={**self.base_headers, **(headers or {})},
+                             json=json_body)
+        raw = r.data
+        return r.status_code, _decode(raw, r.headers.get("Content-Encoding")), len(raw)
+
+    def close(self):
+        pass
+
+
+class WSGIServerDriver:
+    """Servidor werkzeug local numa thread; requests HTTP reais por http.client."""
+
+    name = "wsgi_server"
+
+    def __init__(self, app, accept_encoding=None):
+        from werkzeug.serving import make_server
+        logging.getLogger("werkzeug").setLevel(logging.WARNING)  # sem log por request
+        self.server = make_server("127.0.0.1", 0, app, threaded=True)
+        self.port = self.server.server_port
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.base_headers = {"Accept-Encoding": accept_encoding} if accept_encoding else {}
+
+    def request(self, method, url, headers=None, json_body=None):
+        conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=60)
+        body = None
+        headers = {**self.base_headers, **(headers or {})}
+        if json_body is not None:
+            body = json.dumps(json_body).encode()
+            headers["Content-Type"] = "application/json"
+        conn.request(method, url, body=body, headers=headers)
+        resp = conn.getresponse()
+        raw = resp.read()
+        conn.close()
+        return resp.status, _decode(raw, resp.getheader("Content-Encoding")), len(raw)
+
+    def close(self):
+        self.server.shutdown()
+
+
+class Recorder:
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.bytes = defaultdict(int)
+
+    def call(self, driver, name, method, url, expect, headers=None, json_body=None):
+        t0 = time.perf_counter()
+        status, body, size = driver.request(method, url, headers=headers, json_body=json_body)
+        self.samples[name].append(time.perf_counter() - t0)
+        self.bytes[name] += size
+        if status != expect:
+            self.errors[name] += 1
+        return status, body
+
+    def summary(self) -> dict:
+        out = {}
+        for name in sorted(self.samples):
+            values = self.samples[name]
+            total = sum(values)
+            out[name] = {
+                "n": len(values),
+                "errors": self.errors[name],
+                "rps": round(len(values) / total, 1) if total else None,
+                "mean_ms": round(total / len(values) * 1000.0, 3),
+                "p50_ms": percentile(values, 50),
+                "p95_ms": percentile(values, 95),
+                "p99_ms": percentile(values, 99),
+                "bytes_mean": round(self.bytes[name] / len(values)),
+            }
+        return out
+
+
+def _git_meta() -> dict:
+    def git(*args):
+        try:
+            return subprocess.run(["git", *args], cwd=BACKEND_DIR, capture_output=True,
+                                  text=True, timeout=10).stdout.strip()
+        except (OSError, subprocess.SubprocessError):
+            return ""
+    return {"commit": git("rev-parse", "HEAD") or None, "dirty": bool(git("status", "--porcelain", "--", "."))}
+
+
+def run_scenarios(driver, data, tokens: dict, iterations: int, auth_iterations: int, seed: int) -> Recorder:
+    from benchmarks.datagen import BENCH_PASSWORD, BENCH_DOMAIN
+
+    rng = random.Random(seed)
+    rec = Recorder()
+    usuarios = data["usuarios"]
+
+    # auth: dominado pelo hash de senha, por isso poucas iterações
+    for i in range(auth_iterations):
+        _, email, _ = rng.choice(usuarios)
+        rec.call(driver, "POST /api/auth/login", "POST", "/api/auth/login", 200,
+                 json_body={"email": email, "senha": BENCH_PASSWORD})
+        rec.call(driver, "POST /api/usuario", "POST", "/api/usuario", 201, json_body={
+            "nome": "Cadastro Bench", "data": "1990-01-01", "rua": "Rua B", "bairro": "Centro",
+            "numero": "10", "cep": "12345-678", "cidade": "Recife", "estado": "PE", "funcao": "tutor",
+            "email": f"novo{seed}x{i}@{BENCH_DOMAIN}", "senha": BENCH_PASSWORD,
+        })
+
+    com_pets = [u for u in usuarios if u[2]]
+    vacina = {"nome": "V10", "fabricante": "Fab", "lote": "LB", "dose_tamanho": "1ml",
+              "aplicacao": "2024-03-01", "fabricacao": "2023-06-01",
+              "vencimento": "2025-06-01", "revacinacao": "2025-03-01"}
+
+    for _ in range(iterations):
+        user = rng.choice(com_pets)
+        h = tokens[user[0]]
+        pet_id, _ = rng.choice(user[2])
+
+        rec.call(driver, "GET /api/me", "GET", "/api/me", 200, headers=h)
+        rec.call(driver, "GET /api/pets", "GET", "/api/pets", 200, headers=h)
+        rec.call(driver, "GET /api/pets?include=vacinas", "GET", "/api/pets?include=vacinas", 200, headers=h)
+        rec.call(driver, "GET /api/pets/<id>", "GET", f"/api/pets/{pet_id}", 200, headers=h)
+        rec.call(driver, "GET /api/pets/<id>/vacinas", "GET", f"/api/pets/{pet_id}/vacinas", 200, headers=h)
+
+        _, body = rec.call(driver, "POST /api/pets/<id>/vacinas", "POST", f"/api/pets/{pet_id}/vacinas", 201,
+                           headers=h, json_body=vacina)
+        if not body or "id" not in body:
+            continue
+        url = f"/api/pets/{pet_id}/vacinas/{body['id']}"
+        rec.call(driver, "GET /api/pets/<id>/vacinas/<id>", "GET", url, 200, headers=h)
+        rec.call(driver, "PUT /api/pets/<id>/vacinas/<id>", "PUT", url, 200, headers=h,
+                 json_body={"lote": "LB2", "observacoes": "bench"})
+        rec.call(driver, "DELETE /api/pets/<id>/vacinas/<id>", "DELETE", url, 204, headers=h)
+    return rec
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    regressions = []
+    for name, cur in current["endpoints"].items():
+        base = baseline.get("endpoints", {}).get(name)
+        if not base:
+            continue
+        for key in ("p50_ms", "p95_ms"):
+            if base.get(key) and cur.get(key) and cur[key] > base[key] * (1 + threshold):
+                regressions.append({"endpoint": name, "metrica": key, "baseline": base[key],
+                                    "atual": cur[key], "variacao": round(cur[key] / base[key] - 1, 3)})
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--pets", default="poisson:2", help="distribuição de pets por usuário")
+    parser.add_argument("--vacinas", default="uniform:0-6", help="distribuição de vacinas por pet")
+    parser.add_argument("--iterations", type=int, default=300)
+    parser.add_argument("--auth-iterations", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--server", action="store_true", help="mede por HTTP num servidor WSGI local")
+    parser.add_argument("--encoding", choices=("gzip", "br"), help="envia Accept-Encoding (bytes no fio)")
+    parser.add_argument("--output", help="grava o JSON do resultado neste arquivo")
+    parser.add_argument("--compare", help="JSON de um run anterior (baseline)")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args()
+
+    temp_instance("meupet-suite-")
+
+    from helpers.application import create_app
+    from helpers.mx import mx_cache
+    from resources.auth_utils import gerar_token
+    from benchmarks.datagen import generate, BENCH_DOMAIN
+
+    app = create_app()
+    mx_cache.prime(BENCH_DOMAIN, True)  # cadastro sem DNS: resultado reproduzível
+    with app.app_context():
+        migrate()
+        t0 = time.perf_counter()
+        data = generate(args.users, args.pets, args.vacinas, args.seed)
+        seed_s = time.perf_counter() - t0
+        # tokens emitidos direto (sem pagar o hash de senha por usuário); o
+        # login em si é medido no cenário de auth
+        tokens = {}
+        for uid, email, _ in data["usuarios"]:
+            token = gerar_token(SimpleNamespace(id=uid, email=email))
+            tokens[uid] = {"Authorization": f"Bearer {token}"}
+
+    driver = (WSGIServerDriver if args.server else TestClientDriver)(app, args.encoding)
+    try:
+        t0 = time.perf_counter()
+        rec = run_scenarios(driver, data, tokens, args.iterations, args.auth_iterations, args.seed)
+        wall_s = time.perf_counter() - t0
+    finally:
+        driver.close()
+
+    result = {
+        "meta": {
+            **_git_meta(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "driver": driver.name,
+            "params": {k: getattr(args, k) for k in ("users", "pets", "vacinas", "iterations",
+                                                      "auth_iterations", "seed", "encoding")},
+            "dataset": data["totais"],
+            "seed_s": round(seed_s, 2),
+            "wall_s": round(wall_s, 2),
+        },
+        "endpoints": rec.summary(),
+    }
+
+    status = 0
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        base_meta = baseline.get("meta", {})
+        if (base_meta.get("params"), base_meta.get("driver")) != (result["meta"]["params"], driver.name):
+            print("aviso: parâmetros/driver diferentes do baseline; comparação pouco confiável", file=sys.stderr)
+        result["regressoes"] = compare(result, baseline, args.threshold)
+        status = 1 if result["regressoes"] else 0
+    if any(e["errors"] for e in result["endpoints"].values()):
+        status = 1
+
+    out = json.dumps(result, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(out + "\n", encoding="utf-8")
+    print(out)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+Benchmark de compressão das respostas: bytes no fio e custo de CPU.
+
+Uso (a partir de backend/):
+    python -m benchmarks.compression --users 200 --pets pareto:1.2:60 --repeat 20
+
+Popula um SQLite temporário com benchmarks.datagen, pega o tutor com mais
+pets e busca as listas típicas (/api/pets, ?include=vacinas, vacinas de
+um pet, /me/export) sem compressão. Para cada payload mede o tamanho e a
+mediana de CPU (process_time) de gzip nos níveis 1/6/9 e de brotli
+(se instalado), e confere pelo app que a resposta com Accept-Encoding
+descomprime para o mesmo corpo. Imprime JSON.
+"""
+import argparse
+import gzip
+import json
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+
+from benchmarks import migrate, temp_instance
+
+
+def _median_cpu_ms(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.process_time()
+        fn()
+        times.append(time.process_time() - t0)
+    return round(statistics.median(times) * 1000.0, 3)
+
+
+def _median_wall_ms(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return round(statistics.median(times) * 1000.0, 3)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--pets", default="pareto:1.2:60")
+    parser.add_argument("--vacinas", default="uniform:2-10")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    temp_instance("meupet-gzip-")
+
+    from helpers.application import create_app
+    from helpers.compression import brotli, compress
+    from resources.auth_utils import gerar_token
+    from benchmarks.datagen import generate
+
+    app = create_app()
+    with app.app_context():
+        migrate()
+        data = generate(args.users, args.pets, args.vacinas, args.seed)
+        uid, email, pets = max(data["usuarios"], key=lambda u: len(u[2]))
+        token = gerar_token(SimpleNamespace(id=uid, email=email))
+    h = {"Authorization": f"Bearer {token}"}
+    pet_id = max(pets, key=lambda p: len(p[1]))[0]
+
+    codecs = [("gzip-1", "gzip", 1), ("gzip-6", "gzip", 6), ("gzip-9", "gzip", 9)]
+    if brotli is not None:
+        codecs += [("br-4", "br", 4), ("br-11", "br", 11)]
+
+    c = app.test_client()
+    urls = ["/api/pets", "/api/pets?include=vacinas", f"/api/pets/{pet_id}/vacinas", "/api/me/export"]
+    results = {"tutor": {"pets": len(pets), "vacinas": sum(len(v) for _, v in pets)}, "payloads": {}}
+    ok = True
+    for url in urls:
+        raw = c.get(url, headers=h).data
+        entry = {"bytes": len(raw)}
+        for name, enc, level in codecs:
+            kwargs = {"br_quality": level} if enc == "br" else {"level": level}
+            out = compress(raw, enc, **kwargs)
+            entry[name] = {
+                "bytes": len(out),
+                "razao": round(len(out) / len(raw), 3),
+                "cpu_ms": _median_cpu_ms(lambda: compress(raw, enc, **kwargs), args.repeat),
+            }
+        # ponta a ponta pelo app (nível configurado, streaming no export)
+        r = c.get(url, headers={**h, "Accept-Encoding": "gzip"})
+        wire = r.data
+        same = r.headers.get("Content-Encoding") == "gzip" and gzip.decompress(wire) == raw
+        ok &= same
+        entry["app"] = {
+            "bytes_no_fio": len(wire),
+            "mesmo_corpo": same,
+            "sem_compressao_ms": _median_wall_ms(lambda: c.get(url, headers=h).data, args.repeat),
+            "gzip_ms": _median_wall_ms(
+                lambda: c.get(url, headers={**h, "Accept-Encoding": "gzip"}).data, args.repeat),
+        }
+        results["payloads"][url.replace(str(pet_id), "<id>")] = entry
+
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""
+Stress de PUTs concorrentes: confere que a validação de update não vaza
+instância/contexto entre requests (schemas são singletons de módulo).
+
+Uso (a partir de backend/):
+    python -m benchmarks.concurrent_put --threads 16 --requests 50
+
+Cada thread é um usuário com um pet e uma vacina. Metade dos usuários tem
+pet/vacina "antigos" (o mesmo payload é válido) e a outra metade "novos"
+(o payload viola a regra de datas contra a instância). Se a instância de
+uma thread vazar para outra, aparecem 200 onde devia ser 400 (ou o
+contrário) ou o nome de um usuário gravado em outro. Imprime o resumo em
+JSON e sai com código 1 se houver qualquer divergência.
+"""
+import argparse
+import json
+import os
+import string
+import sys
+import threading
+
+from benchmarks import migrate, temp_instance
+
+os.environ.setdefault("APP_ENV", "dev")
+
+
+def _letters(n: int) -> str:
+    # nome de usuário só aceita letras
+    out = ""
+    while True:
+        n, r = divmod(n, 26)
+        out = string.ascii_lowercase[r] + out
+        if not n:
+            return out
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    temp_instance("meupet-put-", "put.db")
+
+    from datetime import date
+    from types import SimpleNamespace
+    from sqlalchemy import update
+
+    from helpers.application import create_app
+    from helpers.database import db
+    from models import Usuario, Pet, Vacina
+    from resources.auth_utils import gerar_token
+    from benchmarks.datagen import generate
+
+    app = create_app()
+    users = []  # (user_id, token, pet_id, vacina_id, antigo)
+    with app.app_context():
+        migrate()
+        data = generate(args.threads, "fixed:1", "fixed:1")
+        pets, vacinas = [], []
+        # datas fixas por cenário (as do gerador são aleatórias)
+        for i, (uid, email, [(pet_id, [vac_id])]) in enumerate(data["usuarios"]):
+            antigo = i % 2 == 0
+            pets.append({"id": pet_id, "data_chegada": None,
+                         "data_nascimento": date(2020, 1, 1) if antigo else date(2024, 6, 1)})
+            vacinas.append({"id": vac_id, "data_fabricacao": date(2023, 1, 1), "data_vencimento": date(2030, 1, 1),
+                            "data_aplicacao": date(2024, 1, 10) if antigo else date(2025, 6, 1),
+                            "data_revac": date(2026, 1, 10)})
+            users.append((uid, gerar_token(SimpleNamespace(id=uid, email=email)), pet_id, vac_id, antigo))
+        db.session.execute(update(Pet), pets)
+        db.session.execute(update(Vacina), vacinas)
+        db.session.commit()
+
+    # payloads fixos: válidos para o registro "antigo", inválidos para o "novo"
+    pet_payload = {"data_chegada": "2022-01-01"}   # chegada < nascimento (2024-06-01)
+    vac_payload = {"revacinacao": "2025-01-01"}    # revacinação <= aplicação (2025-06-01)
+
+    mismatches = []
+    counts = {"pet": 0, "vacina": 0, "usuario": 0}
+    lock = threading.Lock()
+    start = threading.Barrier(args.threads)
+
+    def worker(idx):
+        user_id, token, pet_id, vac_id, antigo = users[idx]
+        c = app.test_client()
+        h = {"Authorization": f"Bearer {token}"}
+        expected = 200 if antigo else 400
+        start.wait()
+        try:
+            for n in range(args.requests):
+                checks = (
+                    ("pet", c.put(f"/api/pets/{pet_id}", json=pet_payload, headers=h), expected),
+                    ("vacina", c.put(f"/api/pets/{pet_id}/vacinas/{vac_id}", json=vac_payload, headers=h), expected),
+                    ("usuario", c.put(f"/api/usuario/{user_id}",
+                                      json={"nome": f"Tutor {_letters(idx)} {_letters(n)}"}, headers=h), 200),
+                )
+                with lock:
+                    for kind, r, want in checks:
+                        counts[kind] += 1
+                        if r.status_code != want:
+                            mismatches.append({"thread": idx, "tipo": kind, "esperado": want,
+                                               "status": r.status_code, "corpo": r.get_json()})
+        except Exception as err:  # estado corrompido pode estourar dentro do app
+            with lock:
+                mismatches.append({"thread": idx, "tipo": "excecao", "erro": repr(err)})
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.threads)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # estado final: cada linha só pode ter o que o próprio usuário enviou
+    with app.app_context():
+        for idx, (user_id, _, pet_id, vac_id, antigo) in enumerate(users):
+            u = db.session.get(Usuario, user_id)
+            pet = db.session.get(Pet, pet_id)
+            vac = db.session.get(Vacina, vac_id)
+            want_nome = f"Tutor {_letters(idx)} {_letters(args.requests - 1)}"
+            want_chegada = date(2022, 1, 1) if antigo else None
+            want_revac = date(2025, 1, 1) if antigo else date(2026, 1, 10)
+            if u.nome != want_nome or pet.data_chegada != want_chegada or vac.data_revac != want_revac:
+                mismatches.append({"thread": idx, "tipo": "estado_final", "nome": u.nome,
+                                   "data_chegada": str(pet.data_chegada), "revacinacao": str(vac.data_revac)})
+
+    print(json.dumps({
+        "threads": args.threads,
+        "requests": counts,
+        "divergencias": len(mismatches),
+        "exemplos": mismatches[:5],
+    }, indent=2, ensure_ascii=False, default=str))
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
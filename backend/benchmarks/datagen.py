@@ -0,0 +1,170 @@
+"""
+Gerador de dados sintéticos para os benchmarks.
+
+Insere em lote N usuários, pets por usuário e vacinas por pet, com
+distribuições configuráveis e semente fixa (mesma semente = mesmos dados;
+as datas são relativas a hoje para passar nas validações):
+
+    fixo         "3" ou "fixed:3"
+    uniforme     "uniform:0-10"
+    poisson      "poisson:2.5"
+    cauda longa  "pareto:1.5:50"   (alfa, máximo) — poucos usuários com muitos pets
+
+Uso isolado (a partir de backend/):
+    python -m benchmarks.datagen --users 1000 --pets poisson:2 --vacinas uniform:0-8
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+from datetime import date, datetime, timedelta
+
+from benchmarks import migrate, temp_instance
+
+BENCH_PASSWORD = "senha-bench"
+BENCH_DOMAIN = "meupet-bench.com"
+
+_ESPECIES = ["cão", "gato", "ave", "coelho"]
+_PORTES = ["pequeno", "médio", "grande"]
+_VACINAS = ["V8", "V10", "Raiva", "Gripe", "Giárdia", "Leishmaniose", "V4", "V5"]
+
+
+def parse_dist(spec: str):
+    """'poisson:2' -> função(rng) -> int >= 0."""
+    spec = str(spec).strip()
+    kind, _, arg = spec.partition(":")
+    if not arg:
+        kind, arg = "fixed", kind
+    if kind == "fixed":
+        n = int(arg)
+        return lambda rng: n
+    if kind == "uniform":
+        lo, hi = (int(x) for x in arg.split("-", 1))
+        return lambda rng: rng.randint(lo, hi)
+    if kind == "poisson":
+        lam = float(arg)
+        limit = math.exp(-lam)
+
+        def poisson(rng):
+            # Knuth: suficiente para médias pequenas (pets/vacinas)
+            k, p = 0, rng.random()
+            while p > limit:
+                k += 1
+                p *= rng.random()
+            return k
+        return poisson
+    if kind == "pareto":
+        alpha, _, cap = arg.partition(":")
+        alpha, cap = float(alpha), int(cap or 100)
+        return lambda rng: min(cap, int(rng.paretovariate(alpha)) - 1)
+    raise ValueError(f"Distribuição desconhecida: {spec}")
+
+
+def generate(users: int, pets="poisson:2", vacinas="uniform:0-6", seed: int = 42, batch: int = 5000,
+             session=None) -> dict:
+    """
+    Popula o banco do app atual (chamar dentro de app_context, banco já
+    migrado) ou o de `session`, se passada. Chamadas seguidas acrescentam:
+    os ids continuam do maior existente, então dá para montar formatos
+    diferentes (ex.: um usuário com 1 pet e outro com 200). Ids são
+    atribuídos aqui, então o INSERT vai em lote sem RETURNING. Todos os
+    usuários usam BENCH_PASSWORD (um hash só).
+    Retorna {"usuarios": [(id, email, [(pet_id, [vacina_id, ...]), ...]), ...], "totais": {...}}.
+    """
+    from sqlalchemy import func, insert, select
+
+    from helpers.database import db
+    from helpers.passwords import password_hasher
+    from models import Usuario, Pet, Vacina
+
+    session = db.session if session is None else session
+    rng = random.Random(seed)
+    pets_dist, vacinas_dist = parse_dist(pets), parse_dist(vacinas)
+    senha = password_hasher.hash(BENCH_PASSWORD)
+    today = date.today()
+
+    user_rows, pet_rows, vac_rows, layout = [], [], [], []
+    first_uid, pet_id, vac_id = (session.scalar(select(func.coalesce(func.max(m.id), 0)))
+                                 for m in (Usuario, Pet, Vacina))
+    first_pet, first_vac = pet_id, vac_id
+
+    def flush(force=False):
+        # sempre as três tabelas juntas, pais antes dos filhos (FKs)
+        if not force and max(len(user_rows), len(pet_rows), len(vac_rows)) < batch:
+            return
+        for model, rows in ((Usuario, user_rows), (Pet, pet_rows), (Vacina, vac_rows)):
+            if rows:
+                session.execute(insert(model), rows)
+                rows.clear()
+
+    for uid in range(first_uid + 1, first_uid + users + 1):
+        email = f"usuario{uid}@{BENCH_DOMAIN}"
+        user_rows.append({
+            "id": uid, "nome": "Usuario Bench", "data": date(1970 + rng.randint(0, 30), 1, 1),
+            "rua": "Rua A", "bairro": "Centro", "numero": str(rng.randint(1, 999)), "cep": "12345-678",
+            "cidade": "São Paulo", "estado": "SP", "complemento": None,
+            "funcao": "ong" if rng.random() < 0.05 else "tutor", "email": email, "senha": senha,
+        })
+        user_pets = []
+        for p in range(pets_dist(rng)):
+            pet_id += 1
+            nascimento = today - timedelta(days=rng.randint(60, 5000))
+            pet_rows.append({
+                "id": pet_id, "usuario_id": uid, "nome": f"Pet {p:03d} {rng.randint(0, 9999):04d}",
+                "data_nascimento": nascimento, "data_chegada": None,
+                "especie": rng.choice(_ESPECIES), "porte": rng.choice(_PORTES),
+                "peso": round(rng.uniform(0.5, 40.0), 1), "raca": "SRD", "cor_pelagem": "caramelo",
+                "idade_aproximada": None, "outras_caracteristicas": None,
+                "criado_em": datetime(2024, 1, 1) + timedelta(minutes=rng.randint(0, 10**6)),
+            })
+            vac_ids = []
+            for _ in range(vacinas_dist(rng)):
+                vac_id += 1
+                aplicacao = nascimento + timedelta(days=rng.randint(30, max(31, (today - nascimento).days)))
+                vac_rows.append({
+                    "id": vac_id, "pet_id": pet_id, "nome": rng.choice(_VACINAS), "fabricante": "Fab",
+                    "data_fabricacao": aplicacao - timedelta(days=rng.randint(30, 300)),
+                    "data_aplicacao": aplicacao,
+                    "data_vencimento": aplicacao + timedelta(days=rng.randint(200, 700)),
+                    "data_revac": aplicacao + timedelta(days=rng.choice([30, 180, 365])),
+                    "lote": f"L{vac_id}", "dose_tamanho": "1ml", "observacoes": None,
+                })
+                vac_ids.append(vac_id)
+            user_pets.append((pet_id, vac_ids))
+        layout.append((uid, email, user_pets))
+        flush()
+    flush(force=True)
+    session.commit()
+
+    return {"usuarios": layout,
+            "totais": {"usuarios": users, "pets": pet_id - first_pet, "vacinas": vac_id - first_vac}}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--pets", default="poisson:2")
+    parser.add_argument("--vacinas", default="uniform:0-6")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database", help="arquivo SQLite (padrão: temporário)")
+    args = parser.parse_args()
+
+    # sem --database o arquivo é temporário e some no fim: só mede/valida a carga
+    temp_instance("meupet-data-", None if args.database else "bench.db")
+    if args.database:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.abspath(args.database)}"
+
+    from helpers.application import create_app
+
+    app = create_app()
+    with app.app_context():
+        migrate()
+        data = generate(args.users, args.pets, args.vacinas, args.seed)
+    print(json.dumps({"database": os.environ["DATABASE_URL"], **data["totais"]}))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+Benchmark de latência do login com e sem o pool de hashing.
+
+Uso (a partir de backend/):
+    python -m benchmarks.login_latency --threads 8 --requests 200 --workers 4
+
+Dispara logins concorrentes (e requests leves em /health no meio) contra um
+SQLite temporário e imprime p50/p99 de cada cenário em JSON.
+"""
+import argparse
+import json
+import os
+import statistics
+import threading
+import time
+
+from benchmarks import migrate, temp_instance
+
+os.environ.setdefault("APP_ENV", "dev")  # login não consulta MX em dev
+os.environ.setdefault("RATELIMIT_ENABLED", "0")  # mede login/cadastro, não o limitador
+
+
+def _percentile(values, p):
+    if not values:
+        return None
+    values = sorted(values)
+    k = max(0, min(len(values) - 1, int(round(p / 100.0 * (len(values) - 1)))))
+    return values[k] * 1000.0
+
+
+def _build_app():
+    temp_instance("meupet-bench-")
+
+    from helpers.application import create_app
+    from benchmarks.datagen import generate
+
+    app = create_app()
+    with app.app_context():
+        migrate()
+        (_, email, _), = generate(1, "fixed:0", "fixed:0")["usuarios"]
+    return app, email
+
+
+def _run_scenario(app, email: str, workers: int, threads: int, requests: int) -> dict:
+    from helpers.passwords import password_hasher
+    from benchmarks.datagen import BENCH_PASSWORD
+
+    # create_app() só pode rodar uma vez por processo: troca o pool na mesma app
+    password_hasher.configure(workers=workers)
+
+    login_lat, health_lat, statuses = [], [], {}
+    lock = threading.Lock()
+    per_thread = max(1, requests // threads)
+
+    def login_worker():
+        client = app.test_client()
+        for _ in range(per_thread):
+            t0 = time.perf_counter()
+            r = client.post("/api/auth/login", json={"email": email, "senha": BENCH_PASSWORD})
+            dt = time.perf_counter() - t0
+            with lock:
+                login_lat.append(dt)
+                statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+
+    stop = threading.Event()
+
+    def health_worker():
+        client = app.test_client()
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            client.get("/health")
+            with lock:
+                health_lat.append(time.perf_counter() - t0)
+            time.sleep(0.005)
+
+    hw = threading.Thread(target=health_worker)
+    hw.start()
+    ts = [threading.Thread(target=login_worker) for _ in range(threads)]
+    t0 = time.perf_counter()
+    for t in ts:
+        t.start()
+    for t in ts:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    hw.join()
+    password_hasher.shutdown()
+
+    return {
+        "pool_workers": workers,
+        "threads": threads,
+        "logins": len(login_lat),
+        "statuses": statuses,
+        "elapsed_s": round(elapsed, 3),
+        "login_rps": round(len(login_lat) / elapsed, 2),
+        "login_p50_ms": round(_percentile(login_lat, 50), 2),
+        "login_p99_ms": round(_percentile(login_lat, 99), 2),
+        "health_p99_ms": round(_percentile(health_lat, 99), 2) if health_lat else None,
+        "health_mean_ms": round(statistics.mean(health_lat) * 1000.0, 2) if health_lat else None,
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--threads", type=int, default=8)
+    ap.add_argument("--requests", type=int, default=200)
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="workers do pool no cenário com pool")
+    args = ap.parse_args(argv)
+
+    app, email = _build_app()
+    results = [
+        _run_scenario(app, email, 0, args.threads, args.requests),
+        _run_scenario(app, email, args.workers, args.threads, args.requests),
+    ]
+    print(json.dumps({"benchmark": "login_latency", "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
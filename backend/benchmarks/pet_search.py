@@ -0,0 +1,182 @@
+"""
+Busca de pets (FTS5) x LIKE x dump completo filtrado no cliente.
+
+Uso (a partir de backend/):
+    python -m benchmarks.pet_search --pets 5000 --repeat 30
+
+Cria uma ONG com --pets pets (raças, cores e observações com acentos,
+semente fixa) num SQLite migrado e, para cada consulta:
+- a consulta FTS do endpoint (só SQL) e GET /api/pets/search?q= (1ª página);
+- um SELECT com lower(coluna) LIKE '%termo%' nas cinco colunas (o que se
+  faria sem FTS);
+- GET /api/pets paginado inteiro + filtro em Python (o que o cliente faz hoje).
+Compara o número de resultados com a referência (termos como prefixo de
+palavra, sem acento/caixa) e mede medianas. Mede também o custo dos
+triggers no INSERT em lote. Imprime JSON; sai com código 1 se a busca
+divergir da referência.
+"""
+import argparse
+import json
+import random
+import re
+import statistics
+import sys
+import time
+import unicodedata
+from types import SimpleNamespace
+
+from benchmarks import migrate, temp_instance
+
+
+_RACAS = ["São Bernardo", "Pastor Alemão", "Vira-lata", "Shih Tzu", "Persa", "Siamês",
+          "Maine Coon", "Calopsita", "Lhasa Apso", "Buldogue Francês"]
+_CORES = ["caramelo", "preto", "branco", "tricolor", "rajado", "cinza", "marrom", "dourado"]
+_NOTAS = ["muito dócil", "orelha caída", "castrada", "medroso com trovão", "cego de um olho",
+          "adora crianças", "pelagem longa", "não gosta de gatos", "resgatado na estrada", None]
+_NOMES = ["Açúcar", "Pipoca", "Thor", "Mel", "Luna", "Bidu", "Paçoca", "Estrela", "Tobias", "Jujuba"]
+QUERIES = ["sao bernardo", "pacoca", "docil", "caramelo orelha", "siames", "pastor alem", "gatos"]
+
+
+def _fold(s: str) -> str:
+    return "".join(c for c in unicodedata.normalize("NFD", (s or "").lower()) if not unicodedata.combining(c))
+
+
+def _matches(pet: dict, q: str) -> bool:
+    words = re.findall(r"[^\W_]+", " ".join(_fold(pet[c] or "") for c in
+                                            ("nome", "raca", "cor_pelagem", "especie", "outras_caracteristicas")))
+    return all(any(w.startswith(t) for w in words) for t in re.findall(r"[^\W_]+", _fold(q)))
+
+
+def _median_ms(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return round(statistics.median(times) * 1000.0, 3)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pets", type=int, default=5000)
+    parser.add_argument("--others", type=int, default=20000, help="pets de outros tutores no índice")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    temp_instance("meupet-search-")
+
+    from sqlalchemy import func, insert, or_, text
+    from helpers.application import create_app
+    from helpers.database import db
+    from helpers.search import match_expression
+    from models import Pet
+    from models.pet import PET_FTS_COLUMNS, PET_FTS_DDL, PET_FTS_WEIGHTS, pet_fts
+    from resources.auth_utils import gerar_token
+    from benchmarks.datagen import generate
+
+    rng = random.Random(args.seed)
+
+    def pet_rows(uid, n, start):
+        rows = []
+        for i in range(n):
+            rows.append({
+                "id": start + i, "usuario_id": uid,
+                "nome": f"{rng.choice(_NOMES)} {i:05d}", "especie": rng.choice(["cão", "gato", "ave"]),
+                "porte": "médio", "peso": 5.0, "raca": rng.choice(_RACAS), "cor_pelagem": rng.choice(_CORES),
+                "outras_caracteristicas": rng.choice(_NOTAS),
+            })
+        return rows
+
+    app = create_app()
+    results = {"pets": args.pets, "outros_pets": args.others}
+    with app.app_context():
+        migrate()
+        data = generate(2, "fixed:0", "fixed:0", args.seed)
+        (uid, email, _), (other_uid, _, _) = data["usuarios"]
+        token = gerar_token(SimpleNamespace(id=uid, email=email))
+
+        # custo dos triggers: mesmo lote com e sem o índice FTS
+        others = pet_rows(other_uid, args.others, 1)
+        t0 = time.perf_counter()
+        db.session.execute(insert(Pet), others)
+        db.session.commit()
+        com = time.perf_counter() - t0
+        db.session.execute(text("DELETE FROM pet"))
+        db.session.execute(text("DROP TRIGGER pet_fts_ai"))
+        t0 = time.perf_counter()
+        db.session.execute(insert(Pet), others)
+        db.session.commit()
+        sem = time.perf_counter() - t0
+        db.session.execute(text("DELETE FROM pet"))
+        db.session.commit()
+        db.session.execute(text(PET_FTS_DDL[1]))  # recria o trigger de INSERT
+        db.session.execute(insert(Pet), others)
+        mine = pet_rows(uid, args.pets, args.others + 1)
+        db.session.execute(insert(Pet), mine)
+        db.session.commit()
+        results["insert_us_por_pet"] = {"com_fts": round(com / args.others * 1e6, 1),
+                                        "sem_fts": round(sem / args.others * 1e6, 1)}
+
+    h = {"Authorization": f"Bearer {token}"}
+    c = app.test_client()
+
+    def fts(q):
+        found, cursor = [], None
+        while True:
+            qs = {"q": q, "limit": 500, **({"cursor": cursor} if cursor else {})}
+            r = c.get("/api/pets/search", query_string=qs, headers=h)
+            found += r.get_json()
+            cursor = r.headers.get("X-Next-Cursor")
+            if not cursor:
+                return found
+
+    def fts_sql(q):
+        # mesma consulta do PetSearchResource, sem HTTP/serialização
+        with app.app_context():
+            return (Pet.query.join(pet_fts, pet_fts.c.rowid == Pet.id)
+                    .filter(text("pet_fts MATCH :m").bindparams(m=match_expression(q, PET_FTS_COLUMNS, f"u{uid}")))
+                    .filter(Pet.usuario_id == uid)
+                    .order_by(func.bm25(text("pet_fts"), *PET_FTS_WEIGHTS), Pet.id).all())
+
+    def like(q):
+        with app.app_context():
+            query = Pet.query.filter(Pet.usuario_id == uid)
+            for term in re.findall(r"[^\W_]+", q.lower()):
+                query = query.filter(or_(*[func.lower(getattr(Pet, col)).like(f"%{term}%") for col in
+                                           ("nome", "raca", "cor_pelagem", "especie", "outras_caracteristicas")]))
+            return query.all()
+
+    def dump_filter(q):
+        found, cursor = [], None
+        while True:
+            qs = {"limit": 500, **({"cursor": cursor} if cursor else {})}
+            r = c.get("/api/pets", query_string=qs, headers=h)
+            found += [p for p in r.get_json() if _matches(p, q)]
+            cursor = r.headers.get("X-Next-Cursor")
+            if not cursor:
+                return found
+
+    ok = True
+    results["consultas"] = {}
+    for q in QUERIES:
+        expected = sum(_matches(p, q) for p in mine)
+        got = len(fts(q))
+        ok &= got == expected
+        results["consultas"][q] = {
+            "referencia": expected,
+            "fts": got,
+            "like": len(like(q)),
+            "fts_sql_ms": _median_ms(lambda: fts_sql(q), args.repeat),
+            "like_sql_ms": _median_ms(lambda: like(q), args.repeat),
+            "endpoint_1a_pagina_ms": _median_ms(lambda: c.get(
+                "/api/pets/search", query_string={"q": q, "limit": 20}, headers=h), args.repeat),
+            "dump_cliente_ms": _median_ms(lambda: dump_filter(q), max(3, args.repeat // 10)),
+        }
+
+    print(json.dumps({"ok": ok, **results}, indent=2, ensure_ascii=False))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""
+Confere quantos SQL o GET /api/pets?include=vacinas emite.
+
+Uso (a partir de backend/):
+    python -m benchmarks.query_count
+
+Um usuário com muitos pets (e vacinas) deve ser servido com o mesmo
+número de statements que um usuário com um pet só: uma consulta de
+versão (ETag) + SELECT dos pets + um SELECT ... IN das vacinas
+(selectinload). Sai com código 1 se aparecer N+1.
+"""
+import os
+import re
+import sys
+
+from benchmarks import migrate, temp_instance
+
+os.environ.setdefault("APP_ENV", "dev")
+
+# consultas de versão do ETag (só as colunas versao / colecao_versao)
+ETAG_PROBE = re.compile(r"^SELECT \w+\.(colecao_)?versao AS")
+
+# url -> (statements no total, statements que carregam linhas)
+EXPECTED = {
+    "/api/pets?include=vacinas&limit=500": (3, 2),  # colecao_versao | pets + vacinas IN
+    "/api/pets/1?include=vacinas": (3, 2),          # versao do pet + colecao_versao | pet + vacinas
+}
+
+
+def main() -> int:
+    temp_instance("meupet-count-", "count.db")
+
+    from flask import has_request_context
+    from sqlalchemy import event
+
+    from helpers.application import create_app
+    from helpers.database import db
+    from benchmarks.datagen import BENCH_PASSWORD, generate
+
+    app = create_app()
+    statements = []
+
+    with app.app_context():
+        migrate()
+        # pet 1 (com 3 vacinas) é do primeiro usuário
+        (_, um, _), = generate(1, "fixed:1", "fixed:3")["usuarios"]
+        (_, muitos, _), = generate(1, "fixed:200", "fixed:5")["usuarios"]
+
+        @event.listens_for(db.engine, "before_cursor_execute")
+        def _count(conn, cursor, statement, parameters, context, executemany):
+            if has_request_context():
+                statements.append(" ".join(statement.split()))
+
+    c = app.test_client()
+    failures = 0
+    for email, n_pets in ((um, 1), (muitos, 200)):
+        token = c.post("/api/auth/login", json={"email": email, "senha": BENCH_PASSWORD}).json["token"]
+        h = {"Authorization": f"Bearer {token}"}
+        c.get("/api/me", headers=h)  # aquece o cache de token fora da medição
+
+        for url, (total, rows) in EXPECTED.items():
+            if n_pets == 200 and url.startswith("/api/pets/1"):
+                continue  # pet 1 é do outro usuário
+            statements.clear()
+            r = c.get(url, headers=h)
+            loads = [s for s in statements if not ETAG_PROBE.match(s)]
+            ok = r.status_code == 200 and len(statements) <= total and len(loads) <= rows
+            failures += not ok
+            print(f"[{'ok' if ok else 'FAIL'}] {url} ({n_pets} pets): "
+                  f"{len(statements)} statements, {len(loads)} com linhas")
+            for s in statements:
+                print(f"        {s[:120]}")
+
+    print(f"\n{failures} falhas")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
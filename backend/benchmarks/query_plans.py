@@ -0,0 +1,110 @@
+"""
+Confere o EXPLAIN QUERY PLAN das consultas feitas pelos recursos.
+
+Uso (a partir de backend/):
+    python -m benchmarks.query_plans
+
+Cria um SQLite temporário via migrations (flask db upgrade), exercita os
+endpoints de pet/vacina/usuário, captura cada SELECT emitido e roda
+EXPLAIN QUERY PLAN com os mesmos parâmetros. Sai com código 1 se alguma
+consulta cair em full scan de tabela ou precisar de ordenação temporária.
+"""
+import os
+import re
+import sys
+
+from benchmarks import migrate, temp_instance
+
+os.environ.setdefault("APP_ENV", "dev")
+
+# listar todos os usuários é, por definição, percorrer a PK em ordem
+# revacinações: ordena só as vencidas de um usuário (poucas linhas) -> TEMP B-TREE ok
+# busca: "SCAN pet_fts VIRTUAL TABLE INDEX 0:M" é o MATCH do FTS5; bm25 só existe
+# depois do match, então a ordenação por relevância é sempre um sort
+ALLOWED_SCANS = {("api.usuariolistresource", "usuario"), ("api.revacinacaoresource", None),
+                 ("api.petsearchresource", "pet_fts"), ("api.petsearchresource", None)}
+
+BAD_PLAN = re.compile(r"^SCAN (\w+)|USE TEMP B-TREE")
+
+
+def main() -> int:
+    temp_instance("meupet-plans-", "plans.db")
+
+    from flask import has_request_context, request
+    from sqlalchemy import event
+
+    from helpers.application import create_app
+    from helpers.database import db
+    from benchmarks.datagen import BENCH_PASSWORD, generate
+
+    app = create_app()
+    captured = []
+
+    with app.app_context():
+        migrate()
+        # pets 1..20, vacinas 1..100 em sequência (pet 2 tem as vacinas 6..10)
+        (_, email, _), = generate(1, "fixed:20", "fixed:5")["usuarios"]
+
+        @event.listens_for(db.engine, "before_cursor_execute")
+        def _capture(conn, cursor, statement, parameters, context, executemany):
+            if has_request_context() and statement.lstrip().upper().startswith("SELECT"):
+                captured.append((request.endpoint, statement, parameters))
+
+    c = app.test_client()
+    token = c.post("/api/auth/login", json={"email": email, "senha": BENCH_PASSWORD}).json["token"]
+    h = {"Authorization": f"Bearer {token}"}
+    vac = {"nome": "Nova", "fabricante": "F", "lote": "L", "dose_tamanho": "1ml",
+           "aplicacao": "2024-02-01", "fabricacao": "2023-01-01",
+           "vencimento": "2025-01-01", "revacinacao": "2025-02-01"}
+
+    def walk(url):
+        r = c.get(f"{url}?limit=3", headers=h)
+        if r.headers.get("X-Next-Cursor"):
+            c.get(f"{url}?limit=3&cursor={r.headers['X-Next-Cursor']}", headers=h)
+
+    walk("/api/usuario")
+    walk("/api/pets")
+    walk("/api/pets/1/vacinas")
+    c.get("/api/pets/search?q=pet&limit=3", headers=h)
+    c.get("/api/me", headers=h)
+    c.get("/api/pets/1", headers=h)
+    c.get("/api/pets?include=vacinas", headers=h)
+    c.get("/api/pets/1?include=vacinas", headers=h)
+    c.get("/api/me/revacinacoes?ate=2030-01-01", headers=h)
+    c.put("/api/pets/1", json={"peso": "6"}, headers=h)
+    c.post("/api/pets", json={"nome": "pet 00", "especie": "cão", "porte": "m", "peso": 1,
+                              "raca": "srd", "cor_pelagem": "preto", "data_nascimento": "2020-01-01"}, headers=h)
+    c.post("/api/pets/1/vacinas", json=vac, headers=h)
+    c.get("/api/pets/1/vacinas/1", headers=h)
+    c.put("/api/pets/1/vacinas/1", json={"lote": "L2"}, headers=h)
+    c.delete("/api/pets/2/vacinas/6", headers=h)
+
+    failures = 0
+    seen = set()
+    with app.app_context():
+        raw = db.engine.raw_connection()
+        try:
+            for endpoint, statement, parameters in captured:
+                if (endpoint, statement) in seen:
+                    continue
+                seen.add((endpoint, statement))
+                plan = [row[-1] for row in raw.cursor().execute("EXPLAIN QUERY PLAN " + statement, parameters)]
+                bad = []
+                for line in plan:
+                    m = BAD_PLAN.search(line)
+                    if m and (endpoint, m.group(1)) not in ALLOWED_SCANS:
+                        bad.append(line)
+                status = "FAIL" if bad else "ok"
+                print(f"[{status}] {endpoint}: {' '.join(statement.split())[:120]}")
+                for line in plan:
+                    print(f"        {line}")
+                failures += bool(bad)
+        finally:
+            raw.close()
+
+    print(f"\n{len(seen)} consultas, {failures} com full scan")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
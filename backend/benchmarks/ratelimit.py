@@ -0,0 +1,140 @@
+"""
+Rate limit do login/cadastro: CPU gasta sob credential stuffing.
+
+Uso (a partir de backend/):
+    python -m benchmarks.ratelimit --users 200 --attack 60 --threads 8
+
+Popula um SQLite temporário com benchmarks.datagen e, com o limitador
+desligado e ligado (regras padrão), dispara --attack logins com senha
+errada contra e-mails existentes a partir de poucos IPs (X-Forwarded-For,
+um proxy confiável) enquanto um usuário legítimo faz login de outro IP.
+Mede CPU do processo (process_time), hashes executados, códigos de
+resposta e p50/p95 do usuário legítimo. Também mede take() do
+MemoryBucketStore com 1 e 64 faixas de lock. Imprime JSON.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+from benchmarks import migrate, temp_instance
+
+os.environ.setdefault("APP_ENV", "dev")  # sem MX: só o custo do hash
+# PASSWORD_POOL_WORKERS=0 (padrão do pacote): o hash roda na thread e entra no process_time
+
+from benchmarks.api_suite import percentile  # noqa: E402
+
+
+def _attack(app, emails, attack: int, threads: int, ips: int) -> dict:
+    from helpers import passwords
+    from benchmarks.datagen import BENCH_PASSWORD
+
+    hashes = [0]
+    check = passwords.password_hasher.check
+    lock = threading.Lock()
+
+    def counted(*args, **kwargs):
+        with lock:
+            hashes[0] += 1
+        return check(*args, **kwargs)
+
+    passwords.password_hasher.check = counted
+    statuses, legit = {}, []
+    per_thread = max(1, attack // threads)
+    done = threading.Event()
+
+    def attacker(n):
+        client = app.test_client()
+        for i in range(per_thread):
+            email = emails[(n * per_thread + i) % len(emails)]
+            r = client.post("/api/auth/login", json={"email": email, "senha": "errada"},
+                            headers={"X-Forwarded-For": f"203.0.113.{(n + i) % ips}"})
+            with lock:
+                statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+
+    def legit_user():
+        client = app.test_client()
+        while not done.is_set():
+            t0 = time.perf_counter()
+            r = client.post("/api/auth/login", json={"email": emails[0], "senha": BENCH_PASSWORD},
+                            headers={"X-Forwarded-For": "198.51.100.7"})
+            if r.status_code == 200:
+                legit.append(time.perf_counter() - t0)
+            time.sleep(0.05)
+
+    workers = [threading.Thread(target=attacker, args=(n,)) for n in range(threads)]
+    watcher = threading.Thread(target=legit_user)
+    cpu0, t0 = time.process_time(), time.perf_counter()
+    watcher.start()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    done.set()
+    watcher.join()
+    passwords.password_hasher.check = check
+    return {
+        "wall_s": round(time.perf_counter() - t0, 3),
+        "cpu_s": round(time.process_time() - cpu0, 3),
+        "hashes": hashes[0],
+        "status": {str(k): v for k, v in sorted(statuses.items())},
+        "legitimo": {"logins": len(legit), "p50_ms": percentile(legit, 50), "p95_ms": percentile(legit, 95)},
+    }
+
+
+def _store_throughput(stripes: int, threads: int, ops: int) -> float:
+    from helpers.ratelimit import MemoryBucketStore
+
+    store = MemoryBucketStore(stripes=stripes)
+
+    def run(n):
+        for i in range(ops):
+            store.take(f"login:ip:{n}.{i % 500}", 20, 20 / 60)
+
+    workers = [threading.Thread(target=run, args=(n,)) for n in range(threads)]
+    t0 = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return round(threads * ops / (time.perf_counter() - t0))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--attack", type=int, default=60)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--ips", type=int, default=1, help="IPs distintos do atacante")
+    args = parser.parse_args()
+
+    temp_instance("meupet-rl-")
+
+    from helpers.application import create_app
+    from helpers.ratelimit import MemoryBucketStore, rate_limiter, rules_from_config
+    from benchmarks.datagen import generate
+
+    app = create_app()
+    with app.app_context():
+        migrate()
+        data = generate(args.users, "poisson:1", "uniform:0-1", 42)
+    emails = [email for _, email, _ in data["usuarios"]]
+
+    # create_app() só roda uma vez por processo: troca o limitador na mesma app
+    results = {}
+    rate_limiter.configure(None, {})
+    results["sem_limite"] = _attack(app, emails, args.attack, args.threads, args.ips)
+    rate_limiter.configure(MemoryBucketStore(), rules_from_config(app.config), trusted_proxies=1)
+    results["com_limite"] = _attack(app, emails, args.attack, args.threads, args.ips)
+
+    results["store_take_por_s"] = {
+        f"{s}_faixas": _store_throughput(s, args.threads, 20000) for s in (1, 64)
+    }
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
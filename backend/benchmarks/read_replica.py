@@ -0,0 +1,134 @@
+"""
+Roteamento de leituras para réplica, testável com SQLite local.
+
+Uso (a partir de backend/):
+    python -m benchmarks.read_replica --users 200 --repeat 200
+
+Popula o primário (SQLite temporário, migrations + benchmarks.datagen) e
+copia o arquivo para uma "réplica" (backup API do sqlite3; a cópia não
+recebe escritas, então faz o papel de uma réplica parada). Sobe o app com
+DATABASE_REPLICA_URLS apontando para a cópia e confere, contando
+statements por engine:
+- GETs autenticados leem só da réplica;
+- escritas vão ao primário e o GET seguinte do mesmo usuário também
+  (pin), enxergando o que acabou de gravar; outro usuário segue na réplica;
+- um usuário recém-cadastrado lê /me do primário;
+- depois de REPLICA_PIN_SECONDS o usuário volta para a réplica.
+Mede também a mediana de GET /api/pets em cada papel. Imprime JSON e sai
+com código 1 se alguma checagem falhar.
+"""
+import argparse
+import json
+import os
+import sqlite3
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+
+from benchmarks import migrate, temp_instance
+
+
+def _median_ms(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return round(statistics.median(times) * 1000.0, 3)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--pets", default="poisson:3")
+    parser.add_argument("--vacinas", default="uniform:1-6")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--pin", type=float, default=0.5, help="REPLICA_PIN_SECONDS do teste")
+    args = parser.parse_args()
+
+    tmp = temp_instance("meupet-replica-", "primary.db")
+    primary, replica = tmp / "primary.db", tmp / "replica.db"
+    os.environ["DATABASE_REPLICA_URLS"] = f"sqlite:///{replica}"
+    os.environ["REPLICA_PIN_SECONDS"] = str(args.pin)
+
+    from sqlalchemy import event
+    from helpers.application import create_app
+    from helpers.database import db, replica_router
+    from helpers.mx import mx_cache
+    from resources.auth_utils import gerar_token
+    from benchmarks.datagen import generate
+
+    app = create_app()
+    mx_cache.prime("example.com")  # cadastro sem ir ao DNS
+    with app.app_context():
+        migrate()
+        data = generate(args.users, args.pets, args.vacinas, args.seed)
+        db.session.remove()
+        db.engines[None].dispose()  # fecha o WAL antes de copiar
+        src, dst = sqlite3.connect(primary), sqlite3.connect(replica)
+        src.backup(dst)
+        src.close()
+        dst.close()
+
+        counts = {"primary": 0, "replica": 0}
+        for role, engine in (("primary", db.engines[None]), ("replica", db.engines["replica_0"])):
+            event.listen(engine, "before_cursor_execute",
+                         lambda *a, role=role: counts.__setitem__(role, counts[role] + 1))
+        users = [u for u in data["usuarios"] if u[2]]
+        (uid, email, pets), (other_uid, other_email, _) = users[0], users[1]
+        h = {"Authorization": f"Bearer {gerar_token(SimpleNamespace(id=uid, email=email))}"}
+        h2 = {"Authorization": f"Bearer {gerar_token(SimpleNamespace(id=other_uid, email=other_email))}"}
+
+    c = app.test_client()
+    checks = {}
+
+    def delta(fn):
+        before = dict(counts)
+        rv = fn()
+        return rv, {k: counts[k] - before[k] for k in counts}
+
+    reads = ["/api/me", "/api/pets", f"/api/pets/{pets[0][0]}/vacinas"]
+    _, d = delta(lambda: [c.get(url, headers=h) for url in reads])
+    checks["gets_na_replica"] = d["primary"] == 0 and d["replica"] > 0
+
+    novo = {"nome": f"Replica {time.time_ns()}", "especie": "cão", "porte": "m", "peso": 3,
+            "raca": "srd", "cor_pelagem": "preto", "data_nascimento": "2020-01-01"}
+    r, d = delta(lambda: c.post("/api/pets", json=novo, headers=h))
+    checks["escrita_no_primario"] = r.status_code == 201 and d["replica"] == 0 and d["primary"] > 0
+    new_id = r.get_json()["id"]
+
+    r, d = delta(lambda: c.get("/api/pets", headers=h))
+    checks["pin_le_do_primario"] = d["replica"] == 0 and any(p["id"] == new_id for p in r.get_json())
+    _, d = delta(lambda: c.get("/api/pets", headers=h2))
+    checks["outro_usuario_na_replica"] = d["primary"] == 0 and d["replica"] > 0
+
+    time.sleep(args.pin + 0.1)
+    r, d = delta(lambda: c.get("/api/pets", headers=h))
+    # a cópia não replica: passado o pin, o pet novo "some" (atraso da réplica)
+    checks["pin_expira"] = d["primary"] == 0 and not any(p["id"] == new_id for p in r.get_json())
+
+    r, d = delta(lambda: c.post("/api/usuario", json={
+        "nome": "Réplica Nova", "data": "1990-01-01", "rua": "R", "bairro": "B", "numero": "1",
+        "cep": "12345-678", "cidade": "C", "estado": "SP", "funcao": "tutor",
+        "email": f"replica{time.time_ns()}@example.com", "senha": "senha123"}))
+    checks["cadastro_no_primario"] = r.status_code == 201 and d["replica"] == 0
+    # o usuário novo ainda não existe na réplica: /me precisa vir do primário
+    r, d = delta(lambda: c.get("/api/me", headers={"Authorization": f"Bearer {r.get_json()['token']}"}))
+    checks["cadastro_le_do_primario"] = r.status_code == 200 and d["replica"] == 0
+
+    timing = {"replica_ms": _median_ms(lambda: c.get("/api/pets", headers=h2), args.repeat)}
+    binds = replica_router.binds
+    replica_router.binds = []  # mesmo app, tudo no primário
+    timing["primario_ms"] = _median_ms(lambda: c.get("/api/pets", headers=h2), args.repeat)
+    replica_router.binds = binds
+
+    ok = all(checks.values())
+    print(json.dumps({"ok": ok, "checagens": checks, "statements": counts,
+                      "rotas": replica_router.routed, "get_pets": timing}, indent=2, ensure_ascii=False))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
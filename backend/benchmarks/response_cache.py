@@ -0,0 +1,163 @@
+"""
+Cache de respostas por usuário: confere invalidação e mede o ganho.
+
+Uso (a partir de backend/):
+    python -m benchmarks.response_cache --users 200 --repeat 200
+
+Roda o mesmo roteiro com o backend em memória e com o RedisBackend
+apontando para um stand-in local (LocalRedis, só os comandos usados).
+Depois de cada escrita (pet, vacina, lote, usuário) lê /api/me, /api/pets
+e /api/pets/<id>/vacinas com cache e sem cache e compara os corpos;
+qualquer diferença é uma invalidação que faltou. Mede também a mediana
+de latência com e sem cache e imprime hit ratio e memória em JSON. Sai
+com código 1 se houver divergência.
+"""
+import argparse
+import fnmatch
+import json
+import statistics
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+from benchmarks import migrate, temp_instance
+
+
+class LocalRedis:
+    """Stand-in do cliente redis-py (get/set ex/incr/info/scan_iter/delete)."""
+
+    def __init__(self):
+        self._data = {}  # chave -> (valor bytes, expira_em | None)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or (entry[1] is not None and entry[1] <= time.monotonic()):
+                return None
+            return entry[0]
+
+    def set(self, key, value, ex=None):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ex if ex else None)
+
+    def incr(self, key):
+        with self._lock:
+            value = int(self._data.get(key, (b"0", None))[0]) + 1
+            self._data[key] = (str(value).encode(), None)
+            return value
+
+    def info(self, section=None):
+        with self._lock:
+            return {"used_memory": sum(len(k) + len(v) for k, (v, _) in self._data.items())}
+
+    def scan_iter(self, pattern):
+        with self._lock:
+            return [k for k in self._data if fnmatch.fnmatchcase(k, pattern)]
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+
+def _median_ms(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return round(statistics.median(times) * 1000.0, 3)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--pets", default="poisson:3")
+    parser.add_argument("--vacinas", default="uniform:2-8")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    temp_instance("meupet-cache-")
+
+    from helpers.application import create_app
+    from helpers.cache import MemoryBackend, RedisBackend, response_cache
+    from resources.auth_utils import gerar_token
+    from benchmarks.datagen import generate
+
+    app = create_app()
+    with app.app_context():
+        migrate()
+        data = generate(args.users, args.pets, args.vacinas, args.seed)
+        uid, email, pets = max(data["usuarios"], key=lambda u: len(u[2]))
+        token = gerar_token(SimpleNamespace(id=uid, email=email))
+    h = {"Authorization": f"Bearer {token}"}
+    c = app.test_client()
+    pet_id = pets[0][0]
+    reads = ["/api/me", "/api/pets", "/api/pets?include=vacinas", f"/api/pets/{pet_id}/vacinas"]
+
+    vac = {"nome": "V10", "fabricante": "Fab", "lote": "LC", "dose_tamanho": "1ml",
+           "aplicacao": "2024-03-01", "fabricacao": "2023-06-01",
+           "vencimento": "2025-06-01", "revacinacao": "2025-03-01"}
+    state = {}
+
+    def new_vacina():
+        state["vac"] = c.post(f"/api/pets/{pet_id}/vacinas", json=vac, headers=h).get_json()["id"]
+
+    writes = [
+        ("POST pet", lambda: state.update(pet=c.post("/api/pets", headers=h, json={
+            "nome": f"Cache {len(state)} {time.time_ns()}", "especie": "cão", "porte": "m", "peso": 3,
+            "raca": "srd", "cor_pelagem": "preto", "data_nascimento": "2020-01-01"}).get_json()["id"])),
+        ("PUT pet", lambda: c.put(f"/api/pets/{pet_id}", json={"peso": "7.5"}, headers=h)),
+        ("POST vacina", new_vacina),
+        ("PUT vacina", lambda: c.put(f"/api/pets/{pet_id}/vacinas/{state['vac']}",
+                                     json={"lote": "LC2"}, headers=h)),
+        ("DELETE vacina", lambda: c.delete(f"/api/pets/{pet_id}/vacinas/{state['vac']}", headers=h)),
+        ("POST lote", lambda: c.post(f"/api/pets/{pet_id}/vacinas/batch", json={"vacinas": [vac, vac]},
+                                     headers=h)),
+        ("DELETE pet", lambda: c.delete(f"/api/pets/{state['pet']}", headers=h)),
+        ("PUT usuario", lambda: c.put(f"/api/usuario/{uid}", json={"cidade": "Recife"}, headers=h)),
+    ]
+
+    def read(url, backend):
+        saved = response_cache.backend
+        response_cache.backend = backend
+        try:
+            r = c.get(url, headers=h)
+            return r.status_code, r.get_json(), r.headers.get("X-Cache")
+        finally:
+            response_cache.backend = saved
+
+    results = {}
+    mismatches = []
+    for name, backend in (("memory", MemoryBackend()), ("redis_local", RedisBackend(client=LocalRedis()))):
+        response_cache.configure(backend)
+        for url in reads:  # aquece
+            read(url, backend)
+        for label, write in writes:
+            write()
+            for url in reads:
+                for _ in range(2):  # a segunda leitura já vem do cache
+                    got = read(url, backend)
+                    want = read(url, None)
+                    if got[:2] != want[:2]:
+                        mismatches.append({"backend": name, "apos": label, "url": url, "x_cache": got[2]})
+
+        timing = {}
+        for url in reads:
+            timing[url.replace(str(pet_id), "<id>")] = {
+                "sem_cache_ms": _median_ms(lambda: read(url, None), args.repeat),
+                "com_cache_ms": _median_ms(lambda: read(url, backend), args.repeat),
+            }
+        results[name] = {"stats": response_cache.stats(), "latencia": timing}
+        backend.clear()
+
+    response_cache.configure(None)
+    print(json.dumps({"divergencias": len(mismatches), "exemplos": mismatches[:5], **results},
+                     indent=2, ensure_ascii=False))
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+Benchmark de serialização das listas: schema.dump + json (caminho antigo)
+contra o dump pré-compilado + orjson.
+
+Uso (a partir de backend/):
+    python -m benchmarks.serialization --rows 10000 --repeat 5
+
+Monta objetos do ORM em memória (sem banco), confere que os dois caminhos
+geram o mesmo JSON e imprime a mediana de cada etapa em ms, em JSON.
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+
+def _rows(n):
+    from models import Usuario, Pet, Vacina
+
+    usuarios, pets, vacinas = [], [], []
+    base = date(2024, 1, 1)
+    for i in range(n):
+        usuarios.append(Usuario(
+            id=i + 1, nome="Tutor Exemplo", data=date(1990, 1, 1), rua="Rua A", bairro="Centro",
+            numero=str(i), cep="12345-678", cidade="São Paulo", estado="SP", complemento=None,
+            funcao="tutor", email=f"tutor{i}@example.com", senha="x",
+        ))
+        pets.append(Pet(
+            id=i + 1, usuario_id=1, nome=f"Pet {i}", data_nascimento=date(2020, 1, 1), data_chegada=None,
+            especie="cão", porte="médio", peso=12.5, raca="SRD", cor_pelagem="caramelo",
+            idade_aproximada=None, outras_caracteristicas="dócil", criado_em=datetime(2024, 5, 1, 12, 30),
+        ))
+        vacinas.append(Vacina(
+            id=i + 1, pet_id=(i % 1000) + 1, nome="V10", fabricante="Fab", lote=f"L{i}", dose_tamanho="1ml",
+            observacoes=None, data_aplicacao=base + timedelta(days=i % 365), data_fabricacao=date(2023, 1, 1),
+            data_vencimento=date(2026, 1, 1), data_revac=base + timedelta(days=365 + i % 365),
+        ))
+    # lista com vacinas embutidas: 1 pet a cada 10 vacinas
+    com_vacinas = pets[: max(1, n // 10)]
+    for i, pet in enumerate(com_vacinas):
+        pet.vacinas = vacinas[i * 10:(i + 1) * 10]
+    return usuarios, pets, vacinas, com_vacinas
+
+
+def _median_ms(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return round(statistics.median(times) * 1000.0, 2)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    import orjson
+    from schemas import (
+        usuarios_schema, pets_schema, vacinas_schema, pets_vacinas_schema,
+        dump_usuarios, dump_pets, dump_vacinas, dump_pets_vacinas,
+    )
+
+    usuarios, pets, vacinas, com_vacinas = _rows(args.rows)
+    cases = [
+        ("usuarios", usuarios, usuarios_schema.dump, dump_usuarios),
+        ("pets", pets, pets_schema.dump, dump_pets),
+        ("vacinas", vacinas, vacinas_schema.dump, dump_vacinas),
+        ("pets?include=vacinas", com_vacinas, pets_vacinas_schema.dump, dump_pets_vacinas),
+    ]
+
+    results = {}
+    ok = True
+    for name, objs, schema_dump, fast_dump in cases:
+        old_json = json.dumps(schema_dump(objs))
+        new_json = orjson.dumps(fast_dump(objs))
+        same = json.loads(old_json) == orjson.loads(new_json) and schema_dump(objs) == fast_dump(objs)
+        ok &= same
+        results[name] = {
+            "rows": len(objs),
+            "mesmo_json": same,
+            "schema_dump_ms": _median_ms(lambda: schema_dump(objs), args.repeat),
+            "compilado_ms": _median_ms(lambda: fast_dump(objs), args.repeat),
+            "json_stdlib_ms": _median_ms(lambda: json.dumps(schema_dump(objs)), args.repeat),
+            "compilado_orjson_ms": _median_ms(lambda: orjson.dumps(fast_dump(objs)), args.repeat),
+        }
+        r = results[name]
+        r["speedup"] = round(r["json_stdlib_ms"] / max(r["compilado_orjson_ms"], 1e-6), 1)
+
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""
+Benchmark multi-thread de leitura/escrita no SQLite por perfil de PRAGMA.
+
+Uso (a partir de backend/):
+    python -m benchmarks.sqlite_concurrency --readers 8 --writers 2 --seconds 5
+
+Compara o perfil "default" (só foreign_keys, journal em rollback) com o
+"production" (WAL, synchronous=NORMAL, ...). Leitores listam pets como o
+PetListResource; escritores inserem vacinas e fazem commit_with_retry().
+Imprime throughput, p99 das leituras e erros de cada perfil em JSON.
+"""
+import argparse
+import json
+import tempfile
+import threading
+import time
+from datetime import date
+
+from benchmarks import temp_instance
+
+
+def _p99(values):
+    if not values:
+        return None
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(0.99 * len(values)))] * 1000.0, 2)
+
+
+def run_profile(profile: str, readers: int, writers: int, seconds: float) -> dict:
+    from sqlalchemy import create_engine, func
+    from sqlalchemy.orm import sessionmaker
+
+    from helpers.database import db, configure_sqlite, commit_with_retry
+    from models import Pet, Vacina
+    from benchmarks.datagen import generate
+
+    configure_sqlite(profile)
+    tmp = tempfile.TemporaryDirectory(prefix="meupet-sqlite-")
+    engine = create_engine(f"sqlite:///{tmp.name}/bench.db", pool_size=readers + writers + 2)
+    db.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+
+    with Session() as s:
+        (user_id, _, pets), = generate(1, "fixed:200", "fixed:0", session=s)["usuarios"]
+    pet_ids = [pet_id for pet_id, _ in pets]
+
+    stop = threading.Event()
+    lock = threading.Lock()
+    stats = {"reads": 0, "writes": 0, "errors": 0, "read_lat": []}
+
+    def reader():
+        session = Session()
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            try:
+                (session.query(Pet).filter_by(usuario_id=user_id)
+                 .order_by(func.lower(Pet.nome)).limit(50).all())
+                session.rollback()
+                dt = time.perf_counter() - t0
+                with lock:
+                    stats["reads"] += 1
+                    stats["read_lat"].append(dt)
+            except Exception:
+                session.rollback()
+                with lock:
+                    stats["errors"] += 1
+        session.close()
+
+    def writer(n):
+        session = Session()
+        i = 0
+        while not stop.is_set():
+            i += 1
+            try:
+                vac = Vacina(pet_id=pet_ids[(n * 7919 + i) % len(pet_ids)], nome=f"V{i}",
+                             fabricante="F", data_aplicacao=date(2024, 1, 1),
+                             data_fabricacao=date(2023, 1, 1), data_vencimento=date(2025, 1, 1),
+                             data_revac=date(2025, 1, 1), lote="L", dose_tamanho="1ml")
+                commit_with_retry(lambda: session.add(vac), session)
+                with lock:
+                    stats["writes"] += 1
+            except Exception:
+                session.rollback()
+                with lock:
+                    stats["errors"] += 1
+        session.close()
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    engine.dispose()
+    tmp.cleanup()
+
+    return {
+        "profile": profile,
+        "readers": readers,
+        "writers": writers,
+        "reads_per_s": round(stats["reads"] / elapsed, 1),
+        "writes_per_s": round(stats["writes"] / elapsed, 1),
+        "read_p99_ms": _p99(stats["read_lat"]),
+        "errors": stats["errors"],
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--readers", type=int, default=8)
+    ap.add_argument("--writers", type=int, default=2)
+    ap.add_argument("--seconds", type=float, default=5.0)
+    args = ap.parse_args(argv)
+
+    temp_instance("meupet-logs-", None)
+    results = [run_profile(p, args.readers, args.writers, args.seconds) for p in ("default", "production")]
+    print(json.dumps({"benchmark": "sqlite_concurrency", "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Throughput: servidor de desenvolvimento (app.py) x gunicorn (wsgi.py).
+
+Uso (a partir de backend/):
+    python -m benchmarks.wsgi_throughput --users 200 --duration 10 --concurrency 8 \\
+        --gunicorn 2x4,2x4:nopreload,4x1
+
+Popula um SQLite temporário (migrations + benchmarks.datagen) e sobe, um
+de cada vez, `python app.py` (debug, como hoje) e o gunicorn com cada
+configuração "<workers>x<threads>[:nopreload]". Para cada servidor, N
+threads clientes fazem GETs autenticados (/api/me, /api/pets,
+/api/pets/<id>/vacinas) durante --duration segundos. Imprime JSON com
+req/s, p50/p95, erros e a memória PSS somada dos processos do servidor
+(mostra o compartilhamento copy-on-write do preload).
+
+O gerador de carga roda na mesma máquina: com poucas CPUs ele disputa
+com o servidor e os números servem para comparação relativa.
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+from benchmarks import BACKEND_DIR, migrate, temp_instance
+from benchmarks.api_suite import percentile
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_port(port: int, proc, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"servidor saiu com código {proc.returncode}")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"porta {port} não abriu em {timeout}s")
+
+
+def _tree_pss_mb(pid: int) -> float:
+    """PSS somado do processo e descendentes (Linux, /proc)."""
+    total, stack = 0, [pid]
+    while stack:
+        p = stack.pop()
+        try:
+            with open(f"/proc/{p}/smaps_rollup") as fh:
+                for line in fh:
+                    if line.startswith("Pss:"):
+                        total += int(line.split()[1])
+            with open(f"/proc/{p}/task/{p}/children") as fh:
+                stack.extend(int(c) for c in fh.read().split())
+        except OSError:
+            continue
+    return round(total / 1024.0, 1)
+
+
+def _load(port: int, targets, concurrency: int, duration: float) -> dict:
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    stop = time.monotonic() + duration
+
+    def client(seed):
+        rng = random.Random(seed)
+        conn, local = None, []
+        while time.monotonic() < stop:
+            url, headers = rng.choice(targets)
+            t0 = time.perf_counter()
+            try:
+                if conn is None:
+                    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+                conn.request("GET", url, headers=headers)
+                resp = conn.getresponse()
+                resp.read()
+                ok = resp.status == 200
+                if resp.getheader("Connection", "").lower() == "close" or resp.version == 10:
+                    conn.close()
+                    conn = None
+            except (OSError, http.client.HTTPException):
+                ok = False
+                conn = None
+            if ok:
+                local.append(time.perf_counter() - t0)
+            else:
+                with lock:
+                    errors[0] += 1
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t0
+    return {
+        "requests": len(latencies),
+        "errors": errors[0],
+        "rps": round(len(latencies) / wall, 1),
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+    }
+
+
+def _run_server(cmd, env, port, targets, args) -> dict:
+    proc = subprocess.Popen(cmd, cwd=BACKEND_DIR, env=env, start_new_session=True,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        _wait_port(port, proc)
+        _load(port, targets, args.concurrency, 1.0)  # aquecimento
+        result = _load(port, targets, args.concurrency, args.duration)
+        result["pss_mb"] = _tree_pss_mb(proc.pid)
+        return result
+    finally:
+        os.killpg(proc.pid, signal.SIGTERM)
+        try:
+            proc.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            os.killpg(proc.pid, signal.SIGKILL)
+            proc.wait()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--gunicorn", default="2x4,2x4:nopreload,4x1",
+                        help="configurações <workers>x<threads>[:nopreload], separadas por vírgula")
+    parser.add_argument("--skip-dev", action="store_true")
+    args = parser.parse_args()
+
+    temp_instance("meupet-wsgi-")
+
+    from helpers.application import create_app
+    from resources.auth_utils import gerar_token
+    from benchmarks.datagen import generate
+
+    app = create_app()
+    with app.app_context():
+        migrate()
+        data = generate(args.users, "poisson:3", "uniform:1-6", 42)
+        targets = []
+        for uid, email, pets in data["usuarios"]:
+            if not pets:
+                continue
+            h = {"Authorization": f"Bearer {gerar_token(SimpleNamespace(id=uid, email=email))}"}
+            targets += [("/api/me", h), ("/api/pets", h), (f"/api/pets/{pets[0][0]}/vacinas", h)]
+
+    env = {**os.environ, "PYTHONWARNINGS": "ignore"}
+    results = {}
+    if not args.skip_dev:
+        # app.py fixa 127.0.0.1:5500 com debug=True (reloader incluso)
+        results["dev (app.py)"] = _run_server([sys.executable, "app.py"], env, 5500, targets, args)
+
+    for spec in filter(None, (s.strip() for s in args.gunicorn.split(","))):
+        shape, _, flag = spec.partition(":")
+        workers, threads = (int(x) for x in shape.split("x"))
+        port = _free_port()
+        genv = {**env, "GUNICORN_BIND": f"127.0.0.1:{port}", "WEB_CONCURRENCY": str(workers),
+                "GUNICORN_THREADS": str(threads), "GUNICORN_PRELOAD": "0" if flag == "nopreload" else "1"}
+        results[f"gunicorn {spec}"] = _run_server(
+            [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "wsgi:app"], genv, port, targets, args)
+
+    print(json.dumps({"cpus": os.cpu_count(), "concurrency": args.concurrency,
+                      "duration_s": args.duration, "servidores": results}, indent=2, ensure_ascii=False))
+    return 0 if all(r["errors"] == 0 for r in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+# backend/gunicorn.conf.py
+"""
+Config do gunicorn (produção). Tudo ajustável por variável de ambiente:
+
+    GUNICORN_BIND        endereço (padrão 0.0.0.0:$PORT ou 0.0.0.0:8000)
+    WEB_CONCURRENCY      processos (padrão 2 * CPUs + 1)
+    GUNICORN_THREADS     threads por processo (padrão 4; > 1 usa gthread)
+    GUNICORN_PRELOAD     "1" carrega o app no master antes do fork (padrão),
+                         compartilhando memória copy-on-write entre workers
+    GUNICORN_TIMEOUT     segundos (padrão 30)
+    GUNICORN_MAX_REQUESTS  recicla o worker após N requests (0 desliga)
+
+Com mais de um processo use RESPONSE_CACHE=redis (ou none): o cache em
+memória é por processo. REVAC_SCHEDULER=1 com mais de um processo exige
+REVAC_INVALIDATION_URL; sem ela o master se recusa a subir. O padrão de
+PASSWORD_POOL_WORKERS divide as CPUs por WEB_CONCURRENCY.
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get("GUNICORN_BIND", f"0.0.0.0:{os.environ.get('PORT', '8000')}")
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+# o app lê o total de processos para dimensionar o pool de hashing
+os.environ.setdefault("WEB_CONCURRENCY", str(workers))
+threads = int(os.environ.get("GUNICORN_THREADS", "4"))
+worker_class = "gthread" if threads > 1 else "sync"
+preload_app = os.environ.get("GUNICORN_PRELOAD", "1") == "1"
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = timeout
+keepalive = 5
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = max_requests // 10
+
+# log de acesso fica no app (LOG_ACCESS / X-Request-ID)
+accesslog = None
+errorlog = "-"
+
+
+def on_starting(server):
+    # fila de revacinação com marcas só em memória: a escrita atendida por um
+    # worker não invalidaria a fila dos outros até o rebuild do dia seguinte
+    if (server.cfg.workers > 1 and os.environ.get("REVAC_SCHEDULER", "0") == "1"
+            and not os.environ.get("REVAC_INVALIDATION_URL")):
+        raise RuntimeError("REVAC_SCHEDULER com mais de um worker exige REVAC_INVALIDATION_URL (Redis).")
+
+
+def post_fork(server, worker):
+    # sem preload o app ainda não foi importado neste ponto: nada herdado
+    if server.cfg.preload_app:
+        from helpers.application import after_fork
+        from wsgi import app
+        after_fork(app)
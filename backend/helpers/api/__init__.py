@@ -1,20 +1,73 @@
 # backend/helpers/api/__init__.py  (mostrando só a parte relevante)
-from flask import Blueprint
+from flask import Blueprint, current_app, make_response
+from flask.json.provider import DefaultJSONProvider
 from flask_restful import Api
+from flask_restful.representations.json import output_json as stdlib_output_json
 import os
 
+try:
+    import orjson
+except ImportError:  # opcional: sem orjson fica o json da stdlib
+    orjson = None
+
 api_bp = Blueprint("api", __name__, url_prefix="/api")
 api = Api(api_bp)
 
+
+class ORJSONProvider(DefaultJSONProvider):
+    """app.json com orjson (jsonify, request.get_json). Datas saem em ISO 8601."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        return self._encode(obj, kwargs.get("sort_keys", False), kwargs.get("indent")).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = None if self.compact or (self.compact is None and not current_app.debug) else 2
+        body = self._encode(obj, self.sort_keys, indent) + b"\n"
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+    def _encode(self, obj, sort_keys=False, indent=None) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option)
+
+
+@api.representation("application/json")
+def output_json(data, code, headers=None):
+    """Representação JSON do Flask-RESTful; usa orjson quando disponível."""
+    if orjson is None or not current_app.config.get("JSON_ORJSON"):
+        return stdlib_output_json(data, code, headers)
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+    if current_app.debug:
+        option |= orjson.OPT_INDENT_2
+    resp = make_response(orjson.dumps(data, default=DefaultJSONProvider.default, option=option), code)
+    resp.headers.extend(headers or {})
+    return resp
+
+
+def init_json(app) -> None:
+    app.config.setdefault("JSON_ORJSON", os.environ.get("JSON_ORJSON", "1") == "1")
+    if orjson is not None and app.config["JSON_ORJSON"]:
+        app.json = ORJSONProvider(app)
+
 def register_resources() -> None:
     from resources.auth_resource import AuthLoginResource
     from resources.usuario_resource import (
         UsuarioListResource, UsuarioDetailResource, MeResource, UsuarioDebugListResource
     )
     from resources.pet_resource import (
-        PetListResource, PetDetailResource, VacinaListResource  # mantém import da lista
+        PetListResource, PetSearchResource, PetDetailResource, VacinaListResource  # mantém import da lista
     )
-    from resources.vacina_resource import VacinaDetailResource  # <— NOVO
+    from resources.vacina_resource import VacinaDetailResource, VacinaBatchResource
+    from resources.export_resource import MeExportResource
+    from resources.revacinacao_resource import RevacinacaoResource
+    from resources.dev_resource import SlowQueryDebugResource
 
     # Auth
     api.add_resource(AuthLoginResource, "/auth/login")
@@ -23,12 +76,17 @@ def register_resources() -> None:
     api.add_resource(UsuarioListResource, "/usuario")
     api.add_resource(UsuarioDetailResource, "/usuario/<int:user_id>")
     api.add_resource(MeResource, "/me")
+    api.add_resource(MeExportResource, "/me/export")  # NDJSON (stream)
+    api.add_resource(RevacinacaoResource, "/me/revacinacoes")  # GET ?ate=AAAA-MM-DD
 
     # Pets/Vacinas
     api.add_resource(PetListResource, "/pets")
+    api.add_resource(PetSearchResource, "/pets/search")  # GET ?q=texto (FTS5, bm25)
     api.add_resource(PetDetailResource, "/pets/<int:pet_id>")
     api.add_resource(VacinaListResource, "/pets/<int:pet_id>/vacinas")  # GET/POST (lista/cria)
     api.add_resource(VacinaDetailResource, "/pets/<int:pet_id>/vacinas/<int:vacina_id>")  # GET/PUT/DELETE
+    api.add_resource(VacinaBatchResource, "/pets/<int:pet_id>/vacinas/batch")  # POST (lote)
 
     if os.environ.get("APP_ENV") == "dev":
         api.add_resource(UsuarioDebugListResource, "/_dev/users")
+        api.add_resource(SlowQueryDebugResource, "/_dev/slow-queries")  # GET ?limit=N / DELETE
@@ -1,13 +1,20 @@
 import os
 from datetime import timedelta
 from pathlib import Path
-from flask import Flask, jsonify
+from flask import Flask, Response, abort, jsonify
 from marshmallow import ValidationError
 
 from helpers.database import init_db
 from helpers.cors import init_cors
-from helpers.logging import logger
-from helpers.api import api_bp, register_resources
+from helpers.mx import init_mx
+from helpers.passwords import init_passwords
+from helpers.cache import init_cache
+from helpers.ratelimit import init_ratelimit
+from helpers.logging import logger, init_logging
+from helpers.metrics import init_metrics, registry
+from helpers.profiling import init_profiling
+from helpers.compression import init_compression
+from helpers.api import api_bp, register_resources, init_json
 
 
 
@@ -17,6 +24,23 @@ def _sqlite_instance_uri() -> str:
     instance_dir.mkdir(parents=True, exist_ok=True)
     return f"sqlite:///{(instance_dir / 'meupet.db').as_posix()}"
 
+def after_fork(app) -> None:
+    """
+    Chamado no worker logo após o fork (gunicorn com preload_app): conexões
+    do pool herdadas do master não podem ser usadas pelo filho, e threads
+    (listener de log, jobs) não existem mais.
+    """
+    from helpers.database import db
+    from helpers.logging import restart_after_fork as restart_logging
+    from helpers.scheduler import restart_after_fork as restart_jobs
+
+    restart_logging()
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)  # descarta sem fechar os sockets do master
+    restart_jobs()
+
+
 def create_app() -> Flask:
     app = Flask(__name__, instance_relative_config=True)
 
@@ -24,22 +48,55 @@ def create_app() -> Flask:
     app.config.setdefault("SQLALCHEMY_TRACK_MODIFICATIONS", False)
     app.config.setdefault("SECRET_KEY", os.environ.get("SECRET_KEY", "dev-secret"))
     app.config.setdefault("JWT_SECRET", os.environ.get("JWT_SECRET", "123456789"))
+    app.config.setdefault("JWT_EXPIRES", timedelta(seconds=int(os.environ.get("JWT_EXPIRES_SECONDS", 7 * 86400))))
+    app.config.setdefault("TOKEN_CACHE_SIZE", int(os.environ.get("TOKEN_CACHE_SIZE", "4096")))
+    app.config.setdefault("TOKEN_CACHE_TTL", float(os.environ.get("TOKEN_CACHE_TTL", "60")))
     app.config.setdefault("JSON_SORT_KEYS", False)
     app.config.setdefault("PERMANENT_SESSION_LIFETIME", timedelta(days=7))
+    app.config.setdefault("PAGE_DEFAULT_LIMIT", int(os.environ.get("PAGE_DEFAULT_LIMIT", "100")))
+    app.config.setdefault("PAGE_MAX_LIMIT", int(os.environ.get("PAGE_MAX_LIMIT", "500")))
+    app.config.setdefault("VACINA_BATCH_MAX", int(os.environ.get("VACINA_BATCH_MAX", "500")))
+    app.config.setdefault("EXPORT_YIELD_PER", int(os.environ.get("EXPORT_YIELD_PER", "1000")))
+    app.config.setdefault("REVAC_SCHEDULER", os.environ.get("REVAC_SCHEDULER", "0") == "1")
+    app.config.setdefault("REVAC_SCHEDULER_HOUR", int(os.environ.get("REVAC_SCHEDULER_HOUR", "3")))
+    app.config.setdefault("REVAC_HORIZON_DAYS", int(os.environ.get("REVAC_HORIZON_DAYS", "30")))
+    app.config.setdefault("REVAC_INVALIDATION_URL", os.environ.get("REVAC_INVALIDATION_URL", ""))
 
     logger.info(f"DB: {app.config['SQLALCHEMY_DATABASE_URI']}")
 
+    init_profiling(app)  # primeiro: o profile cobre os demais hooks
+    init_compression(app)  # registrado cedo: o after_request roda por último
+    init_logging(app)
     init_db(app)
+    init_json(app)
     init_cors(app)
+    init_mx(app)
+    init_passwords(app)
+    init_cache(app)
+    init_ratelimit(app)
+    init_metrics(app)
 
     # API v1
     register_resources()
+    from resources.auth_utils import token_cache
+    token_cache.maxsize = app.config["TOKEN_CACHE_SIZE"]
+    token_cache.ttl = app.config["TOKEN_CACHE_TTL"]
     app.register_blueprint(api_bp)
 
+    from resources.revacinacao_resource import init_revac_scheduler
+    init_revac_scheduler(app)
+
     @app.get("/health")
     def health():
         return jsonify(status="ok"), 200
 
+    @app.get("/metrics")
+    def metrics():
+        # formato texto do Prometheus (métricas deste processo)
+        if not app.config["METRICS_ENABLED"]:
+            abort(404)
+        return Response(registry.render(), mimetype="text/plain; version=0.0.4")
+
     # handlers comuns
     @app.errorhandler(404)
     def handle_404(err):
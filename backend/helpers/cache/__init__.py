@@ -0,0 +1,283 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import Response, g, request
+from flask_restful.utils import unpack
+
+from helpers.etag import not_modified
+from helpers.metrics import registry
+
+try:
+    import redis
+except ImportError:  # opcional: só o backend em memória
+    redis = None
+
+
+def _pack(headers: dict, body: bytes) -> bytes:
+    return json.dumps(headers).encode() + b"\n" + body
+
+
+def _unpack(raw: bytes):
+    head, _, body = raw.partition(b"\n")
+    return json.loads(head), body
+
+
+class MemoryBackend:
+    """
+    LRU em memória limitado por bytes (corpo + chave), com TTL por entrada.
+    Só serve para um processo: com vários workers cada um teria o seu
+    contador de geração e um não veria as escritas do outro.
+
+    As gerações também são LRU (max_users). Quem sai do mapa passa a valer
+    o piso, o maior valor já descartado: a geração de ninguém volta para um
+    número que ainda tenha entradas no cache.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, max_users: int = 100_000):
+        self.max_bytes = max_bytes
+        self.max_users = max_users
+        self._entries = OrderedDict()      # chave -> (valor, expira_em)
+        self._generations = OrderedDict()  # user_id -> int
+        self._floor = 0                    # geração de quem não está no mapa
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires <= time.monotonic():
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        size = len(key) + len(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+
+    def _drop(self, key: str) -> None:
+        value, _ = self._entries.pop(key)
+        self._bytes -= len(key) + len(value)
+
+    def generation(self, user_id: int) -> int:
+        with self._lock:
+            gen = self._generations.get(user_id)
+            if gen is None:
+                return self._floor
+            self._generations.move_to_end(user_id)
+            return gen
+
+    def bump(self, user_id: int) -> int:
+        with self._lock:
+            gen = self._generations.pop(user_id, self._floor) + 1
+            self._generations[user_id] = gen
+            while len(self._generations) > self.max_users:
+                _, old = self._generations.popitem(last=False)
+                self._floor = max(self._floor, old)
+            return gen
+
+    def forget(self, user_id: int) -> None:
+        """Tira o usuário (ex.: conta excluída) do mapa de gerações."""
+        with self._lock:
+            old = self._generations.pop(user_id, None)
+            if old is not None:
+                self._floor = max(self._floor, old)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+            self._floor = 0
+            self._bytes = 0
+
+
+class RedisBackend:
+    """
+    Backend compartilhado entre processos (GET/SET EX/INCR). Aceita um
+    `client` pronto (ex.: um stand-in local nos benchmarks) ou uma URL.
+    """
+
+    def __init__(self, client=None, url: str = None, prefix: str = "meupet:rc:"):
+        if client is None:
+            if redis is None:
+                raise RuntimeError("RESPONSE_CACHE=redis exige o pacote redis.")
+            client = redis.Redis.from_url(url or "redis://localhost:6379/0")
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str):
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.client.set(self.prefix + key, value, ex=max(1, int(ttl)))
+
+    def generation(self, user_id: int) -> int:
+        return int(self.client.get(f"{self.prefix}gen:{user_id}") or 0)
+
+    def bump(self, user_id: int) -> int:
+        # sem TTL: a geração não pode voltar para um valor já usado
+        return int(self.client.incr(f"{self.prefix}gen:{user_id}"))
+
+    def forget(self, user_id: int) -> None:
+        # a chave fica: apagá-la voltaria a geração para 0 com entradas vivas
+        pass
+
+    def stats(self) -> dict:
+        try:
+            used = self.client.info("memory").get("used_memory")
+        except Exception:
+            used = None
+        return {"entries": None, "bytes": used}
+
+    def clear(self) -> None:
+        for key in self.client.scan_iter(self.prefix + "*"):
+            self.client.delete(key)
+
+
+class ResponseCache:
+    """
+    Cache de respostas GET por usuário. Chave = usuário + geração + URL;
+    toda escrita do usuário faz bump() da geração (O(1)) e as entradas
+    antigas deixam de ser alcançadas, saindo por LRU/TTL.
+    """
+
+    def __init__(self):
+        self.backend = None
+        self.ttl = 300.0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def configure(self, backend, ttl: float = None) -> None:
+        self.backend = backend
+        if ttl is not None:
+            self.ttl = ttl
+        self.hits = self.misses = 0
+
+    def bump(self, user_id: int) -> None:
+        if self.backend is not None:
+            self.backend.bump(user_id)
+
+    def forget(self, user_id: int) -> None:
+        """Conta excluída: invalida as respostas e solta o contador do usuário."""
+        if self.backend is not None:
+            self.backend.bump(user_id)
+            self.backend.forget(user_id)
+
+    def cached(self, fn):
+        """Decorator de GET (depois do login_required): só guarda respostas 200."""
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            backend = self.backend
+            if backend is None:
+                return fn(*args, **kwargs)
+            uid = g.current_user_id
+            # geração lida ANTES da consulta: se uma escrita entrar no meio,
+            # a resposta fica gravada numa geração já velha (inalcançável)
+            key = f"{uid}:{backend.generation(uid)}:{request.full_path}"
+            raw = backend.get(key)
+            if raw is not None:
+                self.hits += 1
+                headers, body = _unpack(raw)
+                etag = headers.get("ETag")
+                if etag and not_modified(etag):
+                    return "", 304, {k: v for k, v in headers.items() if k in ("ETag", "Cache-Control")}
+                return Response(body, 200, {**headers, "X-Cache": "HIT"}, mimetype="application/json")
+
+            self.misses += 1
+            rv = fn(*args, **kwargs)
+            if isinstance(rv, Response):
+                return rv
+            data, code, headers = unpack(rv)
+            if code != 200:
+                return rv
+            from helpers.api import api  # mesma serialização/Content-Type do Flask-RESTful
+            resp = api.make_response(data, code, headers=headers)
+            stored = {k: v for k, v in resp.headers.items() if k not in ("Content-Type", "Content-Length")}
+            backend.set(key, _pack(stored, resp.get_data()), self.ttl)
+            resp.headers["X-Cache"] = "MISS"
+            return resp
+        return wrapper
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits / total) if total else 0.0,
+            **(self.backend.stats() if self.backend is not None else {"entries": 0, "bytes": 0}),
+        }
+
+
+response_cache = ResponseCache()
+
+
+@registry.collector
+def _cache_metrics() -> list:
+    if not response_cache.enabled:
+        return []
+    s = response_cache.stats()
+    lines = [
+        "# HELP meupet_response_cache_requests_total GETs atendidos pelo cache de respostas.",
+        "# TYPE meupet_response_cache_requests_total counter",
+        f'meupet_response_cache_requests_total{{result="hit"}} {s["hits"]}',
+        f'meupet_response_cache_requests_total{{result="miss"}} {s["misses"]}',
+    ]
+    if s["bytes"] is not None:
+        lines += [
+            "# HELP meupet_response_cache_bytes Memória usada pelo cache de respostas.",
+            "# TYPE meupet_response_cache_bytes gauge",
+            f"meupet_response_cache_bytes {s['bytes']}",
+        ]
+    if s["entries"] is not None:
+        lines += [
+            "# HELP meupet_response_cache_entries Entradas no cache de respostas.",
+            "# TYPE meupet_response_cache_entries gauge",
+            f"meupet_response_cache_entries {s['entries']}",
+        ]
+    return lines
+
+
+def init_cache(app) -> None:
+    """
+    RESPONSE_CACHE: "none" (padrão), "memory" (um processo só) ou "redis"
+    (compartilhado; RESPONSE_CACHE_URL).
+    """
+    app.config.setdefault("RESPONSE_CACHE", os.environ.get("RESPONSE_CACHE", "none"))
+    app.config.setdefault("RESPONSE_CACHE_TTL", float(os.environ.get("RESPONSE_CACHE_TTL", "300")))
+    app.config.setdefault("RESPONSE_CACHE_MAX_BYTES",
+                          int(os.environ.get("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024))))
+    app.config.setdefault("RESPONSE_CACHE_URL", os.environ.get("RESPONSE_CACHE_URL", ""))
+
+    kind = app.config["RESPONSE_CACHE"]
+    if kind == "memory":
+        backend = MemoryBackend(app.config["RESPONSE_CACHE_MAX_BYTES"])
+    elif kind == "redis":
+        backend = RedisBackend(url=app.config["RESPONSE_CACHE_URL"] or None)
+    elif kind == "none":
+        backend = None
+    else:
+        raise ValueError(f"RESPONSE_CACHE inválido: {kind}")
+    response_cache.configure(backend, app.config["RESPONSE_CACHE_TTL"])
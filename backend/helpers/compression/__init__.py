@@ -0,0 +1,114 @@
+import gzip
+import os
+import time
+import zlib
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # opcional: sem brotli só gzip
+    brotli = None
+
+COMPRESSIBLE = {"application/json", "application/x-ndjson", "text/plain", "text/html", "text/csv"}
+# streams: flush logo no 1º pedaço e depois a cada N bytes de entrada ou
+# T segundos (o que vier antes) para o cliente ver progresso
+STREAM_FLUSH_BYTES = 64 * 1024
+STREAM_FLUSH_SECONDS = 0.25
+
+
+def choose_encoding(accept, brotli_ok: bool = True):
+    """'br', 'gzip' ou None conforme o Accept-Encoding (respeita q=0)."""
+    br = accept.quality("br") if brotli is not None and brotli_ok else 0
+    gz = accept.quality("gzip")
+    if br and br >= gz:
+        return "br"
+    return "gzip" if gz else None
+
+
+def compress(data: bytes, encoding: str, level: int = 6, br_quality: int = 4) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=br_quality)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def _compress_stream(chunks, encoding: str, level: int, br_quality: int):
+    if encoding == "br":
+        comp = brotli.Compressor(quality=br_quality)
+        feed, flush, finish = comp.process, comp.flush, comp.finish
+    else:
+        comp = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31 = container gzip
+        feed, finish = comp.compress, comp.flush
+        flush = lambda: comp.flush(zlib.Z_SYNC_FLUSH)  # noqa: E731
+    pending = 0
+    last_flush = None  # None: nada enviado ainda
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            out = feed(chunk)
+            pending += len(chunk)
+            now = time.monotonic()
+            # o prazo só é conferido quando chega um pedaço: um gerador parado
+            # (ex.: lendo o próximo lote do banco) segura o que já foi comprimido
+            if (last_flush is None or pending >= STREAM_FLUSH_BYTES
+                    or now - last_flush >= STREAM_FLUSH_SECONDS):
+                out += flush()
+                pending = 0
+                last_flush = now
+            if out:
+                yield out
+        yield finish()
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+def init_compression(app) -> None:
+    """
+    Compressão gzip/brotli das respostas (negociada pelo Accept-Encoding).
+
+    Corpos abaixo de COMPRESS_MIN_SIZE saem sem compressão; streams (ex.:
+    /me/export) são comprimidos em pedaços, sem bufferizar a resposta.
+    Brotli só é oferecido com o pacote `brotli` instalado.
+    """
+    app.config.setdefault("COMPRESS_ENABLED", os.environ.get("COMPRESS_ENABLED", "1") == "1")
+    app.config.setdefault("COMPRESS_MIN_SIZE", int(os.environ.get("COMPRESS_MIN_SIZE", "1024")))
+    app.config.setdefault("COMPRESS_LEVEL", int(os.environ.get("COMPRESS_LEVEL", "6")))
+    app.config.setdefault("COMPRESS_BR_QUALITY", int(os.environ.get("COMPRESS_BR_QUALITY", "4")))
+    app.config.setdefault("COMPRESS_BROTLI", os.environ.get("COMPRESS_BROTLI", "1") == "1")
+    if not app.config["COMPRESS_ENABLED"]:
+        return
+
+    min_size = app.config["COMPRESS_MIN_SIZE"]
+    level = app.config["COMPRESS_LEVEL"]
+    br_quality = app.config["COMPRESS_BR_QUALITY"]
+    brotli_ok = app.config["COMPRESS_BROTLI"]
+
+    @app.after_request
+    def _compress(response):
+        if (response.mimetype not in COMPRESSIBLE or request.method == "HEAD"
+                or response.status_code < 200 or response.status_code in (204, 206, 304)
+                or "Content-Encoding" in response.headers):
+            return response
+        response.vary.add("Accept-Encoding")
+        encoding = choose_encoding(request.accept_encodings, brotli_ok)
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = _compress_stream(response.response, encoding, level, br_quality)
+            response.headers.pop("Content-Length", None)
+        else:
+            data = response.get_data()
+            if len(data) < min_size:
+                return response
+            response.set_data(compress(data, encoding, level, br_quality))
+
+        response.headers["Content-Encoding"] = encoding
+        # o corpo mudou: ETag forte vira fraca (If-None-Match já compara fraco)
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
@@ -11,8 +11,8 @@ def init_cors(app) -> None:
         app,
         resources={r"/api/*": {"origins": origins}},
         supports_credentials=True,
-        expose_headers=["Authorization"],
-        allow_headers=["Authorization", "Content-Type"],
+        expose_headers=["Authorization", "X-Next-Cursor", "X-Request-ID"],
+        allow_headers=["Authorization", "Content-Type", "X-Request-ID"],
         methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
         max_age=86400,
     )
@@ -1,24 +1,526 @@
+import os
+import random
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+
+from flask import g, has_request_context, request
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
 from flask_migrate import Migrate
 from sqlalchemy import event
 from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from helpers.logging import logger
+from helpers.metrics import registry
+
+try:
+    import redis
+except ImportError:  # opcional: marcas de pin só em memória
+    redis = None
+
+
+class ReplicaRouter:
+    """
+    Roteia SELECTs de requests GET/HEAD para uma réplica (binds
+    "replica_N"); escritas, CLI/jobs e usuários que escreveram há menos de
+    pin_seconds ficam no primário (read-your-writes).
+
+    A marca de pin é por processo; com vários workers use REPLICA_PIN_URL
+    (Redis) para que todos a vejam. pin_seconds deve cobrir o atraso da
+    replicação. Se o Redis falhar, o pin fica só na memória do worker e a
+    checagem manda a leitura para o primário.
+    """
+
+    def __init__(self):
+        self.binds = []
+        self.pin_seconds = 5.0
+        self.client = None
+        self.prefix = "meupet:pin:"
+        self.routed = {"primary": 0, "replica": 0}
+        self._pins = {}  # user_id -> expira_em (monotonic)
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.binds)
+
+    def configure(self, binds, pin_seconds: float = None, client=None) -> None:
+        self.binds = list(binds)
+        if pin_seconds is not None:
+            self.pin_seconds = pin_seconds
+        self.client = client
+        self.routed = {"primary": 0, "replica": 0}
+        with self._lock:
+            self._pins.clear()
+
+    def pin(self, user_id: int) -> None:
+        if self.client is not None:
+            try:
+                self.client.set(f"{self.prefix}{user_id}", b"1", px=max(1, int(self.pin_seconds * 1000)))
+                return
+            except Exception:
+                # o commit já aconteceu: não virar 500; ao menos este worker lê do primário
+                logger.warning("Réplica: Redis indisponível, pin local de %s", user_id, exc_info=True)
+        now = time.monotonic()
+        with self._lock:
+            self._pins[user_id] = now + self.pin_seconds
+            if len(self._pins) > 10000:
+                for uid in [u for u, exp in self._pins.items() if exp <= now]:
+                    del self._pins[uid]
+
+    def is_pinned(self, user_id: int) -> bool:
+        if self.client is not None:
+            try:
+                if self.client.exists(f"{self.prefix}{user_id}"):
+                    return True
+            except Exception:
+                logger.warning("Réplica: Redis indisponível, %s vai para o primário", user_id, exc_info=True)
+                return True
+        with self._lock:
+            expires = self._pins.get(user_id)
+        return expires is not None and expires > time.monotonic()
+
+    def replica_for_request(self):
+        """Bind da réplica desta request, ou None para o primário (decidido uma vez)."""
+        if not has_request_context():
+            return None
+        if "_db_replica" not in g:
+            replica = None
+            if request.method in ("GET", "HEAD"):
+                uid = g.get("current_user_id")
+                if uid is None or not self.is_pinned(uid):
+                    replica = random.choice(self.binds)
+            self.routed["replica" if replica else "primary"] += 1
+            g._db_replica = replica
+        return g._db_replica
+
+
+replica_router = ReplicaRouter()
+
+
+class RoutingSession(Session):
+    """Session do db: SELECT fora de flush vai para a réplica da request."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None and replica_router.binds and not self._flushing
+                and getattr(clause, "is_select", False)):
+            key = replica_router.replica_for_request()
+            if key is not None:
+                return self._db.engines[key]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _include_name(name, type_, parent_names) -> bool:
+    # FTS5 (tabela virtual + sombras pet_fts_*) é criado à mão na migration;
+    # o autogenerate não deve propor DROP dessas tabelas
+    return not (type_ == "table" and name.startswith("pet_fts"))
+
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
+migrate = Migrate(include_name=_include_name)
+
 
-db = SQLAlchemy()
-migrate = Migrate()
+@event.listens_for(RoutingSession, "after_flush")
+def _collect_new_users(session, flush_context):
+    # cadastro: ainda não há g.current_user_id, o pin vai para o id novo
+    for obj in session.new:
+        if getattr(obj, "__tablename__", None) == "usuario":
+            session.info.setdefault("_pin_users", set()).add(obj.id)
 
-# Liga PRAGMA foreign_keys=ON em conexões SQLite
+
+@event.listens_for(RoutingSession, "after_commit")
+def _pin_writer(session):
+    users = session.info.pop("_pin_users", set())
+    if not replica_router.binds:
+        return
+    if has_request_context() and request.method not in ("GET", "HEAD"):
+        uid = g.get("current_user_id")
+        if uid is not None:
+            users.add(uid)
+    for uid in users:
+        replica_router.pin(uid)
+
+
+@event.listens_for(RoutingSession, "after_soft_rollback")
+def _drop_pending_pins(session, previous_transaction):
+    session.info.pop("_pin_users", None)
+
+
+@registry.collector
+def _replica_metrics() -> list:
+    if not replica_router.enabled:
+        return []
+    return [
+        "# HELP meupet_db_read_routes_total Requests com leitura, por destino (primário/réplica).",
+        "# TYPE meupet_db_read_routes_total counter",
+        f'meupet_db_read_routes_total{{role="primary"}} {replica_router.routed["primary"]}',
+        f'meupet_db_read_routes_total{{role="replica"}} {replica_router.routed["replica"]}',
+    ]
+
+# Perfis de PRAGMA aplicados em cada conexão SQLite nova.
+#  - "default": só foreign_keys (comportamento antigo)
+#  - "production": WAL + synchronous=NORMAL + caches; leitores não bloqueiam escritas
+SQLITE_PROFILES = {
+    "default": {},
+    "production": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,       # ms
+        "cache_size": -20000,       # negativo = KiB (~20 MB)
+        "mmap_size": 268435456,     # 256 MB
+        "temp_store": "MEMORY",
+    },
+}
+
+sqlite_pragmas = dict(SQLITE_PROFILES["production"])
+
+sqlite_retry = {"retries": 3, "backoff": 0.05}
+
+# SQLITE_BUSY / SQLITE_BUSY_RECOVERY / SQLITE_BUSY_SNAPSHOT
+_SQLITE_BUSY_CODES = {5, 261, 517}
+
+
+# valores aceitos por PRAGMA: o SQLite ignora em silêncio um valor inválido
+# (ex.: synchronous=NORMALL), então a checagem é feita aqui
+_PRAGMA_CHOICES = {
+    "journal_mode": {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"},
+    "synchronous": {"OFF", "NORMAL", "FULL", "EXTRA", "0", "1", "2", "3"},
+    "temp_store": {"DEFAULT", "FILE", "MEMORY", "0", "1", "2"},
+}
+_PRAGMA_INTS = {"busy_timeout", "cache_size", "mmap_size"}
+
+
+def _check_pragma(name: str, value) -> None:
+    if name in _PRAGMA_CHOICES:
+        if str(value).upper() not in _PRAGMA_CHOICES[name]:
+            raise ValueError(f"PRAGMA {name} inválido: {value!r}")
+    elif name in _PRAGMA_INTS:
+        try:
+            int(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"PRAGMA {name} inválido: {value!r}") from None
+    else:
+        raise ValueError(f"PRAGMA desconhecido: {name}")
+
+
+def configure_sqlite(profile: str = "production", **overrides) -> dict:
+    """Troca o perfil (e overrides) usados nas próximas conexões."""
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Perfil SQLite desconhecido: {profile}")
+    pragmas = dict(SQLITE_PROFILES[profile])
+    pragmas.update({k: v for k, v in overrides.items() if v is not None})
+    for name, value in pragmas.items():
+        _check_pragma(name, value)
+    sqlite_pragmas.clear()
+    sqlite_pragmas.update(pragmas)
+    return sqlite_pragmas
+
+
+# Liga PRAGMA foreign_keys=ON (e o perfil configurado) em conexões SQLite
 @event.listens_for(Engine, "connect")
 def set_sqlite_pragma(dbapi_connection, connection_record):
+    from sqlite3 import Connection as SQLite3Connection
+    if not isinstance(dbapi_connection, SQLite3Connection):
+        return
+    cur = dbapi_connection.cursor()
     try:
-        from sqlite3 import Connection as SQLite3Connection
-        if isinstance(dbapi_connection, SQLite3Connection):
-            cur = dbapi_connection.cursor()
-            cur.execute("PRAGMA foreign_keys=ON")
-            cur.close()
-    except Exception:
-        # silencioso: se não for SQLite, ignora
-        pass
+        cur.execute("PRAGMA foreign_keys=ON")
+        for name, value in sqlite_pragmas.items():
+            try:
+                row = cur.execute(f"PRAGMA {name}={value}").fetchone()
+            except Exception:
+                # ex.: banco travado ao trocar o journal_mode; não seguir nos defaults
+                logger.warning("Falha no PRAGMA %s=%s", name, value, exc_info=True)
+                raise
+            if name == "journal_mode" and row and row[0].upper() != str(value).upper():
+                # banco em memória/temporário só aceita "memory": esperado
+                if row[0].lower() == "memory":
+                    continue
+                logger.warning("PRAGMA journal_mode=%s não aplicado (ficou %s)", value, row[0])
+                raise RuntimeError(f"PRAGMA journal_mode={value} não aplicado (ficou {row[0]})")
+    finally:
+        cur.close()
+
+
+def versioned(model):
+    """
+    Decorator de model: incrementa `versao` em todo UPDATE do ORM.
+    Usa SET versao = versao + 1 (atômico), base dos ETags dos recursos.
+    """
+    @event.listens_for(model, "before_update")
+    def _bump_versao(mapper, connection, target):
+        target.versao = model.versao + 1
+    return model
+
+
+def is_sqlite_busy(err: Exception) -> bool:
+    if not isinstance(err, OperationalError):
+        return False
+    orig = getattr(err, "orig", None)
+    if getattr(orig, "sqlite_errorcode", None) in _SQLITE_BUSY_CODES:
+        return True
+    msg = str(orig or err).lower()
+    return "database is locked" in msg or "database is busy" in msg
+
+
+def is_unique_violation(err: Exception, *names: str) -> bool:
+    """
+    IntegrityError de UNIQUE; com `names`, só se a mensagem do banco citar
+    uma das colunas/índices (ex.: "usuario.email", nome do índice).
+    """
+    if not isinstance(err, IntegrityError):
+        return False
+    msg = str(getattr(err, "orig", None) or err).lower()
+    if "unique" not in msg and "duplicate" not in msg:
+        return False
+    return not names or any(n.lower() in msg for n in names)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_flushed(session, flush_context):
+    session.info["_flushed"] = True
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _clear_flushed(session, transaction):
+    if transaction.parent is None:
+        session.info.pop("_flushed", None)
+
+
+def _has_writes(session) -> bool:
+    # escritas feitas antes do commit_with_retry: um rollback as perderia
+    return bool(session.new or session.dirty or session.deleted or session.info.get("_flushed"))
+
+
+def commit_with_retry(mutate, session=None, retries: int = None, backoff: float = None):
+    """
+    Executa `mutate()` e faz o commit, com retry + backoff exponencial (com
+    jitter) quando o SQLite responde SQLITE_BUSY ("database is locked").
+
+    `mutate` faz a mutação inteira (add/setattr/delete, INSERT via Core...)
+    e é chamado de novo depois de cada rollback; devolve o que ele devolver.
+    Se a sessão já tinha escritas quando a função foi chamada, não há como
+    refazê-las: o SQLITE_BUSY é relançado. Qualquer outro erro também.
+    """
+    session = session or db.session
+    retries = sqlite_retry["retries"] if retries is None else retries
+    backoff = sqlite_retry["backoff"] if backoff is None else backoff
+    if _has_writes(session):
+        retries = 0
+
+    for attempt in range(retries + 1):
+        try:
+            result = mutate()
+            session.commit()
+            return result
+        except OperationalError as err:
+            if attempt >= retries or not is_sqlite_busy(err):
+                raise
+            session.rollback()
+            time.sleep(backoff * (2 ** attempt) * (0.5 + random.random()))
+
+
+# parâmetros que nunca vão para log/buffer (usuario.senha, usuario.email)
+_REDACTED_BINDS = {"senha", "email"}
+_BIND_SUFFIX = re.compile(r"_\d+$")
+_IN_LIST = re.compile(r"\((?:\?|%s|:\w+)(?:,\s*(?:\?|%s|:\w+))+\)")
+
+
+def _shape(statement: str) -> str:
+    # IN (?, ?, ?) expandido varia com o tamanho da lista; forma = IN (...)
+    return _IN_LIST.sub("(...)", " ".join(statement.split()))
+
+
+def _redact(context, parameters):
+    sensitive = set()
+    for params in getattr(context, "compiled_parameters", None) or ():
+        for name, value in params.items():
+            if _BIND_SUFFIX.sub("", name) in _REDACTED_BINDS and value is not None:
+                sensitive.update(value if isinstance(value, (list, tuple)) else (value,))
+
+    def clean(value):
+        if value in sensitive:
+            return "***"
+        if isinstance(value, str) and len(value) > 200:
+            return value[:200] + "..."
+        return value
+
+    if isinstance(parameters, dict):
+        return {k: clean(v) for k, v in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [clean(v) for v in parameters]
+    return parameters
+
+
+class SlowQueryLog:
+    """
+    Registro de queries lentas (eventos de cursor do Engine).
+
+    Acima de `threshold_ms`: log com SQL, parâmetros (sem senha/email),
+    duração e endpoint; EXPLAIN QUERY PLAN uma vez por forma de statement;
+    os últimos `maxlen` ficam em memória para o /_dev/slow-queries.
+    """
+
+    def __init__(self, threshold_ms: float = 100.0, maxlen: int = 200, explain: bool = True):
+        self.enabled = False
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self._recent = deque(maxlen=maxlen)
+        self._plans = OrderedDict()  # forma -> plano
+        self._lock = threading.Lock()
+
+    def configure(self, enabled=None, threshold_ms=None, maxlen=None, explain=None) -> None:
+        with self._lock:
+            if enabled is not None:
+                self.enabled = enabled
+            if threshold_ms is not None:
+                self.threshold_ms = threshold_ms
+            if explain is not None:
+                self.explain = explain
+            if maxlen is not None and maxlen != self._recent.maxlen:
+                self._recent = deque(self._recent, maxlen=maxlen)
+
+    def _plan(self, conn, shape: str, statement: str, parameters, executemany: bool):
+        with self._lock:
+            if shape in self._plans:
+                return self._plans[shape], False
+        if executemany:
+            parameters = parameters[0] if parameters else ()
+        prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+        try:
+            # cursor DBAPI direto: não dispara os eventos de novo
+            cur = conn.connection.dbapi_connection.cursor()
+            try:
+                cur.execute(prefix + statement, parameters)
+                plan = [" ".join(str(c) for c in row) for row in cur.fetchall()]
+            finally:
+                cur.close()
+        except Exception as err:
+            plan = [f"EXPLAIN falhou: {err}"]
+        with self._lock:
+            self._plans[shape] = plan
+            while len(self._plans) > 1000:
+                self._plans.popitem(last=False)
+        return plan, True
+
+    def record(self, conn, context, statement, parameters, executemany, ms: float) -> None:
+        endpoint = request_id = None
+        if has_request_context():
+            rule = request.url_rule.rule if request.url_rule is not None else request.path
+            endpoint = f"{request.method} {rule}"
+            request_id = g.get("request_id")
+        shape = _shape(statement)
+        plan, first = (self._plan(conn, shape, statement, parameters, executemany)
+                       if self.explain else (None, False))
+        entry = {
+            "ts": time.time(),
+            "duration_ms": round(ms, 2),
+            "endpoint": endpoint,
+            "request_id": request_id,
+            "sql": " ".join(statement.split()),
+            "params": _redact(context, parameters[:5] if executemany else parameters),
+            "executemany": executemany,
+            "plan": plan,
+        }
+        self._recent.append(entry)
+        logger.warning("SQL lento (%.1f ms) em %s: %s | params=%s%s",
+                       ms, endpoint or "-", entry["sql"], entry["params"],
+                       "".join(f"\n    {line}" for line in plan) if first else "")
+
+    def recent(self, limit: int = None) -> list:
+        items = list(self._recent)
+        items.reverse()  # mais recentes primeiro
+        return items[:limit] if limit else items
+
+    def clear(self) -> None:
+        with self._lock:
+            self._recent.clear()
+            self._plans.clear()
+
+
+slow_queries = SlowQueryLog()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _slow_query_start(conn, cursor, statement, parameters, context, executemany):
+    if slow_queries.enabled and context is not None:
+        context._slow_t0 = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _slow_query_end(conn, cursor, statement, parameters, context, executemany):
+    t0 = getattr(context, "_slow_t0", None)
+    if t0 is None:
+        return
+    ms = (time.perf_counter() - t0) * 1000.0
+    if ms >= slow_queries.threshold_ms:
+        slow_queries.record(conn, context, statement, parameters, executemany, ms)
+
+
+def _pool_options(prefix: str) -> dict:
+    # só o que foi definido: SQLite em memória não aceita max_overflow etc.
+    opts = {}
+    for key, env, cast in (("pool_size", "POOL_SIZE", int), ("max_overflow", "MAX_OVERFLOW", int),
+                           ("pool_recycle", "POOL_RECYCLE", int), ("pool_timeout", "POOL_TIMEOUT", float)):
+        value = os.environ.get(f"{prefix}_{env}")
+        if value:
+            opts[key] = cast(value)
+    return opts
+
 
 def init_db(app):
+    app.config.setdefault("SQLITE_PROFILE", os.environ.get("SQLITE_PROFILE", "production"))
+    app.config.setdefault("SQLITE_PRAGMAS", {
+        "journal_mode": os.environ.get("SQLITE_JOURNAL_MODE"),
+        "synchronous": os.environ.get("SQLITE_SYNCHRONOUS"),
+        "busy_timeout": os.environ.get("SQLITE_BUSY_TIMEOUT"),
+        "cache_size": os.environ.get("SQLITE_CACHE_SIZE"),
+        "mmap_size": os.environ.get("SQLITE_MMAP_SIZE"),
+        "temp_store": os.environ.get("SQLITE_TEMP_STORE"),
+    })
+    app.config.setdefault("SQLITE_BUSY_RETRIES", int(os.environ.get("SQLITE_BUSY_RETRIES", "3")))
+    app.config.setdefault("SQLITE_BUSY_BACKOFF", float(os.environ.get("SQLITE_BUSY_BACKOFF", "0.05")))
+
+    configure_sqlite(app.config["SQLITE_PROFILE"], **app.config["SQLITE_PRAGMAS"])
+    sqlite_retry["retries"] = app.config["SQLITE_BUSY_RETRIES"]
+    sqlite_retry["backoff"] = app.config["SQLITE_BUSY_BACKOFF"]
+
+    app.config.setdefault("SLOW_QUERY_LOG", os.environ.get("SLOW_QUERY_LOG", "1") == "1")
+    app.config.setdefault("SLOW_QUERY_MS", float(os.environ.get("SLOW_QUERY_MS", "100")))
+    app.config.setdefault("SLOW_QUERY_BUFFER", int(os.environ.get("SLOW_QUERY_BUFFER", "200")))
+    app.config.setdefault("SLOW_QUERY_EXPLAIN", os.environ.get("SLOW_QUERY_EXPLAIN", "1") == "1")
+    slow_queries.configure(
+        enabled=app.config["SLOW_QUERY_LOG"],
+        threshold_ms=app.config["SLOW_QUERY_MS"],
+        maxlen=app.config["SLOW_QUERY_BUFFER"],
+        explain=app.config["SLOW_QUERY_EXPLAIN"],
+    )
+
+    # pool por papel: DB_* no primário, REPLICA_* nas réplicas (ex.: DB_POOL_SIZE, REPLICA_POOL_RECYCLE)
+    app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", _pool_options("DB"))
+    app.config.setdefault("REPLICA_ENGINE_OPTIONS", _pool_options("REPLICA"))
+    app.config.setdefault("DATABASE_REPLICA_URLS", os.environ.get("DATABASE_REPLICA_URLS", ""))
+    app.config.setdefault("REPLICA_PIN_SECONDS", float(os.environ.get("REPLICA_PIN_SECONDS", "5")))
+    app.config.setdefault("REPLICA_PIN_URL", os.environ.get("REPLICA_PIN_URL", ""))
+
+    urls = app.config["DATABASE_REPLICA_URLS"]
+    if isinstance(urls, str):
+        urls = [u.strip() for u in urls.split(",") if u.strip()]
+    binds = app.config.setdefault("SQLALCHEMY_BINDS", {})
+    for i, url in enumerate(urls):
+        binds[f"replica_{i}"] = {"url": url, **app.config["REPLICA_ENGINE_OPTIONS"]}
+    client = None
+    if urls and app.config["REPLICA_PIN_URL"]:
+        if redis is None:
+            raise RuntimeError("REPLICA_PIN_URL exige o pacote redis.")
+        client = redis.Redis.from_url(app.config["REPLICA_PIN_URL"])
+    replica_router.configure([f"replica_{i}" for i in range(len(urls))],
+                             app.config["REPLICA_PIN_SECONDS"], client)
+    if urls:
+        logger.info("Réplicas de leitura: %d (pin %.1fs)", len(urls), app.config["REPLICA_PIN_SECONDS"])
+
     db.init_app(app)
     migrate.init_app(app, db)
@@ -0,0 +1,44 @@
+import hashlib
+
+from flask import request
+from sqlalchemy import update
+
+from helpers.database import db
+
+
+def make_etag(*parts) -> str:
+    """ETag forte (entre aspas) a partir de partes estáveis."""
+    raw = "|".join(p.decode() if isinstance(p, bytes) else str(p) for p in parts)
+    return '"' + hashlib.sha1(raw.encode()).hexdigest() + '"'
+
+
+def row_version(model, **criteria):
+    """Só a coluna `versao` da linha (sem carregar/serializar o objeto)."""
+    return db.session.query(model.versao).filter_by(**criteria).scalar()
+
+
+def collection_version(column, *where, **criteria):
+    """
+    Versão de uma coleção guardada num contador (ex.: Usuario.colecao_versao):
+    uma leitura pela PK, sem agregar as linhas da coleção. None se nada casar.
+    `where` aceita filtros que não cabem em filter_by (ex.: posse via EXISTS).
+    """
+    return db.session.query(column).filter(*where).filter_by(**criteria).scalar()
+
+
+def bump_version(column, **criteria) -> None:
+    """
+    column = column + 1 num UPDATE em lote (atômico; não passa pelo
+    @versioned). Chamar dentro da transação da escrita que muda a coleção.
+    """
+    stmt = update(column.class_).filter_by(**criteria).values({column.key: column + 1})
+    db.session.execute(stmt, execution_options={"synchronize_session": False})
+
+
+def not_modified(etag: str) -> bool:
+    return request.if_none_match.contains_weak(etag.strip('"'))
+
+
+def etag_headers(etag: str) -> dict:
+    # private: resposta por usuário; no-cache: o browser sempre revalida
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
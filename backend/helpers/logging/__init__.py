@@ -1,19 +1,114 @@
+import atexit
+import copy
+import json
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
+from flask import g, has_request_context, request
+
+from helpers.metrics import registry
+
 LOGGER_NAME = "meupet"
 logger = logging.getLogger(LOGGER_NAME)
 logger.setLevel(logging.INFO)
 
-if not logger.handlers:
+# campos extras que o formato JSON copia do record (quando presentes)
+_JSON_FIELDS = ("request_id", "method", "path", "status", "duration_ms")
+
+
+class JSONFormatter(logging.Formatter):
+    """Uma linha JSON por registro."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        out = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "src": f"{record.filename}:{record.lineno}",
+        }
+        for name in _JSON_FIELDS:
+            value = getattr(record, name, None)
+            if value is not None:
+                out[name] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            out["exc"] = record.exc_text
+        return json.dumps(out, ensure_ascii=False, default=str)
+
+
+class _RequestIdFilter(logging.Filter):
+    # roda na thread da request (antes da fila): o listener não tem contexto Flask
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "request_id", None) is None and has_request_context():
+            record.request_id = g.get("request_id")
+        return True
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler com fila limitada: nunca bloqueia quem loga.
+
+    Com a fila cheia, "drop_new" descarta o registro novo e "drop_oldest"
+    descarta o mais antigo da fila; os descartes são contados em `dropped`.
+    """
+
+    def __init__(self, q: queue.Queue, policy: str = "drop_new"):
+        super().__init__(q)
+        if policy not in ("drop_new", "drop_oldest"):
+            raise ValueError(f"LOG_DROP_POLICY inválida: {policy}")
+        self.policy = policy
+        self.dropped = 0
+        self._drop_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # formata mensagem/traceback aqui (args podem mudar depois), mas
+        # deixa o layout final para os handlers do listener
+        record = copy.copy(record)
+        record.msg, record.args = record.getMessage(), None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+        with self._drop_lock:
+            self.dropped += 1
+            if self.policy == "drop_oldest":
+                try:
+                    self.queue.get_nowait()
+                    self.queue.put_nowait(record)
+                except (queue.Empty, queue.Full):
+                    pass
+
+
+class _Listener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # a fila pode estar cheia no shutdown: espera vaga em vez de falhar
+        self.queue.put(self._sentinel)
+
+
+def _build_handlers(fmt: str) -> list:
+    text = fmt != "json"
+
     console = logging.StreamHandler()
     console.setLevel(logging.INFO)
     console.setFormatter(logging.Formatter(
         "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
-    ))
-    logger.addHandler(console)
+    ) if text else JSONFormatter())
 
     # logs em instance/logs/app.log (na raiz do projeto)
     base_dir = Path(__file__).resolve().parents[2]  # .../backend/helpers/logging -> sobe 2
@@ -27,8 +122,101 @@ if not logger.handlers:
     file_handler.setLevel(logging.INFO)
     file_handler.setFormatter(logging.Formatter(
         "%(asctime)s | %(levelname)s | %(name)s | %(filename)s:%(lineno)d | %(message)s"
-    ))
-    logger.addHandler(file_handler)
+    ) if text else JSONFormatter())
+    return [console, file_handler]
+
+
+_queue_handler = None
+_listener = None
+
+if not logger.handlers:
+    _handlers = _build_handlers(os.environ.get("LOG_FORMAT", "text"))
+    if os.environ.get("LOG_ASYNC", "1") == "1":
+        # I/O de arquivo/console numa thread própria; a request só enfileira
+        _queue_handler = DroppingQueueHandler(
+            queue.Queue(maxsize=int(os.environ.get("LOG_QUEUE_SIZE", "10000"))),
+            os.environ.get("LOG_DROP_POLICY", "drop_new"),
+        )
+        _queue_handler.addFilter(_RequestIdFilter())
+        logger.addHandler(_queue_handler)
+        _listener = _Listener(_queue_handler.queue, *_handlers, respect_handler_level=True)
+        _listener.start()
+    else:
+        for _h in _handlers:
+            _h.addFilter(_RequestIdFilter())
+            logger.addHandler(_h)
+
+
+def restart_after_fork() -> None:
+    """
+    No processo filho (gunicorn com preload) a thread do listener não
+    existe: recria fila e listener com os mesmos handlers.
+    """
+    global _listener
+    if _listener is None:
+        return
+    q = queue.Queue(maxsize=_queue_handler.queue.maxsize)
+    _queue_handler.queue = q
+    _queue_handler.dropped = 0
+    _listener = _Listener(q, *_listener.handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def dropped_records() -> int:
+    return _queue_handler.dropped if _queue_handler is not None else 0
+
+
+def shutdown_logging() -> None:
+    """Esvazia a fila e fecha os handlers (chamado no atexit)."""
+    global _listener
+    if _listener is None:
+        return
+    listener, _listener = _listener, None
+    logger.removeHandler(_queue_handler)
+    listener.stop()
+    if _queue_handler.dropped:
+        record = logger.makeRecord(LOGGER_NAME, logging.WARNING, __file__, 0,
+                                   "%d registros de log descartados (fila cheia)",
+                                   (_queue_handler.dropped,), None)
+        listener.handle(record)
+    for h in listener.handlers:
+        h.close()
+
+
+atexit.register(shutdown_logging)
+
 
 def get_logger() -> logging.Logger:
     return logger
+
+
+@registry.collector
+def _logging_metrics() -> list:
+    return [
+        "# HELP meupet_log_records_dropped_total Registros de log descartados com a fila cheia.",
+        "# TYPE meupet_log_records_dropped_total counter",
+        f"meupet_log_records_dropped_total {dropped_records()}",
+    ]
+
+
+def init_logging(app) -> None:
+    """Request id (X-Request-ID) em todo log da request e log de acesso opcional."""
+    app.config.setdefault("LOG_ACCESS", os.environ.get("LOG_ACCESS", "0") == "1")
+
+    @app.before_request
+    def _log_start():
+        rid = request.headers.get("X-Request-ID", "")
+        g.request_id = rid[:64] if rid else uuid.uuid4().hex
+        g._log_t0 = time.perf_counter()
+
+    @app.after_request
+    def _log_end(response):
+        if "request_id" not in g:
+            return response
+        response.headers.setdefault("X-Request-ID", g.request_id)
+        if app.config["LOG_ACCESS"]:
+            ms = round((time.perf_counter() - g._log_t0) * 1000.0, 2)
+            logger.info("%s %s %s %.1fms", request.method, request.path, response.status_code, ms,
+                        extra={"method": request.method, "path": request.path,
+                               "status": response.status_code, "duration_ms": ms})
+        return response
@@ -0,0 +1,196 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# buckets padrão do cliente Prometheus (segundos)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 50, 100)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(pairs) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _fmt(value: float) -> str:
+    return "+Inf" if value == float("inf") else repr(float(value))
+
+
+class Histogram:
+    """Histograma Prometheus (cumulativo na exposição), thread-safe."""
+
+    def __init__(self, name: str, help: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._series = {}  # valores dos labels -> [contagem por bucket..., soma, total]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        for key, series in items:
+            base = list(zip(self.labelnames, key))
+            acc = 0
+            for bound, n in zip(self.buckets, series):
+                acc += n
+                lines.append(f"{self.name}_bucket{_labels(base + [('le', _fmt(bound))])} {acc}")
+            lines.append(f"{self.name}_sum{_labels(base)} {series[-2]!r}")
+            lines.append(f"{self.name}_count{_labels(base)} {series[-1]}")
+        return lines
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+class Registry:
+    """Métricas do processo + coletores (funções que devolvem linhas prontas)."""
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def histogram(self, *args, **kwargs) -> Histogram:
+        h = Histogram(*args, **kwargs)
+        self._metrics.append(h)
+        return h
+
+    def collector(self, fn):
+        self._collectors.append(fn)
+        return fn
+
+    def render(self) -> str:
+        lines = []
+        for m in self._metrics:
+            lines.extend(m.render())
+        for fn in self._collectors:
+            lines.extend(fn())
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        for m in self._metrics:
+            m.clear()
+
+
+registry = Registry()
+
+http_seconds = registry.histogram(
+    "meupet_http_request_duration_seconds", "Latência das requests por rota.",
+    ("method", "route", "status"))
+request_sql_statements = registry.histogram(
+    "meupet_http_request_sql_statements", "Statements SQL por request.",
+    ("route",), COUNT_BUCKETS)
+request_sql_seconds = registry.histogram(
+    "meupet_http_request_sql_seconds", "Tempo em SQL por request.", ("route",))
+# tempos de dependências (dentro ou fora de request)
+timers = {
+    "sql": registry.histogram("meupet_sql_statement_seconds", "Duração de cada statement SQL."),
+    "dns": registry.histogram("meupet_dns_lookup_seconds", "Consultas MX ao DNS (cache miss)."),
+    "hash": registry.histogram("meupet_password_hash_seconds", "Hash/verificação de senha (com fila do pool)."),
+}
+
+# nomes das métricas no Server-Timing
+_SERVER_TIMING = (("sql", "SQL"), ("dns", "DNS MX"), ("hash", "hash de senha"))
+
+
+def _add_request_time(kind: str, seconds: float) -> None:
+    if has_request_context() and "_timings" in g:
+        g._timings[kind] = g._timings.get(kind, 0.0) + seconds
+
+
+@contextmanager
+def timed(kind: str):
+    """Mede um bloco: histograma global + soma na request atual (Server-Timing)."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        dt = time.perf_counter() - t0
+        timers[kind].observe(dt)
+        _add_request_time(kind, dt)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _sql_start(conn, cursor, statement, parameters, context, executemany):
+    # no contexto do statement: se ele falhar, o início some junto
+    if context is not None:
+        context._metrics_t0 = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _sql_end(conn, cursor, statement, parameters, context, executemany):
+    t0 = getattr(context, "_metrics_t0", None)
+    if t0 is None:
+        return
+    dt = time.perf_counter() - t0
+    timers["sql"].observe(dt)
+    if has_request_context() and "_timings" in g:
+        g._timings["sql"] = g._timings.get("sql", 0.0) + dt
+        g._sql_count += 1
+
+
+def _route() -> str:
+    # regra da URL (cardinalidade limitada), não o path com ids
+    return request.url_rule.rule if request.url_rule is not None else "<sem rota>"
+
+
+def server_timing(total: float, timings: dict, sql_count: int) -> str:
+    parts = [f"app;dur={total * 1000:.1f}"]
+    for kind, desc in _SERVER_TIMING:
+        if kind in timings:
+            if kind == "sql":
+                desc = f"{sql_count} statements"
+            parts.append(f'{kind};dur={timings[kind] * 1000:.1f};desc="{desc}"')
+    return ", ".join(parts)
+
+
+def init_metrics(app) -> None:
+    app.config.setdefault("METRICS_ENABLED", os.environ.get("METRICS_ENABLED", "1") == "1")
+    app.config.setdefault("SERVER_TIMING", os.environ.get("SERVER_TIMING", "1") == "1")
+    if not app.config["METRICS_ENABLED"]:
+        return
+
+    @app.before_request
+    def _metrics_start():
+        g._t0 = time.perf_counter()
+        g._timings = {}
+        g._sql_count = 0
+
+    @app.after_request
+    def _metrics_end(response):
+        if "_t0" not in g:
+            return response
+        total = time.perf_counter() - g._t0
+        route = _route()
+        http_seconds.observe(total, method=request.method, route=route, status=response.status_code)
+        request_sql_statements.observe(g._sql_count, route=route)
+        request_sql_seconds.observe(g._timings.get("sql", 0.0), route=route)
+        if app.config["SERVER_TIMING"]:
+            response.headers["Server-Timing"] = server_timing(total, g._timings, g._sql_count)
+        return response
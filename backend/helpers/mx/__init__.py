@@ -0,0 +1,171 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import dns.resolver, dns.exception
+
+from helpers.logging import logger
+from helpers.metrics import registry, timed
+
+
+class MXCache:
+    """
+    Cache de registros MX compartilhado por cadastro e login.
+
+    - thread-safe e limitado em tamanho (LRU);
+    - TTL separado para respostas positivas e negativas;
+    - consultas concorrentes ao mesmo domínio são coalescidas (só uma vai ao DNS);
+    - contadores de hit/miss em stats().
+    """
+
+    def __init__(self, maxsize: int = 1024, positive_ttl: float = 3600.0,
+                 negative_ttl: float = 300.0, timeout: float = 2.0):
+        self.maxsize = maxsize
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self._resolver = dns.resolver.Resolver(configure=True)
+        self._resolver.timeout = self._resolver.lifetime = timeout
+        self._entries = OrderedDict()  # domínio -> (tem_mx, expira_em)
+        self._inflight = {}            # domínio -> threading.Event
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self, maxsize=None, positive_ttl=None, negative_ttl=None, timeout=None) -> None:
+        with self._lock:
+            if maxsize is not None:
+                self.maxsize = maxsize
+            if positive_ttl is not None:
+                self.positive_ttl = positive_ttl
+            if negative_ttl is not None:
+                self.negative_ttl = negative_ttl
+            if timeout is not None:
+                self._resolver.timeout = self._resolver.lifetime = timeout
+            self._evict()
+
+    def _resolve(self, domain: str) -> bool:
+        try:
+            ans = self._resolver.resolve(domain, 'MX')
+            return len(ans) > 0
+        except (dns.exception.DNSException, OSError):
+            return False
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def has_mx(self, domain: str) -> bool:
+        domain = (domain or "").strip().lower()
+        if not domain:
+            return False
+
+        while True:
+            with self._lock:
+                entry = self._entries.get(domain)
+                if entry is not None:
+                    ok, expires = entry
+                    if expires > time.monotonic():
+                        self._entries.move_to_end(domain)
+                        self.hits += 1
+                        return ok
+                    del self._entries[domain]
+
+                waiter = self._inflight.get(domain)
+                if waiter is None:
+                    # esta thread faz a consulta; as demais esperam o resultado
+                    waiter = self._inflight[domain] = threading.Event()
+                    self.misses += 1
+                    break
+
+            waiter.wait()
+            # volta ao topo para ler o resultado gravado por quem consultou
+
+        try:
+            with timed("dns"):
+                ok = self._resolve(domain)
+            ttl = self.positive_ttl if ok else self.negative_ttl
+            with self._lock:
+                self._entries[domain] = (ok, time.monotonic() + ttl)
+                self._entries.move_to_end(domain)
+                self._evict()
+            return ok
+        finally:
+            with self._lock:
+                self._inflight.pop(domain, None)
+            waiter.set()
+
+    def warm_up(self, domains) -> None:
+        for d in domains:
+            self.has_mx(d)
+
+    def prime(self, domain: str, ok: bool = True, ttl: float = None) -> None:
+        """Grava um resultado sem ir ao DNS (benchmarks, ambientes sem rede)."""
+        domain = (domain or "").strip().lower()
+        ttl = ttl if ttl is not None else (self.positive_ttl if ok else self.negative_ttl)
+        with self._lock:
+            self._entries[domain] = (ok, time.monotonic() + ttl)
+            self._entries.move_to_end(domain)
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hit_ratio": (self.hits / total) if total else 0.0,
+            }
+
+
+mx_cache = MXCache()
+
+
+def has_mx(domain: str) -> bool:
+    return mx_cache.has_mx(domain)
+
+
+@registry.collector
+def _mx_metrics() -> list:
+    s = mx_cache.stats()
+    return [
+        "# HELP meupet_mx_cache_lookups_total Consultas ao cache de MX.",
+        "# TYPE meupet_mx_cache_lookups_total counter",
+        f'meupet_mx_cache_lookups_total{{result="hit"}} {s["hits"]}',
+        f'meupet_mx_cache_lookups_total{{result="miss"}} {s["misses"]}',
+        "# HELP meupet_mx_cache_size Domínios no cache de MX.",
+        "# TYPE meupet_mx_cache_size gauge",
+        f"meupet_mx_cache_size {s['size']}",
+    ]
+
+
+def init_mx(app) -> None:
+    app.config.setdefault("MX_CACHE_MAXSIZE", int(os.environ.get("MX_CACHE_MAXSIZE", "1024")))
+    app.config.setdefault("MX_POSITIVE_TTL", float(os.environ.get("MX_POSITIVE_TTL", "3600")))
+    app.config.setdefault("MX_NEGATIVE_TTL", float(os.environ.get("MX_NEGATIVE_TTL", "300")))
+    app.config.setdefault("MX_TIMEOUT", float(os.environ.get("MX_TIMEOUT", "2.0")))
+    app.config.setdefault("MX_WARMUP_DOMAINS", os.environ.get("MX_WARMUP_DOMAINS", ""))
+
+    mx_cache.configure(
+        maxsize=app.config["MX_CACHE_MAXSIZE"],
+        positive_ttl=app.config["MX_POSITIVE_TTL"],
+        negative_ttl=app.config["MX_NEGATIVE_TTL"],
+        timeout=app.config["MX_TIMEOUT"],
+    )
+
+    warmup = app.config["MX_WARMUP_DOMAINS"]
+    if isinstance(warmup, str):
+        warmup = [d.strip() for d in warmup.split(",") if d.strip()]
+    if warmup:
+        # aquece em background para não atrasar o start do app
+        logger.info("MX warm-up: %d domínios", len(warmup))
+        threading.Thread(target=mx_cache.warm_up, args=(warmup,), daemon=True,
+                         name="mx-warmup").start()
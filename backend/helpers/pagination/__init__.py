@@ -0,0 +1,93 @@
+import base64
+import json
+from datetime import date
+
+from flask import current_app, request
+from sqlalchemy import and_, or_
+from sqlalchemy.types import Date
+
+
+class PaginationError(ValueError):
+    """limit/cursor inválidos na query string."""
+
+    def __init__(self, field: str, message: str):
+        super().__init__(message)
+        self.messages = {field: [message]}
+
+
+def encode_cursor(values) -> str:
+    raw = json.dumps(list(values), separators=(",", ":"),
+                     default=lambda v: v.isoformat() if isinstance(v, date) else str(v))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(order):
+            raise ValueError
+        # chaves de ordenação são NOT NULL: só escalares vão para o WHERE
+        if not all(isinstance(v, (str, int, float)) and not isinstance(v, bool) for v in values):
+            raise ValueError
+        # datas voltam como ISO; o bind de Date no SQLite exige date
+        return [
+            date.fromisoformat(v) if isinstance(getattr(expr, "type", None), Date) else v
+            for (expr, _), v in zip(order, values)
+        ]
+    except (ValueError, TypeError):
+        raise PaginationError("cursor", "Cursor inválido.")
+
+
+def parse_limit() -> int:
+    default = current_app.config.get("PAGE_DEFAULT_LIMIT", 100)
+    maximum = current_app.config.get("PAGE_MAX_LIMIT", 500)
+    raw = request.args.get("limit")
+    if raw in (None, ""):
+        return default
+    try:
+        limit = int(raw)
+    except ValueError:
+        raise PaginationError("limit", "Deve ser um número inteiro.")
+    if limit < 1:
+        raise PaginationError("limit", "Deve ser maior que zero.")
+    return min(limit, maximum)
+
+
+def _after(order, values):
+    # (k1, k2, ...) "depois de" (v1, v2, ...) respeitando asc/desc de cada chave
+    clauses = []
+    for i, (expr, desc) in enumerate(order):
+        prefix = [e == v for (e, _), v in zip(order[:i], values[:i])]
+        clauses.append(and_(*prefix, expr < values[i] if desc else expr > values[i]))
+    # limite não-estrito na 1ª chave: deixa o índice fazer seek direto na página
+    first, desc = order[0]
+    return and_(first <= values[0] if desc else first >= values[0], or_(*clauses))
+
+
+def keyset_paginate(query, order):
+    """
+    Paginação por keyset (cursor) sobre `query`.
+
+    - order: [(expressão, desc), ...]; a última chave deve ser única (ex.: id)
+
+    Lê `limit` e `cursor` da query string e retorna (itens, next_cursor).
+    O custo por página é o mesmo em qualquer profundidade (sem OFFSET).
+    """
+    limit = parse_limit()
+    cursor = request.args.get("cursor")
+    if cursor:
+        query = query.filter(_after(order, decode_cursor(cursor, order)))
+    query = query.order_by(*[e.desc() if desc else e.asc() for e, desc in order])
+
+    # as chaves vêm do próprio banco (ex.: lower() do SQLite só trata ASCII)
+    rows = query.add_columns(*[e for e, _ in order]).limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1][1:])
+    return [r[0] for r in rows], next_cursor
+
+
+def page_headers(next_cursor) -> dict:
+    return {"X-Next-Cursor": next_cursor} if next_cursor else {}
@@ -0,0 +1,142 @@
+import atexit
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from werkzeug.security import generate_password_hash, check_password_hash, DEFAULT_PBKDF2_ITERATIONS
+
+from helpers.logging import logger
+from helpers.metrics import timed
+
+
+class PasswordPoolBusy(Exception):
+    """Fila do pool de hashing cheia: o recurso deve responder 503 rápido."""
+
+
+def _normalize_method(method: str) -> tuple:
+    # mesmos defaults do werkzeug.security._hash_internal
+    name, *args = (method or "").split(":")
+    if name == "scrypt":
+        n, r, p = map(int, args) if args else (2**15, 8, 1)
+        return ("scrypt", (n, r, p))
+    if name == "pbkdf2":
+        hash_name = args[0] if args else "sha256"
+        iterations = int(args[1]) if len(args) > 1 else DEFAULT_PBKDF2_ITERATIONS
+        return ("pbkdf2", hash_name, (iterations,))
+    return (name,)
+
+
+class PasswordHasher:
+    """
+    Hash/verificação de senha fora das threads de request.
+
+    - roda generate/check_password_hash num ProcessPoolExecutor;
+    - fila limitada (workers + queue_size): acima disso levanta PasswordPoolBusy;
+    - workers=0 desliga o pool (executa inline, como antes);
+    - pool quebrado (processo filho morto, ex.: OOM killer) é recriado e a
+      chamada repetida uma vez.
+    """
+
+    def __init__(self, method: str = "pbkdf2:sha256", workers: int = 0,
+                 queue_size: int = 64, timeout: float = 30.0):
+        self.method = method
+        self.workers = workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self._pool = None
+        self._slots = None
+        self._lock = threading.Lock()
+
+    def configure(self, method=None, workers=None, queue_size=None, timeout=None) -> None:
+        self.shutdown()
+        with self._lock:
+            if method is not None:
+                self.method = method
+            if workers is not None:
+                self.workers = workers
+            if queue_size is not None:
+                self.queue_size = queue_size
+            if timeout is not None:
+                self.timeout = timeout
+            self._slots = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    if self._slots is None:  # mantém a fila ao recriar um pool quebrado
+                        self._slots = threading.BoundedSemaphore(self.workers + self.queue_size)
+                    self._pool = ProcessPoolExecutor(max_workers=self.workers)
+                    logger.info("Pool de hashing: %d workers, fila %d", self.workers, self.queue_size)
+        return self._pool
+
+    def _reset_pool(self, broken) -> None:
+        with self._lock:
+            if self._pool is broken:  # outra thread pode já ter recriado
+                self._pool = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, fn, *args):
+        if self.workers <= 0:
+            with timed("hash"):
+                return fn(*args)
+        pool = self._get_pool()
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            raise PasswordPoolBusy()
+        try:
+            with timed("hash"):
+                try:
+                    return pool.submit(fn, *args).result(timeout=self.timeout)
+                except BrokenProcessPool:
+                    logger.warning("Pool de hashing quebrado, recriando")
+                    self._reset_pool(pool)
+                    return self._get_pool().submit(fn, *args).result(timeout=self.timeout)
+        finally:
+            slots.release()
+
+    def hash(self, senha: str) -> str:
+        return self._run(generate_password_hash, senha, self.method, 16)
+
+    def check(self, senha_hash: str, senha: str) -> bool:
+        return self._run(check_password_hash, senha_hash, senha)
+
+    def needs_rehash(self, senha_hash: str) -> bool:
+        """True se o hash salvo usa parâmetros mais fracos que HASH_METHOD atual."""
+        stored = _normalize_method((senha_hash or "").split("$", 1)[0])
+        current = _normalize_method(self.method)
+        if len(stored) == 1 or stored[:-1] != current[:-1]:
+            return stored != current  # algoritmo (ou função de hash) diferente do configurado
+        return any(s < c for s, c in zip(stored[-1], current[-1]))
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+
+password_hasher = PasswordHasher(method=os.environ.get("HASH_METHOD", "pbkdf2:sha256"))
+atexit.register(password_hasher.shutdown)
+
+
+def _default_pool_workers() -> int:
+    # cada worker do gunicorn tem o próprio pool: divide as CPUs entre eles
+    processes = int(os.environ.get("WEB_CONCURRENCY", "1"))
+    return max(1, (os.cpu_count() or 1) // max(1, processes))
+
+
+def init_passwords(app) -> None:
+    app.config.setdefault("HASH_METHOD", os.environ.get("HASH_METHOD", "pbkdf2:sha256"))
+    app.config.setdefault("PASSWORD_POOL_WORKERS",
+                          int(os.environ.get("PASSWORD_POOL_WORKERS", _default_pool_workers())))
+    app.config.setdefault("PASSWORD_POOL_QUEUE", int(os.environ.get("PASSWORD_POOL_QUEUE", "64")))
+    app.config.setdefault("PASSWORD_POOL_TIMEOUT", float(os.environ.get("PASSWORD_POOL_TIMEOUT", "30")))
+
+    password_hasher.configure(
+        method=app.config["HASH_METHOD"],
+        workers=app.config["PASSWORD_POOL_WORKERS"],
+        queue_size=app.config["PASSWORD_POOL_QUEUE"],
+        timeout=app.config["PASSWORD_POOL_TIMEOUT"],
+    )
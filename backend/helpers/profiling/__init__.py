@@ -0,0 +1,118 @@
+import cProfile
+import hashlib
+import hmac
+import itertools
+import os
+import random
+import re
+import threading
+import time
+from pathlib import Path
+
+from flask import g, request
+
+from helpers.logging import logger
+
+HEADER = "X-Profile"
+_SAFE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def profile_token(secret: str, ttl: int = 300) -> str:
+    """Valor do header X-Profile: "<expira_em>.<hmac>" (válido por `ttl` segundos)."""
+    expires = str(int(time.time()) + ttl)
+    sig = hmac.new(secret.encode(), expires.encode(), hashlib.sha256).hexdigest()
+    return f"{expires}.{sig}"
+
+
+def verify_token(secret: str, token: str, max_ttl: int = 3600) -> bool:
+    expires, _, sig = (token or "").partition(".")
+    if not secret or not expires.isdigit():
+        return False
+    left = int(expires) - time.time()
+    if left < 0 or left > max_ttl:
+        return False
+    want = hmac.new(secret.encode(), expires.encode(), hashlib.sha256).hexdigest()
+    return hmac.compare_digest(want, sig)
+
+
+class ProfileStore:
+    """Grava os .prof (pstats) em `directory`, mantendo no máximo `max_files`."""
+
+    def __init__(self, directory, max_files: int = 50):
+        self.directory = Path(directory)
+        self.max_files = max_files
+        self._lock = threading.Lock()
+        self._seq = itertools.count(1)
+
+    def save(self, profiler: cProfile.Profile, endpoint: str, method: str, ms: float) -> str:
+        with self._lock:
+            # pid + sequência: vários workers/requests no mesmo segundo
+            name = (f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{next(self._seq)}"
+                    f"_{method}_{_SAFE.sub('_', endpoint)}_{ms:.0f}ms.prof")
+            self.directory.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(self.directory / name)
+            self._prune()
+        return name
+
+    def _prune(self) -> None:
+        files = sorted(self.directory.glob("*.prof"), key=lambda p: p.stat().st_mtime)
+        for old in files[:max(0, len(files) - self.max_files)]:
+            old.unlink(missing_ok=True)
+
+
+def init_profiling(app) -> None:
+    """
+    Profiling por request com cProfile, disparado por amostragem
+    (PROFILE_SAMPLE_RATE) ou pelo header X-Profile assinado com
+    PROFILE_SECRET (ver profile_token / `flask profile-token`).
+    Sem taxa nem segredo configurados, nenhum hook é registrado.
+    """
+    base_dir = Path(__file__).resolve().parents[2]  # .../backend/helpers/profiling
+    instance_dir = Path(os.environ.get("INSTANCE_DIR", base_dir.parent / "instance"))
+    app.config.setdefault("PROFILE_SAMPLE_RATE", float(os.environ.get("PROFILE_SAMPLE_RATE", "0")))
+    app.config.setdefault("PROFILE_SECRET", os.environ.get("PROFILE_SECRET", ""))
+    app.config.setdefault("PROFILE_DIR", os.environ.get("PROFILE_DIR", str(instance_dir / "profiles")))
+    app.config.setdefault("PROFILE_MAX_FILES", int(os.environ.get("PROFILE_MAX_FILES", "50")))
+
+    rate = app.config["PROFILE_SAMPLE_RATE"]
+    secret = app.config["PROFILE_SECRET"]
+
+    @app.cli.command("profile-token")
+    def _profile_token():
+        """Imprime um valor para o header X-Profile (5 min)."""
+        if not secret:
+            raise SystemExit("Defina PROFILE_SECRET.")
+        print(profile_token(secret))
+
+    if rate <= 0 and not secret:
+        return
+    store = ProfileStore(app.config["PROFILE_DIR"], app.config["PROFILE_MAX_FILES"])
+
+    @app.before_request
+    def _profile_start():
+        token = request.headers.get(HEADER) if secret else None
+        signed = token is not None and verify_token(secret, token)
+        if not signed and not (rate > 0 and random.random() < rate):
+            return
+        g._profile = (cProfile.Profile(), time.perf_counter(), signed)
+        g._profile[0].enable()
+
+    @app.after_request
+    def _profile_header(response):
+        if "_profile" in g and g._profile[2]:
+            response.headers[HEADER] = "1"
+        return response
+
+    @app.teardown_request
+    def _profile_end(exc):
+        state = g.pop("_profile", None)
+        if state is None:
+            return
+        profiler, t0, _ = state
+        profiler.disable()
+        ms = (time.perf_counter() - t0) * 1000.0
+        try:
+            name = store.save(profiler, request.endpoint or "sem_rota", request.method, ms)
+            logger.info("Profile gravado: %s", name)
+        except OSError as err:
+            logger.warning("Falha ao gravar profile: %s", err)
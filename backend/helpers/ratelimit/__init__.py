@@ -0,0 +1,286 @@
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import request
+
+from helpers.logging import logger
+from helpers.metrics import registry
+
+try:
+    import redis
+except ImportError:  # opcional: só o armazenamento em memória
+    redis = None
+
+
+def parse_rule(spec: str):
+    """'10/60' -> (capacidade 10, 10 fichas a cada 60s). Vazio/'0' desliga."""
+    spec = (spec or "").strip()
+    if not spec or spec == "0":
+        return None
+    burst, _, period = spec.partition("/")
+    burst, period = int(burst), float(period or 1)
+    if burst <= 0 or period <= 0:
+        raise ValueError(f"regra de rate limit inválida: {spec!r}")
+    return burst, burst / period
+
+
+class MemoryBucketStore:
+    """
+    Token buckets em memória, divididos em faixas (stripes) com um lock
+    cada: requisições de chaves diferentes raramente disputam o mesmo lock.
+
+    Um bucket cheio é igual a um bucket inexistente, então a varredura
+    periódica (feita por quem chegar depois de sweep_interval) apaga os
+    que já reencheram. max_keys limita a memória contra chaves forjadas;
+    cheio, sai o bucket usado há mais tempo (LRU), nunca um que está sendo
+    acertado agora: girar chaves não devolve um bucket cheio a um IP ativo.
+    """
+
+    def __init__(self, stripes: int = 64, max_keys: int = 100_000, sweep_interval: float = 60.0):
+        self._stripes = [(OrderedDict(), threading.Lock()) for _ in range(stripes)]
+        self.max_keys_per_stripe = max(1, max_keys // stripes)
+        self.sweep_interval = sweep_interval
+        self._next_sweep = time.monotonic() + sweep_interval
+        self._sweep_lock = threading.Lock()
+
+    def take(self, key: str, burst: int, rate: float, now: float = None) -> float:
+        """Consome uma ficha. Devolve 0 se liberado ou os segundos até a próxima."""
+        now = time.monotonic() if now is None else now
+        buckets, lock = self._stripes[hash(key) % len(self._stripes)]
+        with lock:
+            entry = buckets.get(key)
+            if entry is None:
+                if len(buckets) >= self.max_keys_per_stripe:
+                    self._sweep_stripe(buckets, now)
+                    if len(buckets) >= self.max_keys_per_stripe:
+                        buckets.popitem(last=False)  # o usado há mais tempo
+                tokens = float(burst)
+            else:
+                buckets.move_to_end(key)
+                tokens, updated, _ = entry
+                tokens = min(float(burst), tokens + (now - updated) * rate)
+            if tokens >= 1.0:
+                buckets[key] = (tokens - 1.0, now, (burst - tokens + 1.0) / rate)
+                wait = 0.0
+            else:
+                buckets[key] = (tokens, now, (burst - tokens) / rate)
+                wait = (1.0 - tokens) / rate
+        if now >= self._next_sweep:
+            self.sweep(now)
+        return wait
+
+    @staticmethod
+    def _sweep_stripe(buckets: OrderedDict, now: float) -> None:
+        # entrada = (fichas, atualizado_em, segundos até encher)
+        for key in [k for k, (_, updated, refill) in buckets.items() if now - updated >= refill]:
+            del buckets[key]
+
+    def sweep(self, now: float = None) -> None:
+        if not self._sweep_lock.acquire(blocking=False):
+            return  # outra thread já está varrendo
+        try:
+            now = time.monotonic() if now is None else now
+            self._next_sweep = now + self.sweep_interval
+            for buckets, lock in self._stripes:
+                with lock:
+                    self._sweep_stripe(buckets, now)
+        finally:
+            self._sweep_lock.release()
+
+    def size(self) -> int:
+        return sum(len(b) for b, _ in self._stripes)
+
+    def clear(self) -> None:
+        for buckets, lock in self._stripes:
+            with lock:
+                buckets.clear()
+
+
+# fichas e instante num hash; tudo numa chamada atômica no servidor
+_REDIS_TAKE = """
+local burst = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 't', 'u')
+local tokens = tonumber(state[1]) or burst
+local updated = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+else
+  wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 't', tostring(tokens), 'u', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil((burst - tokens) / rate * 1000) + 1000)
+return tostring(wait)
+"""
+
+
+class RedisBucketStore:
+    """
+    Buckets compartilhados entre workers/instâncias (script Lua atômico;
+    o PEXPIRE faz a eviction). Se o Redis falhar, libera a requisição:
+    o limitador não pode derrubar o login.
+    """
+
+    def __init__(self, client=None, url: str = None, prefix: str = "meupet:rl:"):
+        if client is None:
+            if redis is None:
+                raise RuntimeError("RATELIMIT_BACKEND=redis exige o pacote redis.")
+            client = redis.Redis.from_url(url or "redis://localhost:6379/0")
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(_REDIS_TAKE)
+
+    def take(self, key: str, burst: int, rate: float, now: float = None) -> float:
+        now = time.time() if now is None else now
+        try:
+            return float(self._script(keys=[self.prefix + key], args=[burst, rate, now]))
+        except Exception:
+            logger.warning("Rate limit: Redis indisponível, liberando %s", key, exc_info=True)
+            return 0.0
+
+    def size(self):
+        return None
+
+    def clear(self) -> None:
+        for key in self.client.scan_iter(self.prefix + "*"):
+            self.client.delete(key)
+
+
+class RateLimiter:
+    """
+    Limites por IP e por e-mail alvo em endpoints caros (DNS + pbkdf2).
+    O decorator roda antes do corpo do método, então uma requisição
+    recusada não custa consulta MX nem hash.
+    """
+
+    def __init__(self):
+        self.store = None
+        self.rules = {}          # (endpoint, escopo) -> (capacidade, fichas/s)
+        self.trusted_proxies = 0
+        self.rejected = {}       # (endpoint, escopo) -> contagem
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.store is not None
+
+    def configure(self, store, rules: dict, trusted_proxies: int = 0) -> None:
+        self.store = store
+        self.rules = {k: v for k, v in rules.items() if v is not None}
+        self.trusted_proxies = trusted_proxies
+        self.rejected = {}
+
+    def client_ip(self) -> str:
+        # atrás de N proxies confiáveis o cliente é o N-ésimo do fim no X-Forwarded-For
+        route = request.access_route
+        if self.trusted_proxies and len(route) >= self.trusted_proxies and "X-Forwarded-For" in request.headers:
+            return route[-self.trusted_proxies]
+        return request.remote_addr or "-"
+
+    def _keys(self, endpoint: str):
+        if (endpoint, "ip") in self.rules:
+            yield "ip", self.client_ip()
+        if (endpoint, "email") in self.rules:
+            data = request.get_json(force=True, silent=True)
+            email = data.get("email") if isinstance(data, dict) else None
+            if isinstance(email, str) and email.strip():
+                yield "email", email.strip().lower()
+
+    def check(self, endpoint: str) -> float:
+        """
+        Espera do primeiro bucket que recusar (0 = liberado). O do IP vem
+        antes: recusado ali, o bucket do e-mail não é tocado, senão um
+        atacante já barrado ainda esgotaria o login da vítima.
+        """
+        for scope, value in self._keys(endpoint):
+            burst, rate = self.rules[(endpoint, scope)]
+            wait = self.store.take(f"{endpoint}:{scope}:{value}", burst, rate)
+            if wait > 0:
+                with self._lock:
+                    self.rejected[(endpoint, scope)] = self.rejected.get((endpoint, scope), 0) + 1
+                return wait
+        return 0.0
+
+    def limit(self, endpoint: str):
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                if self.store is None:
+                    return fn(*args, **kwargs)
+                wait = self.check(endpoint)
+                if wait > 0:
+                    logger.info("Rate limit: %s recusado para %s", endpoint, self.client_ip())
+                    return ({"errors": {"_": ["Muitas tentativas, tente novamente mais tarde."]}},
+                            429, {"Retry-After": str(max(1, math.ceil(wait)))})
+                return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+
+rate_limiter = RateLimiter()
+
+
+def rules_from_config(config) -> dict:
+    return {
+        ("login", "ip"): parse_rule(config["RATELIMIT_LOGIN_IP"]),
+        ("login", "email"): parse_rule(config["RATELIMIT_LOGIN_EMAIL"]),
+        ("register", "ip"): parse_rule(config["RATELIMIT_REGISTER_IP"]),
+        ("register", "email"): parse_rule(config["RATELIMIT_REGISTER_EMAIL"]),
+    }
+
+
+@registry.collector
+def _ratelimit_metrics() -> list:
+    if not rate_limiter.enabled:
+        return []
+    lines = [
+        "# HELP meupet_ratelimit_rejected_total Requisições recusadas pelo rate limit.",
+        "# TYPE meupet_ratelimit_rejected_total counter",
+    ]
+    for (endpoint, scope), n in sorted(rate_limiter.rejected.items()):
+        lines.append(f'meupet_ratelimit_rejected_total{{endpoint="{endpoint}",scope="{scope}"}} {n}')
+    size = rate_limiter.store.size()
+    if size is not None:
+        lines += [
+            "# HELP meupet_ratelimit_buckets Buckets de rate limit em memória.",
+            "# TYPE meupet_ratelimit_buckets gauge",
+            f"meupet_ratelimit_buckets {size}",
+        ]
+    return lines
+
+
+def init_ratelimit(app) -> None:
+    """
+    RATELIMIT_BACKEND: "memory" (padrão; por processo) ou "redis"
+    (compartilhado entre workers; RATELIMIT_URL). Regras no formato
+    "capacidade/segundos"; "0" desliga a regra.
+    """
+    app.config.setdefault("RATELIMIT_ENABLED", os.environ.get("RATELIMIT_ENABLED", "1") == "1")
+    app.config.setdefault("RATELIMIT_BACKEND", os.environ.get("RATELIMIT_BACKEND", "memory"))
+    app.config.setdefault("RATELIMIT_URL", os.environ.get("RATELIMIT_URL", ""))
+    app.config.setdefault("RATELIMIT_TRUSTED_PROXIES", int(os.environ.get("RATELIMIT_TRUSTED_PROXIES", "0")))
+    app.config.setdefault("RATELIMIT_LOGIN_IP", os.environ.get("RATELIMIT_LOGIN_IP", "20/60"))
+    app.config.setdefault("RATELIMIT_LOGIN_EMAIL", os.environ.get("RATELIMIT_LOGIN_EMAIL", "10/300"))
+    app.config.setdefault("RATELIMIT_REGISTER_IP", os.environ.get("RATELIMIT_REGISTER_IP", "10/3600"))
+    app.config.setdefault("RATELIMIT_REGISTER_EMAIL", os.environ.get("RATELIMIT_REGISTER_EMAIL", "3/3600"))
+
+    if not app.config["RATELIMIT_ENABLED"]:
+        rate_limiter.configure(None, {})
+        return
+
+    kind = app.config["RATELIMIT_BACKEND"]
+    if kind == "memory":
+        store = MemoryBucketStore()
+    elif kind == "redis":
+        store = RedisBucketStore(url=app.config["RATELIMIT_URL"] or None)
+    else:
+        raise ValueError(f"RATELIMIT_BACKEND inválido: {kind}")
+
+    rate_limiter.configure(store, rules_from_config(app.config), app.config["RATELIMIT_TRUSTED_PROXIES"])
@@ -0,0 +1,60 @@
+import threading
+from datetime import datetime, timedelta
+
+from helpers.logging import logger
+
+_jobs = []  # jobs iniciados neste processo (para recriar as threads após fork)
+
+
+class DailyJob:
+    """
+    Job em thread daemon: roda `fn()` dentro do app context ao iniciar e
+    depois todo dia no horário `hour` (hora local do servidor).
+    """
+
+    def __init__(self, app, name: str, fn, hour: int = 3):
+        self.app = app
+        self.name = name
+        self.fn = fn
+        self.hour = hour
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _seconds_until_next_run(self) -> float:
+        now = datetime.now()
+        nxt = now.replace(hour=self.hour, minute=0, second=0, microsecond=0)
+        if nxt <= now:
+            nxt += timedelta(days=1)
+        return (nxt - now).total_seconds()
+
+    def _run_once(self) -> None:
+        try:
+            with self.app.app_context():
+                self.fn()
+        except Exception:
+            logger.exception("Falha no job diário %s", self.name)
+
+    def _loop(self) -> None:
+        self._run_once()
+        while not self._stop.wait(self._seconds_until_next_run()):
+            self._run_once()
+
+    def start(self) -> "DailyJob":
+        if self not in _jobs:
+            _jobs.append(self)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, daemon=True, name=f"job-{self.name}")
+            self._thread.start()
+            logger.info("Job diário %s agendado (%02dh)", self.name, self.hour)
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+def restart_after_fork() -> None:
+    """Threads não sobrevivem ao fork: reinicia os jobs no processo filho."""
+    for job in _jobs:
+        job._stop = threading.Event()
+        job._thread = None
+        job.start()
@@ -0,0 +1,27 @@
+import re
+
+from marshmallow import ValidationError
+
+# letras/dígitos (com acento); o resto separa termos e nunca chega ao FTS5
+_TERM = re.compile(r"[^\W_]+")
+MAX_TERMS = 8
+MAX_QUERY_LEN = 200
+
+
+def match_expression(q: str, columns, owner: str) -> str:
+    """
+    Texto livre do usuário -> expressão MATCH do FTS5.
+
+    Cada termo vira uma frase entre aspas com prefixo ("rex"*), então
+    operadores/aspas digitados não são interpretados; todos os termos
+    precisam aparecer em alguma de `columns` e `owner` ("u<id>") restringe
+    ao dono. Acentos e caixa ficam por conta do tokenizer.
+    """
+    q = (q or "").strip()
+    if len(q) > MAX_QUERY_LEN:
+        raise ValidationError({"q": [f"Máximo de {MAX_QUERY_LEN} caracteres."]})
+    terms = _TERM.findall(q)[:MAX_TERMS]
+    if not terms:
+        raise ValidationError({"q": ["Informe o texto da busca."]})
+    phrases = " ".join(f'"{t}"*' for t in terms)
+    return f'dono:{owner} AND {{{" ".join(columns)}}}: ({phrases})'
@@ -0,0 +1,50 @@
+from marshmallow import fields
+
+# tipos cujo valor já vem do banco no tipo do JSON (str/int/float/bool)
+_PASSTHROUGH = (fields.String, fields.Integer, fields.Float, fields.Boolean)
+_ISO = (fields.Date, fields.DateTime)
+
+
+def compile_dump(schema):
+    """
+    Gera, uma vez, uma função equivalente a `schema.dump` para objetos do ORM:
+    um dict literal com um acesso de atributo por campo, sem o dispatch por
+    campo/objeto do marshmallow. Respeita data_key/attribute, only/exclude,
+    Nested e `many`. Campos de outros tipos caem no field.serialize().
+    """
+    hooks = getattr(schema, "_hooks", {})
+    if hooks.get("pre_dump") or hooks.get("post_dump"):
+        raise ValueError(f"{type(schema).__name__} tem hooks de dump; use schema.dump")
+
+    ns = {}
+    items = []
+    for i, (name, field) in enumerate(schema.dump_fields.items()):
+        key = field.data_key if field.data_key is not None else name
+        attr = field.attribute or name
+        src = f"obj.{attr}"
+        kind = type(field)
+
+        if not attr.isidentifier():
+            ns[f"_f{i}"] = field
+            expr = f"_f{i}.serialize({name!r}, obj)"
+        elif kind in _PASSTHROUGH and not getattr(field, "as_string", False):
+            expr = src
+        elif kind in _ISO and getattr(field, "format", None) in (None, "iso"):
+            expr = f"(None if (v := {src}) is None else v.isoformat())"
+        elif isinstance(field, fields.Nested):
+            ns[f"_n{i}"] = compile_dump(field.schema)
+            expr = f"(None if (v := {src}) is None else _n{i}(v))"
+        else:
+            ns[f"_f{i}"] = field
+            expr = f"_f{i}.serialize({name!r}, obj)"
+        items.append(f"{key!r}: {expr}")
+
+    code = "def dump_one(obj):\n    return {" + ", ".join(items) + "}\n"
+    exec(compile(code, f"<dump {type(schema).__name__}>", "exec"), ns)
+    dump_one = ns["dump_one"]
+
+    if schema.many:
+        def dump_many(objs):
+            return [dump_one(o) for o in objs]
+        return dump_many
+    return dump_one
@@ -0,0 +1,29 @@
+"""versao para etag
+
+Revision ID: 3f8a1b6c9d20
+Revises: 7d2c4e91b3a5
+Create Date: 2026-10-17 20:52:31.480215
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f8a1b6c9d20'
+down_revision = '7d2c4e91b3a5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    for table in ('usuario', 'pet', 'vacina'):
+        op.add_column(table, sa.Column('versao', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade():
+    for table in ('vacina', 'pet', 'usuario'):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('versao')
+    # o batch recria a tabela pet sem o índice de expressão (não é refletido)
+    op.execute('CREATE INDEX IF NOT EXISTS ix_pet_usuario_id_lower_nome ON pet (usuario_id, lower(nome))')
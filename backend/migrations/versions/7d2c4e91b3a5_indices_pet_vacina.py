@@ -0,0 +1,36 @@
+"""indices pet e vacina
+
+Revision ID: 7d2c4e91b3a5
+Revises: 0150eac4a80e
+Create Date: 2026-10-17 20:40:12.113402
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7d2c4e91b3a5'
+down_revision = '0150eac4a80e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # PetListResource.get/post: usuario_id + lower(nome)
+    op.create_index(
+        'ix_pet_usuario_id_lower_nome', 'pet',
+        ['usuario_id', sa.text('lower(nome)')],
+        unique=False,
+    )
+    # VacinaListResource.get: pet_id + ORDER BY data_aplicacao DESC, id
+    op.create_index(
+        'ix_vacina_pet_id_data_aplicacao', 'vacina',
+        ['pet_id', sa.text('data_aplicacao DESC'), 'id'],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index('ix_vacina_pet_id_data_aplicacao', table_name='vacina')
+    op.drop_index('ix_pet_usuario_id_lower_nome', table_name='pet')
@@ -0,0 +1,29 @@
+"""indices revacinacao
+
+Revision ID: a41e7c2f5b88
+Revises: 3f8a1b6c9d20
+Create Date: 2026-10-17 21:05:44.927310
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'a41e7c2f5b88'
+down_revision = '3f8a1b6c9d20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_vacina_data_revac', 'vacina', ['data_revac'], unique=False)
+    op.create_index(
+        'ix_vacina_pet_id_nome_data_aplicacao', 'vacina',
+        ['pet_id', 'nome', 'data_aplicacao', 'id'],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index('ix_vacina_pet_id_nome_data_aplicacao', table_name='vacina')
+    op.drop_index('ix_vacina_data_revac', table_name='vacina')
@@ -0,0 +1,26 @@
+"""colecao_versao para etag das listas
+
+Revision ID: b7d3e5f91a26
+Revises: e2b9f4a61c37
+Create Date: 2026-10-17 22:25:08.114527
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d3e5f91a26'
+down_revision = 'e2b9f4a61c37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('usuario', sa.Column('colecao_versao', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade():
+    # ALTER TABLE ... DROP COLUMN nativo (SQLite >= 3.35): o batch recriaria a
+    # tabela e perderia o AUTOINCREMENT
+    op.drop_column('usuario', 'colecao_versao')
@@ -0,0 +1,45 @@
+"""pet nome unico por usuario
+
+Revision ID: c5e83d17a2f4
+Revises: a41e7c2f5b88
+Create Date: 2026-10-17 21:20:13.512044
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5e83d17a2f4'
+down_revision = 'a41e7c2f5b88'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # a checagem antiga (SELECT antes do INSERT) tinha corrida: confere antes
+    # de criar o índice único para falhar com uma mensagem clara
+    dupes = op.get_bind().execute(sa.text(
+        'SELECT usuario_id, lower(nome), count(*) FROM pet '
+        'GROUP BY usuario_id, lower(nome) HAVING count(*) > 1'
+    )).fetchall()
+    if dupes:
+        raise RuntimeError(
+            f'{len(dupes)} nomes de pet duplicados por usuário (ex.: usuario_id={dupes[0][0]}, '
+            f'nome={dupes[0][1]!r}); renomeie antes de migrar.'
+        )
+    op.drop_index('ix_pet_usuario_id_lower_nome', table_name='pet')
+    op.create_index(
+        'ix_pet_usuario_id_lower_nome', 'pet',
+        ['usuario_id', sa.text('lower(nome)')],
+        unique=True,
+    )
+
+
+def downgrade():
+    op.drop_index('ix_pet_usuario_id_lower_nome', table_name='pet')
+    op.create_index(
+        'ix_pet_usuario_id_lower_nome', 'pet',
+        ['usuario_id', sa.text('lower(nome)')],
+        unique=False,
+    )
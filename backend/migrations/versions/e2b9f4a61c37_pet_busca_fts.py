@@ -0,0 +1,74 @@
+"""pet busca fts5
+
+Revision ID: e2b9f4a61c37
+Revises: c5e83d17a2f4
+Create Date: 2026-10-17 22:05:41.208117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b9f4a61c37'
+down_revision = 'c5e83d17a2f4'
+branch_labels = None
+depends_on = None
+
+BACKFILL_CHUNK = 1000
+
+# mesmo DDL de models.pet.PET_FTS_DDL (a migration não importa models)
+DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS pet_fts USING fts5("
+    "nome, raca, cor_pelagem, especie, outras_caracteristicas, dono, "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE TRIGGER IF NOT EXISTS pet_fts_ai AFTER INSERT ON pet BEGIN "
+    "INSERT OR REPLACE INTO pet_fts(rowid, nome, raca, cor_pelagem, especie, outras_caracteristicas, dono) "
+    "VALUES (new.id, new.nome, new.raca, new.cor_pelagem, new.especie, new.outras_caracteristicas, "
+    "'u' || new.usuario_id); END",
+    "CREATE TRIGGER IF NOT EXISTS pet_fts_au AFTER UPDATE OF "
+    "nome, raca, cor_pelagem, especie, outras_caracteristicas, usuario_id ON pet BEGIN "
+    "UPDATE pet_fts SET nome = new.nome, raca = new.raca, cor_pelagem = new.cor_pelagem, "
+    "especie = new.especie, outras_caracteristicas = new.outras_caracteristicas, "
+    "dono = 'u' || new.usuario_id WHERE rowid = old.id; END",
+    "CREATE TRIGGER IF NOT EXISTS pet_fts_ad AFTER DELETE ON pet BEGIN "
+    "DELETE FROM pet_fts WHERE rowid = old.id; END",
+)
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite':
+        return
+    # triggers antes do backfill: o que entrar durante a carga já é indexado
+    # e o OR REPLACE abaixo não duplica
+    for stmt in DDL:
+        op.execute(stmt)
+
+    # autocommit: cada lote é uma transação própria e o lock de escrita do
+    # SQLite é solto entre eles; se cair no meio, rodar de novo é seguro
+    # (IF NOT EXISTS + OR REPLACE)
+    with op.get_context().autocommit_block():
+        last = 0
+        while True:
+            upto = bind.execute(sa.text(
+                'SELECT max(id) FROM (SELECT id FROM pet WHERE id > :last ORDER BY id LIMIT :n)'
+            ), {'last': last, 'n': BACKFILL_CHUNK}).scalar()
+            if upto is None:
+                break
+            bind.execute(sa.text(
+                "INSERT OR REPLACE INTO pet_fts(rowid, nome, raca, cor_pelagem, especie, "
+                "outras_caracteristicas, dono) "
+                "SELECT id, nome, raca, cor_pelagem, especie, outras_caracteristicas, 'u' || usuario_id "
+                "FROM pet WHERE id > :last AND id <= :upto"
+            ), {'last': last, 'upto': upto})
+            last = upto
+        op.execute("INSERT INTO pet_fts(pet_fts) VALUES ('optimize')")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for name in ('pet_fts_ai', 'pet_fts_au', 'pet_fts_ad'):
+        op.execute(f'DROP TRIGGER IF EXISTS {name}')
+    op.execute('DROP TABLE IF EXISTS pet_fts')
@@ -1,6 +1,8 @@
 from datetime import datetime
-from helpers.database import db
+from sqlalchemy import DDL, column, event, func, table
+from helpers.database import db, versioned
 
+@versioned
 class Pet(db.Model):
     __tablename__ = "pet"
     __table_args__ = {"sqlite_autoincrement": True}
@@ -28,11 +30,48 @@ class Pet(db.Model):
     idade_aproximada       = db.Column(db.String(50))
     outras_caracteristicas = db.Column(db.Text)
     criado_em              = db.Column(db.DateTime, default=datetime.utcnow)
+    versao                 = db.Column(db.Integer, nullable=False, default=1, server_default="1")
 
-    # vacinas do pet com cascade
+    # vacinas do pet com cascade, na ordem de /pets/<id>/vacinas; pet_id na
+    # frente deixa o SELECT ... IN do selectinload seguir o índice (sem sort)
     vacinas = db.relationship(
         "Vacina",
         back_populates="pet",
         cascade="all, delete-orphan",
         passive_deletes=True,
+        order_by="(Vacina.pet_id, Vacina.data_aplicacao.desc(), Vacina.id)",
     )
+
+
+# listagem (usuario_id + ORDER BY lower(nome)); único: um nome por tutor
+# (case-insensitive), o INSERT duplicado vira IntegrityError -> 409
+PET_NOME_UNIQUE = "ix_pet_usuario_id_lower_nome"
+db.Index(PET_NOME_UNIQUE, Pet.usuario_id, func.lower(Pet.nome), unique=True)
+
+
+# busca textual (GET /pets/search): FTS5 com acentos/caixa dobrados pelo
+# tokenizer; "dono" = "u<usuario_id>" restringe o MATCH ao tutor. Mantido
+# por triggers (pegam também INSERTs via Core e o CASCADE do usuário).
+PET_FTS_COLUMNS = ("nome", "raca", "cor_pelagem", "especie", "outras_caracteristicas")
+PET_FTS_WEIGHTS = (10.0, 5.0, 3.0, 2.0, 1.0, 0.0)  # bm25 por coluna; dono não pontua
+PET_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS pet_fts USING fts5("
+    "nome, raca, cor_pelagem, especie, outras_caracteristicas, dono, "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE TRIGGER IF NOT EXISTS pet_fts_ai AFTER INSERT ON pet BEGIN "
+    "INSERT OR REPLACE INTO pet_fts(rowid, nome, raca, cor_pelagem, especie, outras_caracteristicas, dono) "
+    "VALUES (new.id, new.nome, new.raca, new.cor_pelagem, new.especie, new.outras_caracteristicas, "
+    "'u' || new.usuario_id); END",
+    "CREATE TRIGGER IF NOT EXISTS pet_fts_au AFTER UPDATE OF "
+    "nome, raca, cor_pelagem, especie, outras_caracteristicas, usuario_id ON pet BEGIN "
+    "UPDATE pet_fts SET nome = new.nome, raca = new.raca, cor_pelagem = new.cor_pelagem, "
+    "especie = new.especie, outras_caracteristicas = new.outras_caracteristicas, "
+    "dono = 'u' || new.usuario_id WHERE rowid = old.id; END",
+    "CREATE TRIGGER IF NOT EXISTS pet_fts_ad AFTER DELETE ON pet BEGIN "
+    "DELETE FROM pet_fts WHERE rowid = old.id; END",
+)
+pet_fts = table("pet_fts", column("rowid"))
+
+for _ddl in PET_FTS_DDL:
+    # db.create_all() (dev); em produção a migration cria o mesmo
+    event.listen(Pet.__table__, "after_create", DDL(_ddl).execute_if(dialect="sqlite"))
@@ -1,5 +1,6 @@
-from helpers.database import db
+from helpers.database import db, versioned
 
+@versioned
 class Usuario(db.Model):
     __tablename__ = "usuario"
     __table_args__ = {"sqlite_autoincrement": True}  # impede reuso de IDs
@@ -17,6 +18,9 @@ class Usuario(db.Model):
     funcao   = db.Column(db.String(10), nullable=False)
     email    = db.Column(db.String(120), unique=True, nullable=False)
     senha    = db.Column(db.String(255), nullable=False)
+    versao   = db.Column(db.Integer, nullable=False, default=1, server_default="1")
+    # sobe a cada escrita em pets/vacinas do usuário (ETag das listas)
+    colecao_versao = db.Column(db.Integer, nullable=False, default=1, server_default="1")
 
     # relação -> pets com cascade
     pets = db.relationship(
@@ -1,5 +1,6 @@
-from helpers.database import db
+from helpers.database import db, versioned
 
+@versioned
 class Vacina(db.Model):
     __tablename__ = "vacina"
     __table_args__ = {"sqlite_autoincrement": True}
@@ -24,3 +25,14 @@ class Vacina(db.Model):
     lote            = db.Column(db.String(50), nullable=False)
     dose_tamanho    = db.Column(db.String(50), nullable=False)
     observacoes     = db.Column(db.Text)
+    versao          = db.Column(db.Integer, nullable=False, default=1, server_default="1")
+
+
+# listagem por pet em ORDER BY data_aplicacao DESC, id (keyset)
+db.Index("ix_vacina_pet_id_data_aplicacao", Vacina.pet_id, Vacina.data_aplicacao.desc(), Vacina.id)
+
+# revacinações vencendo (fila diária, todas as contas) por data_revac
+db.Index("ix_vacina_data_revac", Vacina.data_revac)
+
+# "última dose" por (pet, nome da vacina)
+db.Index("ix_vacina_pet_id_nome_data_aplicacao", Vacina.pet_id, Vacina.nome, Vacina.data_aplicacao, Vacina.id)
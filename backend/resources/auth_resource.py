@@ -1,28 +1,24 @@
 # backend/resources/auth_resource.py
 from flask import request
 from flask_restful import Resource
-from werkzeug.security import check_password_hash
-import dns.resolver, dns.exception
 
+from helpers.database import db, commit_with_retry
 from helpers.logging import logger
+from helpers.mx import mx_cache
+from helpers.passwords import password_hasher, PasswordPoolBusy
+from helpers.ratelimit import rate_limiter
 from models.usuario import Usuario
 from resources.auth_utils import gerar_token
 
-_resolver = dns.resolver.Resolver(configure=True)
-_resolver.timeout = _resolver.lifetime = 2.0
-
 def has_mx(domain: str) -> bool:
     # em dev você pode curto-circuitar para True se quiser
     from os import environ
     if environ.get("APP_ENV") == "dev":
         return True
-    try:
-        ans = _resolver.resolve(domain, 'MX')
-        return len(ans) > 0
-    except (dns.exception.DNSException, OSError):
-        return False
+    return mx_cache.has_mx(domain)
 
 class AuthLoginResource(Resource):
+    @rate_limiter.limit("login")  # antes do MX e do pbkdf2
     def post(self):
         data = request.get_json(force=True) or {}
         email = (data.get('email') or '').strip().lower()
@@ -42,7 +38,9 @@ class AuthLoginResource(Resource):
             return {"errors": {"email": ["Usuário não existente."]}}, 404
 
         try:
-            ok = check_password_hash(u.senha, str(senha))
+            ok = password_hasher.check(u.senha, str(senha))
+        except PasswordPoolBusy:
+            return {"errors": {"_": ["Servidor ocupado, tente novamente."]}}, 503, {"Retry-After": "1"}
         except Exception as e:
             logger.exception("Falha no check_password_hash para user_id=%s", u.id)
             return {"errors": {"_": ["Falha ao validar credenciais."]}}, 500
@@ -51,5 +49,15 @@ class AuthLoginResource(Resource):
             logger.info("Login falhou: senha incorreta para user_id=%s", u.id)
             return {"errors": {"senha": ["Senha incorreta."]}}, 401
 
+        # atualiza o hash se foi gerado com parâmetros mais fracos que o HASH_METHOD atual
+        if password_hasher.needs_rehash(u.senha):
+            try:
+                novo_hash = password_hasher.hash(str(senha))
+                commit_with_retry(lambda: setattr(u, "senha", novo_hash))
+                logger.info("Senha re-hasheada para user_id=%s", u.id)
+            except Exception:
+                db.session.rollback()
+                logger.exception("Falha ao re-hashear senha para user_id=%s", u.id)
+
         token = gerar_token(u)
         return {"token": token, "id": u.id, "nome": u.nome, "email": u.email}, 200
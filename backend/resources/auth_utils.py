@@ -1,9 +1,102 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
 from functools import wraps
-from flask import request, jsonify, current_app, g
+from flask import request, current_app, g
+from sqlalchemy import select
 import jwt
 
+from helpers.database import db
+from models.usuario import Usuario
+
+
+class VerifiedTokenCache:
+    """
+    LRU de tokens já verificados (chave = sha256 do token).
+    Requests repetidos do front pulam o HMAC e o parse do payload.
+
+    Só entra no cache token de conta que existe: no miss, login_required
+    confere o usuário no banco (SELECT pela PK) além da assinatura.
+
+    O cache é por processo: invalidate_user() (conta excluída) só limpa o
+    worker que atendeu o DELETE. Nos outros, o token da conta excluída é
+    aceito enquanto a entrada viver: no máximo `ttl` segundos
+    (TOKEN_CACHE_TTL) e nunca além do 'exp'. Depois disso o miss passa pela
+    checagem no banco e o token é recusado. Consultar algo compartilhado a
+    cada hit custaria mais do que o cache economiza.
+    """
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # digest -> (user_id, exp, válido_até monotonic)
+        self._by_user = {}             # user_id -> {digest, ...}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def _drop(self, key) -> None:
+        user_id, _, _ = self._entries.pop(key)
+        keys = self._by_user.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[user_id]
+
+    def get(self, key):
+        """Retorna (user_id, exp) ou None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            user_id, exp, valid_until = entry
+            if valid_until <= time.monotonic():
+                self._drop(key)  # velha: verifica o token de novo
+                return None
+            self._entries.move_to_end(key)
+            return user_id, exp
+
+    def put(self, key, user_id: int, exp: float) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (user_id, exp, time.monotonic() + self.ttl)
+            self._by_user.setdefault(user_id, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._drop(next(iter(self._entries)))
+
+    def discard(self, key) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            for key in list(self._by_user.get(user_id, ())):
+                self._drop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+
+token_cache = VerifiedTokenCache()
+
+
 def gerar_token(usuario) -> str:
-    payload = {"sub": usuario.id, "email": usuario.email}
+    now = datetime.now(timezone.utc)
+    ttl = current_app.config.get("JWT_EXPIRES", timedelta(days=7))
+    payload = {
+        "sub": str(usuario.id),
+        "email": usuario.email,
+        "iat": now,
+        "exp": now + ttl,
+    }
     token = jwt.encode(payload, current_app.config['JWT_SECRET'], algorithm='HS256')
     return token
 
@@ -12,14 +105,32 @@ def login_required(fn):
     def wrapper(*args, **kwargs):
         auth = request.headers.get('Authorization', '')
         if not auth.startswith('Bearer '):
-            return jsonify({"errors": {"_": ["Não autorizado"]}}), 401
+            return {"errors": {"_": ["Não autorizado"]}}, 401
         token = auth.split(' ', 1)[1]
+
+        key = token_cache.digest(token)
+        cached = token_cache.get(key)
+        if cached is not None:
+            user_id, exp = cached
+            if exp <= time.time():
+                token_cache.discard(key)
+                return {"errors": {"_": ["Sessão expirada."]}}, 401
+            g.current_user_id = user_id
+            return fn(*args, **kwargs)
+
         try:
-            payload = jwt.decode(token, current_app.config['JWT_SECRET'], algorithms=['HS256'])
+            payload = jwt.decode(
+                token, current_app.config['JWT_SECRET'], algorithms=['HS256'],
+                options={"require": ["exp", "sub"]},
+            )
             g.current_user_id = int(payload['sub'])
         except jwt.ExpiredSignatureError:
-            return jsonify({"errors": {"_": ["Sessão expirada."]}}), 401
+            return {"errors": {"_": ["Sessão expirada."]}}, 401
         except Exception:
-            return jsonify({"errors": {"_": ["Token inválido"]}}), 401
+            return {"errors": {"_": ["Token inválido"]}}, 401
+        # assinatura válida não basta: a conta pode ter sido excluída
+        if db.session.scalar(select(Usuario.id).where(Usuario.id == g.current_user_id)) is None:
+            return {"errors": {"_": ["Token inválido"]}}, 401
+        token_cache.put(key, g.current_user_id, float(payload['exp']))
         return fn(*args, **kwargs)
     return wrapper
@@ -0,0 +1,27 @@
+import os
+from flask import request
+from flask_restful import Resource
+
+from helpers.database import slow_queries
+
+
+class SlowQueryDebugResource(Resource):
+    """Últimas queries lentas (buffer em memória deste processo)."""
+
+    def get(self):
+        if os.environ.get("APP_ENV") != "dev":
+            return {"error": "forbidden"}, 403
+        try:
+            limit = int(request.args.get("limit", 50))
+        except ValueError:
+            return {"errors": {"limit": ["Informe um inteiro."]}}, 400
+        return {
+            "threshold_ms": slow_queries.threshold_ms,
+            "items": slow_queries.recent(max(limit, 0)),
+        }, 200
+
+    def delete(self):
+        if os.environ.get("APP_ENV") != "dev":
+            return {"error": "forbidden"}, 403
+        slow_queries.clear()
+        return "", 204
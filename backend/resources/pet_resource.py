@@ -1,67 +1,161 @@
 # backend/resources/pet_resource.py
-from flask import request, g
+from flask import request, g, abort
 from flask_restful import Resource
-from sqlalchemy import func
+from sqlalchemy import func, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
 from marshmallow import ValidationError
 
-from helpers.database import db
-from models.pet import Pet
+from helpers.cache import response_cache
+from helpers.database import db, commit_with_retry, is_unique_violation
+from helpers.etag import make_etag, row_version, collection_version, bump_version, not_modified, etag_headers
+from helpers.pagination import keyset_paginate, page_headers, PaginationError
+from helpers.search import match_expression
+from models.pet import Pet, PET_NOME_UNIQUE, PET_FTS_COLUMNS, PET_FTS_WEIGHTS, pet_fts
+from models.usuario import Usuario
 from models.vacina import Vacina
-from schemas import pet_schema, pets_schema, vacina_schema, vacinas_schema
+from schemas import (
+    pet_schema, pet_update_schema, pet_vacinas_schema, vacina_schema,
+    dump_pets, dump_pets_vacinas, dump_vacinas,
+)
 from resources.auth_utils import login_required
+from resources.revacinacao_resource import revac_queue
+
+
+INCLUDES = {"vacinas"}
+
+
+def parse_include() -> set:
+    """?include=vacinas (lista separada por vírgula). Valor desconhecido -> ValidationError (400)."""
+    raw = request.args.get("include", "")
+    include = {p.strip() for p in raw.split(",") if p.strip()}
+    unknown = include - INCLUDES
+    if unknown:
+        raise ValidationError({"include": [f"Valor inválido: {', '.join(sorted(unknown))}."]})
+    return include
 
 
 class PetListResource(Resource):
     method_decorators = [login_required]
 
+    @response_cache.cached
     def get(self):
-        pets = (
-            Pet.query
-            .filter_by(usuario_id=g.current_user_id)
-            .order_by(func.lower(Pet.nome))
-            .all()
-        )
-        return pets_schema.dump(pets), 200
+        try:
+            include = parse_include()
+        except ValidationError as err:
+            return {"errors": err.messages}, 400
+
+        # uma versão para pets e vacinas do usuário: sobe em toda escrita
+        versao = collection_version(Usuario.colecao_versao, id=g.current_user_id)
+        etag = make_etag("pets", g.current_user_id, versao, request.query_string)
+        if not_modified(etag):
+            return "", 304, etag_headers(etag)
+
+        query = Pet.query.filter_by(usuario_id=g.current_user_id)
+        if "vacinas" in include:
+            query = query.options(selectinload(Pet.vacinas))  # 1 SELECT ... IN para a página toda
+        try:
+            pets, next_cursor = keyset_paginate(query, [(func.lower(Pet.nome), False), (Pet.id, False)])
+        except PaginationError as err:
+            return {"errors": err.messages}, 400
+        dump = dump_pets_vacinas if "vacinas" in include else dump_pets
+        return dump(pets), 200, {**page_headers(next_cursor), **etag_headers(etag)}
 
     def post(self):
         try:
             payload = request.get_json(force=True) or {}
             pet = pet_schema.load(payload, session=db.session)
 
-            # normaliza/checa nome por usuário (case-insensitive)
+            # normaliza nome; duplicado por usuário (case-insensitive) é
+            # barrado pelo índice único no próprio INSERT
             nome_norm = (pet.nome or "").strip()
             if not nome_norm:
                 return {"errors": {"nome": ["Campo obrigatório."]}}, 400
 
-            exists = (
-                Pet.query
-                .filter(Pet.usuario_id == g.current_user_id,
-                        func.lower(Pet.nome) == func.lower(nome_norm))
-                .first()
-            )
-            if exists:
-                return {"errors": {"nome": ["Você já possui um pet com esse nome."]}}, 409
-
             pet.nome = nome_norm
             pet.usuario_id = g.current_user_id
-            db.session.add(pet)
-            db.session.commit()
-            return pet_schema.dump(pet), 201
+
+            def insert_and_dump():
+                # serializa antes do commit: depois dele o objeto expira e o
+                # dump faria um SELECT de refresh
+                db.session.add(pet)
+                bump_version(Usuario.colecao_versao, id=g.current_user_id)
+                db.session.flush()
+                return pet_schema.dump(pet)
+
+            body = commit_with_retry(insert_and_dump)
+            response_cache.bump(g.current_user_id)
+            return body, 201
 
         except ValidationError as err:
             db.session.rollback()
             return {"errors": err.messages}, 400
+        except IntegrityError as err:
+            db.session.rollback()
+            if is_unique_violation(err, PET_NOME_UNIQUE):
+                return {"errors": {"nome": ["Você já possui um pet com esse nome."]}}, 409
+            return {"errors": {"_": ["Conflito ao salvar pet."]}}, 409
         except Exception as e:
             db.session.rollback()
             return {"errors": {"_": [str(e)]}}, 500
 
 
+class PetSearchResource(Resource):
+    method_decorators = [login_required]
+
+    @response_cache.cached
+    def get(self):
+        """GET /pets/search?q=texto: pets do usuário por relevância (bm25), paginado."""
+        try:
+            match = match_expression(request.args.get("q"), PET_FTS_COLUMNS, f"u{g.current_user_id}")
+        except ValidationError as err:
+            return {"errors": err.messages}, 400
+
+        rank = func.bm25(text("pet_fts"), *PET_FTS_WEIGHTS)  # menor = mais relevante
+        query = (
+            Pet.query.join(pet_fts, pet_fts.c.rowid == Pet.id)
+            .filter(text("pet_fts MATCH :match").bindparams(match=match))
+            .filter(Pet.usuario_id == g.current_user_id)
+        )
+        try:
+            pets, next_cursor = keyset_paginate(query, [(rank, False), (Pet.id, False)])
+        except PaginationError as err:
+            return {"errors": err.messages}, 400
+        return dump_pets(pets), 200, page_headers(next_cursor)
+
+
 class PetDetailResource(Resource):
     method_decorators = [login_required]
 
     def get(self, pet_id):
-        pet = Pet.query.filter_by(id=pet_id, usuario_id=g.current_user_id).first_or_404()
-        return pet_schema.dump(pet), 200
+        try:
+            include = parse_include()
+        except ValidationError as err:
+            return {"errors": err.messages}, 400
+
+        if "vacinas" in include:
+            # versão do pet + versão das coleções do dono numa consulta
+            row = (db.session.query(Pet.versao, Usuario.colecao_versao)
+                   .join(Usuario, Usuario.id == Pet.usuario_id)
+                   .filter(Pet.id == pet_id, Pet.usuario_id == g.current_user_id)
+                   .first())
+            if row is None:
+                abort(404)
+            etag = make_etag("pet", pet_id, row[0], "vacinas", row[1])
+        else:
+            versao = row_version(Pet, id=pet_id, usuario_id=g.current_user_id)
+            if versao is None:
+                abort(404)
+            etag = make_etag("pet", pet_id, versao)
+        if not_modified(etag):
+            return "", 304, etag_headers(etag)
+
+        query = Pet.query.filter_by(id=pet_id, usuario_id=g.current_user_id)
+        if "vacinas" in include:
+            pet = query.options(selectinload(Pet.vacinas)).first_or_404()
+            return pet_vacinas_schema.dump(pet), 200, etag_headers(etag)
+        pet = query.first_or_404()
+        return pet_schema.dump(pet), 200, etag_headers(etag)
 
     # backend/resources/pet_resource.py (apenas o método put)
 
@@ -99,12 +193,18 @@ class PetDetailResource(Resource):
             if 'data_chegada' in clean and clean['data_chegada'] == '':
                 clean['data_chegada'] = None
 
-            # <-- passa a instância atual no context para o schema mesclar
-            pet_schema.context = {"db_instance": pet}
-            pet = pet_schema.load(clean, session=db.session, instance=pet, partial=True)
-            pet_schema.context = {}  # limpa o context para não "vazar" entre requests
+            # valida o payload e depois as datas mescladas com a instância atual
+            data = pet_update_schema.load(clean, partial=True)
+            pet_update_schema.validate_dates(data, inst=pet)
+
+            def apply():
+                for key, value in data.items():
+                    setattr(pet, key, value)
+                bump_version(Usuario.colecao_versao, id=g.current_user_id)
 
-            db.session.commit()
+            commit_with_retry(apply)
+            response_cache.bump(g.current_user_id)
+            revac_queue.invalidate(g.current_user_id)  # pet_nome na fila
             return pet_schema.dump(pet), 200
 
         except ValidationError as err:
@@ -120,8 +220,13 @@ class PetDetailResource(Resource):
         """
         pet = Pet.query.filter_by(id=pet_id, usuario_id=g.current_user_id).first_or_404()
         try:
-            db.session.delete(pet)
-            db.session.commit()
+            def apply():
+                db.session.delete(pet)
+                bump_version(Usuario.colecao_versao, id=g.current_user_id)
+
+            commit_with_retry(apply)
+            response_cache.bump(g.current_user_id)
+            revac_queue.invalidate(g.current_user_id)
             # 204 sem corpo
             return "", 204
         except Exception as e:
@@ -132,15 +237,23 @@ class PetDetailResource(Resource):
 class VacinaListResource(Resource):
     method_decorators = [login_required]
 
+    @response_cache.cached
     def get(self, pet_id):
-        pet = Pet.query.filter_by(id=pet_id, usuario_id=g.current_user_id).first_or_404()
-        vacs = (
-            Vacina.query
-            .filter_by(pet_id=pet.id)
-            .order_by(Vacina.data_aplicacao.desc())
-            .all()
-        )
-        return vacinas_schema.dump(vacs), 200
+        # posse do pet + versão da lista numa leitura, sem carregar linhas
+        versao = collection_version(Usuario.colecao_versao, Usuario.pets.any(Pet.id == pet_id), id=g.current_user_id)
+        if versao is None:
+            abort(404)
+        etag = make_etag("vacinas", pet_id, versao, request.query_string)
+        if not_modified(etag):
+            return "", 304, etag_headers(etag)
+        try:
+            vacs, next_cursor = keyset_paginate(
+                Vacina.query.filter_by(pet_id=pet_id),
+                [(Vacina.data_aplicacao, True), (Vacina.id, False)],
+            )
+        except PaginationError as err:
+            return {"errors": err.messages}, 400
+        return dump_vacinas(vacs), 200, {**page_headers(next_cursor), **etag_headers(etag)}
 
     def post(self, pet_id):
         pet = Pet.query.filter_by(id=pet_id, usuario_id=g.current_user_id).first_or_404()
@@ -148,8 +261,14 @@ class VacinaListResource(Resource):
             payload = request.get_json(force=True)
             vac = vacina_schema.load(payload, session=db.session)
             vac.pet_id = pet.id
-            db.session.add(vac)
-            db.session.commit()
+
+            def apply():
+                db.session.add(vac)
+                bump_version(Usuario.colecao_versao, id=g.current_user_id)
+
+            commit_with_retry(apply)
+            response_cache.bump(g.current_user_id)
+            revac_queue.invalidate(g.current_user_id)
             return vacina_schema.dump(vac), 201
         except ValidationError as err:
             db.session.rollback()
@@ -0,0 +1,180 @@
+# backend/resources/revacinacao_resource.py
+import threading
+from datetime import date, timedelta
+
+from flask import request, g, current_app
+from flask_restful import Resource
+from sqlalchemy import select, and_, or_, exists
+from sqlalchemy.orm import aliased
+
+from helpers.database import db
+from helpers.logging import logger
+from helpers.scheduler import DailyJob
+from models.pet import Pet
+from models.vacina import Vacina
+from schemas import dump_vacina
+from resources.auth_utils import login_required
+
+try:
+    import redis
+except ImportError:  # opcional: marcas de invalidação só em memória
+    redis = None
+
+# INCR da sequência + marca do usuário numa chamada só: duas invalidações
+# simultâneas não podem deixar a marca com o número menor
+_REDIS_MARK = """
+local seq = redis.call('INCR', KEYS[1])
+redis.call('SET', KEYS[2], seq, 'EX', ARGV[1])
+return seq
+"""
+
+
+def due_query(ate: date, user_id: int = None):
+    """
+    Revacinações com data_revac <= `ate`, considerando só a última dose de
+    cada (pet, nome da vacina). Uma consulta; user_id=None = todas as contas.
+    """
+    later = aliased(Vacina)
+    newer_dose = exists().where(
+        later.pet_id == Vacina.pet_id,
+        later.nome == Vacina.nome,
+        or_(
+            later.data_aplicacao > Vacina.data_aplicacao,
+            and_(later.data_aplicacao == Vacina.data_aplicacao, later.id > Vacina.id),
+        ),
+    )
+    stmt = (
+        select(Vacina, Pet.nome, Pet.usuario_id)
+        .join(Pet, Pet.id == Vacina.pet_id)
+        .where(Vacina.data_revac <= ate, ~newer_dose)
+        .order_by(Vacina.data_revac, Vacina.id)
+    )
+    if user_id is not None:
+        stmt = stmt.where(Pet.usuario_id == user_id)
+    return stmt
+
+
+def _item(vac, pet_nome) -> dict:
+    return {**dump_vacina(vac), "pet_nome": pet_nome}
+
+
+class RevacQueue:
+    """
+    Fila diária pré-calculada: revacinações até hoje + horizonte, por usuário.
+    Com ela o endpoint custa O(resultados). Escritas em vacinas/pets chamam
+    invalidate(user_id) e o usuário volta para a consulta direta até o
+    próximo rebuild.
+
+    Cada invalidate() recebe um número de sequência; o rebuild anota a
+    sequência ANTES da consulta e só considera limpo quem foi marcado até
+    ali. Uma invalidação durante a leitura continua valendo.
+
+    Sequência e marcas são por processo; com vários workers use
+    REVAC_INVALIDATION_URL (Redis) para que a escrita atendida por um
+    worker invalide a fila de todos.
+    """
+
+    MARK_TTL = 2 * 86400  # a fila é refeita todo dia: marca mais velha não importa
+
+    def __init__(self):
+        self.client = None
+        self.prefix = "meupet:revac:"
+        self._script = None
+        self._lock = threading.Lock()
+        self._by_user = {}
+        self._built_on = None
+        self._until = None
+        self._built_seq = 0
+        self._seq = 0
+        self._marks = {}  # user_id -> sequência da última invalidação
+
+    def rebuild(self, horizon_days: int = 30) -> None:
+        built_on = date.today()
+        until = built_on + timedelta(days=horizon_days)
+        started = self._current_seq()
+        by_user = {}
+        for vac, pet_nome, user_id in db.session.execute(due_query(until)):
+            by_user.setdefault(user_id, []).append((vac.data_revac, _item(vac, pet_nome)))
+        db.session.rollback()  # libera a transação de leitura do job
+        with self._lock:
+            self._by_user = by_user
+            self._built_on = built_on
+            self._until = until
+            self._built_seq = started
+            self._marks = {uid: seq for uid, seq in self._marks.items() if seq > started}
+        logger.info("Fila de revacinação: %d usuários até %s", len(by_user), until.isoformat())
+
+    def configure(self, client=None) -> None:
+        self.client = client
+        self._script = client.register_script(_REDIS_MARK) if client is not None else None
+
+    def _current_seq(self) -> int:
+        if self.client is not None:
+            return int(self.client.get(f"{self.prefix}seq") or 0)
+        with self._lock:
+            return self._seq
+
+    def _mark(self, user_id: int) -> int:
+        if self.client is not None:
+            return int(self.client.get(f"{self.prefix}u:{user_id}") or 0)
+        return self._marks.get(user_id, 0)
+
+    def invalidate(self, user_id: int) -> None:
+        if self.client is not None:
+            try:
+                self._script(keys=[f"{self.prefix}seq", f"{self.prefix}u:{user_id}"], args=[self.MARK_TTL])
+            except Exception:
+                logger.exception("Falha ao invalidar a fila de revacinação do usuário %s", user_id)
+            return
+        with self._lock:
+            self._seq += 1
+            self._marks[user_id] = self._seq
+
+    def get(self, user_id: int, ate: date):
+        """Lista pronta ou None se a fila não cobre o pedido (fallback p/ SQL)."""
+        with self._lock:
+            if self._built_on != date.today() or ate > self._until:
+                return None
+            built_seq = self._built_seq
+            entries = self._by_user.get(user_id, [])
+        try:
+            if self._mark(user_id) > built_seq:
+                return None
+        except Exception:
+            logger.exception("Falha ao ler a marca de revacinação do usuário %s", user_id)
+            return None
+        return [item for data_revac, item in entries if data_revac <= ate]
+
+
+revac_queue = RevacQueue()
+
+
+def init_revac_scheduler(app) -> None:
+    if not app.config.get("REVAC_SCHEDULER"):
+        return
+    if app.config["REVAC_INVALIDATION_URL"]:
+        if redis is None:
+            raise RuntimeError("REVAC_INVALIDATION_URL exige o pacote redis.")
+        revac_queue.configure(redis.Redis.from_url(app.config["REVAC_INVALIDATION_URL"]))
+    horizon = app.config["REVAC_HORIZON_DAYS"]
+    DailyJob(app, "revacinacao", lambda: revac_queue.rebuild(horizon),
+             hour=app.config["REVAC_SCHEDULER_HOUR"]).start()
+
+
+class RevacinacaoResource(Resource):
+    method_decorators = [login_required]
+
+    def get(self):
+        raw = request.args.get("ate")
+        try:
+            ate = date.fromisoformat(raw) if raw else date.today()
+        except ValueError:
+            return {"errors": {"ate": ["Use o formato AAAA-MM-DD."]}}, 400
+
+        items = revac_queue.get(g.current_user_id, ate) if current_app.config.get("REVAC_SCHEDULER") else None
+        if items is None:
+            items = [_item(vac, pet_nome)
+                     for vac, pet_nome, _ in db.session.execute(due_query(ate, g.current_user_id))]
+
+        hoje = date.today().isoformat()
+        return [{**item, "atrasada": item["revacinacao"] < hoje} for item in items], 200
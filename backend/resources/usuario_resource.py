@@ -1,33 +1,48 @@
 import os
-from flask import request, g
+from flask import request, g, abort
 from flask_restful import Resource
 from sqlalchemy.exc import IntegrityError
 from marshmallow import ValidationError
 
-from helpers.database import db
+from helpers.cache import response_cache
+from helpers.database import db, commit_with_retry, is_unique_violation
+from helpers.etag import make_etag, row_version, not_modified, etag_headers
+from helpers.pagination import keyset_paginate, page_headers, PaginationError
+from helpers.passwords import PasswordPoolBusy
+from helpers.ratelimit import rate_limiter
 from models.usuario import Usuario
-from schemas import usuario_create_schema, usuario_schema, usuarios_schema
-from resources.auth_utils import gerar_token, login_required
+from schemas import usuario_create_schema, usuario_schema, usuario_update_schema, dump_usuarios
+from resources.auth_utils import gerar_token, login_required, token_cache
+from resources.revacinacao_resource import revac_queue
 
 class UsuarioListResource(Resource):
     def get(self):
-        users = Usuario.query.all()
-        return usuarios_schema.dump(users), 200
+        try:
+            users, next_cursor = keyset_paginate(Usuario.query, [(Usuario.id, False)])
+        except PaginationError as err:
+            return {"errors": err.messages}, 400
+        return dump_usuarios(users), 200, page_headers(next_cursor)
 
+    @rate_limiter.limit("register")  # antes do load (MX + hash da senha)
     def post(self):
         try:
             payload = request.get_json(force=True) or {}
             usuario = usuario_create_schema.load(payload, session=db.session)  # exige 'senha'
-            db.session.add(usuario)
-            db.session.commit()
+            commit_with_retry(lambda: db.session.add(usuario))
             token = gerar_token(usuario)
             return {**usuario_schema.dump(usuario), "token": token}, 201
         except ValidationError as err:
             db.session.rollback()
             return {"errors": err.messages}, 400
-        except IntegrityError:
+        except IntegrityError as err:
+            # e-mail único pelo índice (sem SELECT antes do INSERT)
             db.session.rollback()
-            return {"errors": {"email": ["Já cadastrado."]}}, 409
+            if is_unique_violation(err, "usuario.email", "usuario_email"):
+                return {"errors": {"email": ["Já cadastrado."]}}, 409
+            return {"errors": {"_": ["Conflito ao salvar usuário."]}}, 409
+        except PasswordPoolBusy:
+            db.session.rollback()
+            return {"errors": {"_": ["Servidor ocupado, tente novamente."]}}, 503, {"Retry-After": "1"}
         except Exception as e:
             db.session.rollback()
             return {"errors": {"_": [str(e)]}}, 500
@@ -52,13 +67,14 @@ class UsuarioDetailResource(Resource):
             payload.pop("email", None)
 
             # aplica atualização parcial na instância existente
-            u = usuario_schema.load(
-                payload,
-                instance=u,
-                session=db.session,
-                partial=True,
-            )
-            db.session.commit()
+            data = usuario_update_schema.load(payload, partial=True)
+
+            def apply():
+                for key, value in data.items():
+                    setattr(u, key, value)
+
+            commit_with_retry(apply)
+            response_cache.bump(user_id)
             return usuario_schema.dump(u), 200
         except ValidationError as err:
             db.session.rollback()
@@ -66,6 +82,9 @@ class UsuarioDetailResource(Resource):
         except IntegrityError:
             db.session.rollback()
             return {"errors": {"email": ["Já cadastrado."]}}, 409
+        except PasswordPoolBusy:
+            db.session.rollback()
+            return {"errors": {"_": ["Servidor ocupado, tente novamente."]}}, 503, {"Retry-After": "1"}
         except Exception as e:
             db.session.rollback()
             return {"errors": {"_": [str(e)]}}, 500
@@ -75,8 +94,10 @@ class UsuarioDetailResource(Resource):
             return {"error": "forbidden"}, 403
         u = Usuario.query.get_or_404(user_id)
         try:
-            db.session.delete(u)  # cascata: pets e vacinas
-            db.session.commit()
+            commit_with_retry(lambda: db.session.delete(u))  # cascata: pets e vacinas
+            token_cache.invalidate_user(user_id)
+            response_cache.forget(user_id)
+            revac_queue.invalidate(user_id)
             return "", 204
         except Exception as e:
             db.session.rollback()
@@ -85,9 +106,16 @@ class UsuarioDetailResource(Resource):
 class MeResource(Resource):
     method_decorators = [login_required]
 
+    @response_cache.cached
     def get(self):
+        versao = row_version(Usuario, id=g.current_user_id)
+        if versao is None:
+            abort(404)
+        etag = make_etag("me", g.current_user_id, versao)
+        if not_modified(etag):
+            return "", 304, etag_headers(etag)
         u = Usuario.query.get_or_404(g.current_user_id)
-        return usuario_schema.dump(u), 200
+        return usuario_schema.dump(u), 200, etag_headers(etag)
 
 # Debug somente em dev
 class UsuarioDebugListResource(Resource):
@@ -1,22 +1,41 @@
 # backend/resources/vacina_resource.py
-from flask import request, g
+from flask import request, g, abort, current_app
 from flask_restful import Resource
 from marshmallow import ValidationError
+from sqlalchemy import insert
 from sqlalchemy.exc import IntegrityError
 
-from helpers.database import db
+from helpers.cache import response_cache
+from helpers.database import db, commit_with_retry
+from helpers.etag import make_etag, collection_version, bump_version, not_modified, etag_headers
+from helpers.pagination import keyset_paginate, page_headers, PaginationError
 from models.pet import Pet
+from models.usuario import Usuario
 from models.vacina import Vacina
-from schemas import vacina_schema, vacinas_schema
+from schemas import vacina_schema, vacina_batch_schema, vacina_update_schema, dump_vacinas
 from resources.auth_utils import login_required
+from resources.revacinacao_resource import revac_queue
 
 class VacinaListResource(Resource):
     method_decorators = [login_required]
 
+    @response_cache.cached
     def get(self, pet_id):
-        pet = Pet.query.filter_by(id=pet_id, usuario_id=g.current_user_id).first_or_404()
-        vacs = Vacina.query.filter_by(pet_id=pet.id).order_by(Vacina.data_aplicacao.desc()).all()
-        return vacinas_schema.dump(vacs), 200
+        # posse do pet + versão da lista numa leitura, sem carregar linhas
+        versao = collection_version(Usuario.colecao_versao, Usuario.pets.any(Pet.id == pet_id), id=g.current_user_id)
+        if versao is None:
+            abort(404)
+        etag = make_etag("vacinas", pet_id, versao, request.query_string)
+        if not_modified(etag):
+            return "", 304, etag_headers(etag)
+        try:
+            vacs, next_cursor = keyset_paginate(
+                Vacina.query.filter_by(pet_id=pet_id),
+                [(Vacina.data_aplicacao, True), (Vacina.id, False)],
+            )
+        except PaginationError as err:
+            return {"errors": err.messages}, 400
+        return dump_vacinas(vacs), 200, {**page_headers(next_cursor), **etag_headers(etag)}
 
     def post(self, pet_id):
         try:
@@ -24,8 +43,14 @@ class VacinaListResource(Resource):
             payload = request.get_json(force=True) or {}
             vac = vacina_schema.load(payload, session=db.session)
             vac.pet_id = pet.id
-            db.session.add(vac)
-            db.session.commit()
+
+            def apply():
+                db.session.add(vac)
+                bump_version(Usuario.colecao_versao, id=g.current_user_id)
+
+            commit_with_retry(apply)
+            response_cache.bump(g.current_user_id)
+            revac_queue.invalidate(g.current_user_id)
             return vacina_schema.dump(vac), 201
         except ValidationError as err:
             db.session.rollback()
@@ -74,12 +99,18 @@ class VacinaDetailResource(Resource):
             }
             clean = {k: v for k, v in payload.items() if k in ALLOWED}
 
-            # Contexto para o schema mesclar datas com a instância
-            vacina_schema.context = {"db_instance": vac}
-            vac = vacina_schema.load(clean, session=db.session, instance=vac, partial=True)
-            vacina_schema.context = {}
+            # valida o payload e depois as datas mescladas com a instância atual
+            data = vacina_update_schema.load(clean, partial=True)
+            vacina_update_schema.check_dates(data, inst=vac)
+
+            def apply():
+                for key, value in data.items():
+                    setattr(vac, key, value)
+                bump_version(Usuario.colecao_versao, id=g.current_user_id)
 
-            db.session.commit()
+            commit_with_retry(apply)
+            response_cache.bump(g.current_user_id)
+            revac_queue.invalidate(g.current_user_id)
             return vacina_schema.dump(vac), 200
 
         except ValidationError as err:
@@ -92,9 +123,79 @@ class VacinaDetailResource(Resource):
     def delete(self, pet_id, vacina_id):
         _, vac = self._get_pet_and_vac(pet_id, vacina_id)
         try:
-            db.session.delete(vac)
-            db.session.commit()
+            def apply():
+                db.session.delete(vac)
+                bump_version(Usuario.colecao_versao, id=g.current_user_id)
+
+            commit_with_retry(apply)
+            response_cache.bump(g.current_user_id)
+            revac_queue.invalidate(g.current_user_id)
             return {"ok": True}, 204
         except Exception as e:
             db.session.rollback()
             return {"errors": {"_": [str(e)]}}, 500
+
+
+class VacinaBatchResource(Resource):
+    """
+    POST /pets/<id>/vacinas/batch
+    Body: {"vacinas": [...], "modo": "tudo_ou_nada" | "parcial"}
+
+    Valida item a item com o VacinaSchema (inclui check_dates; com many=True o
+    marshmallow pula os validators de schema de todos os itens se qualquer um
+    tiver erro de campo) e insere as válidas num único INSERT em lote, numa só
+    transação.
+    - tudo_ou_nada (padrão): qualquer erro -> 400 e nada é gravado
+    - parcial: grava as válidas e devolve os erros por índice
+    """
+    method_decorators = [login_required]
+
+    MODOS = ("tudo_ou_nada", "parcial")
+
+    def post(self, pet_id):
+        pet = Pet.query.filter_by(id=pet_id, usuario_id=g.current_user_id).first_or_404()
+        payload = request.get_json(force=True) or {}
+        itens = payload.get("vacinas") if isinstance(payload, dict) else None
+        modo = payload.get("modo", "tudo_ou_nada") if isinstance(payload, dict) else None
+
+        if not isinstance(itens, list) or not itens:
+            return {"errors": {"vacinas": ["Envie uma lista não vazia de vacinas."]}}, 400
+        if modo not in self.MODOS:
+            return {"errors": {"modo": [f"Use um de: {', '.join(self.MODOS)}."]}}, 400
+        max_itens = current_app.config.get("VACINA_BATCH_MAX", 500)
+        if len(itens) > max_itens:
+            return {"errors": {"vacinas": [f"Máximo de {max_itens} vacinas por lote."]}}, 413
+
+        rows, errors = [], {}
+        for i, item in enumerate(itens):
+            try:
+                rows.append(vacina_batch_schema.load(item if isinstance(item, dict) else {}))
+            except ValidationError as err:
+                errors[i] = err.messages
+
+        if errors and modo == "tudo_ou_nada":
+            return {"errors": errors}, 400
+
+        ids = []
+        if rows:
+            for row in rows:
+                row["pet_id"] = pet.id
+            stmt = insert(Vacina).returning(Vacina.id)
+
+            def apply():
+                bump_version(Usuario.colecao_versao, id=g.current_user_id)
+                return db.session.scalars(stmt, rows).all()
+
+            try:
+                ids = commit_with_retry(apply)
+                response_cache.bump(g.current_user_id)
+                revac_queue.invalidate(g.current_user_id)
+            except IntegrityError:
+                db.session.rollback()
+                return {"errors": {"_": ["Conflito ao salvar vacinas."]}}, 409
+            except Exception as e:
+                db.session.rollback()
+                return {"errors": {"_": [str(e)]}}, 500
+
+        status = 201 if ids and not errors else (207 if ids else 400)
+        return {"inseridas": len(ids), "ids": ids, "errors": errors}, status
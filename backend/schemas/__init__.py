@@ -1,5 +1,5 @@
 from .usuario import UsuarioSchema, UsuarioCreateSchema
-from .pet import PetSchema
+from .pet import PetSchema, PetComVacinasSchema
 from .vacina import VacinaSchema
 
 usuario_schema = UsuarioSchema()
@@ -8,6 +8,25 @@ usuarios_schema = UsuarioSchema(many=True)
 
 pet_schema = PetSchema()
 pets_schema = PetSchema(many=True)
+pet_vacinas_schema = PetComVacinasSchema()
+pets_vacinas_schema = PetComVacinasSchema(many=True)
 
 vacina_schema = VacinaSchema()
 vacinas_schema = VacinaSchema(many=True)
+vacina_batch_schema = VacinaSchema(load_instance=False)  # dicts p/ INSERT em lote
+
+# PUT: load devolve dict e o recurso aplica na instância. Com instance=...
+# o marshmallow-sqlalchemy guarda a instância no schema (compartilhado
+# entre threads), então os singletons acima não recebem instance.
+usuario_update_schema = UsuarioSchema(load_instance=False)
+pet_update_schema = PetSchema(load_instance=False)
+vacina_update_schema = VacinaSchema(load_instance=False)
+
+# dump pré-compilado (mesmo JSON do schema) para listas grandes
+from helpers.serialization import compile_dump
+
+dump_usuarios = compile_dump(usuarios_schema)
+dump_pets = compile_dump(pets_schema)
+dump_pets_vacinas = compile_dump(pets_vacinas_schema)
+dump_vacina = compile_dump(vacina_schema)
+dump_vacinas = compile_dump(vacinas_schema)
@@ -6,6 +6,7 @@ from marshmallow import (
     fields, validates, ValidationError, pre_load, validates_schema, EXCLUDE
 )
 from models.pet import Pet
+from .vacina import VacinaSchema
 
 PET_ONLY_LETTERS = re.compile(r'^[A-Za-zÀ-ÖØ-öø-ÿ\s-]+$')
 
@@ -19,6 +20,7 @@ class PetSchema(SQLAlchemyAutoSchema):
         load_instance = True
         include_fk = False
         unknown = EXCLUDE  # ignora chaves desconhecidas
+        exclude = ('versao',)  # controle interno (ETag)
 
     @pre_load
     def normalize(self, data, **kwargs):
@@ -39,7 +41,7 @@ class PetSchema(SQLAlchemyAutoSchema):
         return data
 
     @validates_schema
-    def validate_dates(self, data, **kwargs):
+    def validate_dates(self, data, inst=None, partial=False, **kwargs):
         """
         Regras:
         - CREATE: precisa ter pelo menos uma das datas.
@@ -47,9 +49,14 @@ class PetSchema(SQLAlchemyAutoSchema):
           só erra se após a mescla as duas ficarem vazias E o payload
           tocou explicitamente em alguma delas.
         - Futuro é proibido; chegada < nascimento é proibido (após mescla).
+
+        A instância vem por chamada (nada guardado no schema, que é
+        compartilhado entre threads): no PUT o recurso faz load(partial=True)
+        e depois chama validate_dates(dados, inst=pet).
         """
+        if partial and inst is None:
+            return  # load parcial: o recurso valida com a instância
         today = date.today()
-        inst = self.context.get("db_instance")  # passado no recurso PUT
 
         # valores finais após mescla (payload > instância)
         nasc_final = data.get('data_nascimento', getattr(inst, 'data_nascimento', None) if inst else None)
@@ -85,3 +92,11 @@ class PetSchema(SQLAlchemyAutoSchema):
             raise ValidationError('Obrigatório.')
         if not PET_ONLY_LETTERS.fullmatch(s):
             raise ValidationError('Use apenas letras (sem números).')
+
+
+class PetComVacinasSchema(PetSchema):
+    """Pet + vacinas embutidas (?include=vacinas). Só dump."""
+    # redeclarado: o AutoSchema da subclasse regera os campos do model e
+    # descarta a FK herdada (include_fk=False)
+    usuario_id = fields.Integer(dump_only=True)
+    vacinas    = fields.Nested(VacinaSchema, many=True, dump_only=True)
@@ -1,33 +1,23 @@
-import os, re, dns.resolver, dns.exception
-from werkzeug.security import generate_password_hash
+import re
 from marshmallow_sqlalchemy import SQLAlchemyAutoSchema
 from marshmallow import fields, validates, ValidationError, pre_load, post_load
 from models.usuario import Usuario
+from helpers.mx import has_mx
+from helpers.passwords import password_hasher
 from datetime import date
 
 
 ONLY_LETTERS = re.compile(r'^[A-Za-zÀ-ÖØ-öø-ÿ\s]+$')
-_resolver = dns.resolver.Resolver(configure=True)
-_resolver.timeout = _resolver.lifetime = 2.0
-
-def has_mx(domain: str) -> bool:
-    try:
-        ans = _resolver.resolve(domain, 'MX')
-        return len(ans) > 0
-    except (dns.exception.DNSException, OSError):
-        return False
-
 def _is_hash(s: str) -> bool:
     return isinstance(s, str) and (s.startswith("pbkdf2:") or s.startswith("scrypt:"))
 
-HASH_METHOD = os.environ.get("HASH_METHOD", "pbkdf2:sha256")  # padroniza
-
 class UsuarioSchema(SQLAlchemyAutoSchema):
     senha = fields.String(load_only=True)
 
     class Meta:
         model = Usuario
         load_instance = True
+        exclude = ('versao', 'colecao_versao')  # controle interno (ETag)
 
     @pre_load
     def normalize_input(self, data, **kwargs):
@@ -52,12 +42,12 @@ class UsuarioSchema(SQLAlchemyAutoSchema):
             if 'senha' in data:
                 s = data['senha']
                 if s and not _is_hash(s):
-                    data['senha'] = generate_password_hash(s, method=HASH_METHOD, salt_length=16)
+                    data['senha'] = password_hasher.hash(s)
             return data
 
         # data é uma instância de Usuario
         if hasattr(data, 'senha') and data.senha and not _is_hash(data.senha):
-            data.senha = generate_password_hash(data.senha, method=HASH_METHOD, salt_length=16)
+            data.senha = password_hasher.hash(data.senha)
         return data
 
     @validates('nome')
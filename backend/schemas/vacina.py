@@ -26,27 +26,33 @@ class VacinaSchema(SQLAlchemyAutoSchema):
         include_fk = False
         unknown = EXCLUDE
         # evitamos duplicidade dos campos internos
-        exclude = ('data_aplicacao', 'data_fabricacao', 'data_vencimento', 'data_revac')
+        exclude = ('data_aplicacao', 'data_fabricacao', 'data_vencimento', 'data_revac', 'versao')
 
     @validates_schema
-    def check_dates(self, data, **kwargs):
+    def check_dates(self, data, inst=None, partial=False, **kwargs):
         """
         Validação aware de UPDATE:
-        - Em update, mescla com a instância atual (context['db_instance'])
-        - Regras: 
+        - Em update, mescla com a instância atual, recebida por chamada
+          (check_dates(dados, inst=vac) no PUT, após load(partial=True))
+        - Na criação (POST e batch) valem as mesmas regras, sem instância.
+          Antes as datas eram lidas pelos data_key ('fabricacao', ...), que
+          nunca aparecem em `data`, e o POST aceitava qualquer data.
+        - Regras:
           * aplicação e fabricação não no futuro
           * aplicação >= fabricação
           * vencimento >= max(fabricação, aplicação)
           * revacinação  > aplicação
         """
+        if partial and inst is None:
+            return  # load parcial: o recurso valida com a instância
         today = date.today()
-        inst = self.context.get("db_instance")
 
         # valores finais após mescla (payload > instância)
-        fab = data.get('fabricacao',  getattr(inst, 'data_fabricacao',  None) if inst else None)
-        apl = data.get('aplicacao',   getattr(inst, 'data_aplicacao',   None) if inst else None)
-        ven = data.get('vencimento',  getattr(inst, 'data_vencimento',  None) if inst else None)
-        rev = data.get('revacinacao', getattr(inst, 'data_revac',       None) if inst else None)
+        # obs.: `data` já vem com os nomes de atributo (data_*), não os data_key
+        fab = data.get('data_fabricacao', getattr(inst, 'data_fabricacao', None) if inst else None)
+        apl = data.get('data_aplicacao',  getattr(inst, 'data_aplicacao',  None) if inst else None)
+        ven = data.get('data_vencimento', getattr(inst, 'data_vencimento', None) if inst else None)
+        rev = data.get('data_revac',      getattr(inst, 'data_revac',      None) if inst else None)
 
         errors = {}
 
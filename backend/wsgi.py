@@ -0,0 +1,11 @@
+# backend/wsgi.py
+"""
+Entrada WSGI de produção:
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Não cria nem altera schema: no deploy, rode antes `flask --app wsgi db upgrade`.
+"""
+from helpers.application import create_app
+
+app = create_app()
@@ -2,7 +2,7 @@
 import React from "react";
 import { Link } from "react-router-dom";
 import BasePage from "./BasePage";
-import api from "../services/api";
+import api, { getAllPages } from "../services/api";
 import PetCreateModal from "../components/PetCreateModal";
 import PetEditModal from "../components/PetEditModal";
 import vaccineIcon from "../assets/saudePet.svg";
@@ -65,8 +65,8 @@ export default class PetPage extends BasePage {
   async fetchPets() {
     try {
       this.setState({ loading: true });
-      const resp = await api.get("/pets");
-      this.setState({ pets: resp.data });
+      const pets = await getAllPages("/pets");
+      this.setState({ pets });
     } catch (e) {
       console.error("GET /api/pets falhou", e.response?.data || e.message);
     } finally {
@@ -2,7 +2,7 @@
 import React from "react";
 import BasePage from "./BasePage";
 import { useParams } from "react-router-dom";
-import api from "../services/api";
+import api, { getAllPages } from "../services/api";
 import VaccineCreateModal from "../components/VaccineCreateModal";
 import VaccineEditModal from "../components/VaccineEditModal";
 
@@ -55,8 +55,8 @@ export class VaccinePage extends BasePage {
     const { petId } = this.props;
     try {
       this.setState({ loading: true });
-      const resp = await api.get(`/pets/${petId}/vacinas`);
-      this.setState({ vaccines: resp.data });
+      const vaccines = await getAllPages(`/pets/${petId}/vacinas`);
+      this.setState({ vaccines });
     } catch (e) {
       console.error(
         "GET /api/pets/:id/vacinas falhou",
@@ -27,4 +27,18 @@ api.interceptors.response.use(
   }
 );
 
+// Listas paginadas por cursor: segue o header X-Next-Cursor até o fim
+export async function getAllPages(url, params = {}) {
+  let items = [];
+  let cursor = null;
+  do {
+    const resp = await api.get(url, {
+      params: cursor ? { ...params, cursor } : params,
+    });
+    items = items.concat(resp.data);
+    cursor = resp.headers["x-next-cursor"] || null;
+  } while (cursor);
+  return items;
+}
+
 export default api;